@@ -0,0 +1,144 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures an action triggered on the N resources of a kind: the former pipeline (one for_trigger_action query per
+entity, then one backend action call after the other) against the fan-out (the kinds and descriptions fetched in
+one keys query, then OCNI_ACTION_PARALLELISM action calls at the same time).
+
+The database views answer after DB_LATENCY seconds per request, the backend action after BACKEND_LATENCY seconds.
+
+    python -m pyocni.TDD.Benchmarks.action_fanout_Bench
+"""
+
+import os
+import time
+import logging
+import tempfile
+import pyocni.pyocni_tools.config as config
+import pyocni.junglers.managers.backendManager as backend_m
+from pyocni.junglers.multi_entityJungler import MultiEntityJungler
+from pyocni.TDD.Benchmarks.bulk_create_Bench import load_registry, KIND
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+SIZES = [200, 2000]
+
+DB_LATENCY = 0.0005
+
+BACKEND_LATENCY = 0.002
+
+SLOW_BACKEND = """
+import time
+from pyocni.backends.dummy_backend import backend as dummy_backend
+
+class backend(dummy_backend):
+
+    def action(self, entity, action, attributes):
+        time.sleep(%s)
+""" % BACKEND_LATENCY
+
+
+class Rows(list):
+
+    def all(self):
+        return self
+
+    def first(self):
+        return self[0]
+
+
+class FakeSupplier(object):
+    """
+    Answers the views read by an action triggered on a kind
+    """
+
+    def __init__(self, size):
+        self.descriptions = dict()
+        for i in range(size):
+            location = '/compute/vm' + str(i)
+            self.descriptions[location] = {'kind': KIND, 'id': 'vm' + str(i)}
+
+    def get_entities_of_kind(self, occi_id):
+        time.sleep(DB_LATENCY)
+        return Rows([{'key': occi_id, 'value': [location, 'Resource']} for location in sorted(self.descriptions)])
+
+    def get_for_trigger_action(self, location):
+        time.sleep(DB_LATENCY)
+        return Rows([{'key': location, 'value': [KIND, self.descriptions[location]]}])
+
+    def get_for_trigger_action_by_keys(self, locations):
+        time.sleep(DB_LATENCY)
+        return Rows([{'key': location, 'value': [KIND, self.descriptions[location]]} for location in locations])
+
+
+def former_pipeline(jungler, action):
+    """
+    The former channel_trigger_actions, one query and one backend call after the other
+    """
+    supplier = jungler.rd_baker.resource_sup
+    for row in supplier.get_entities_of_kind(KIND):
+        value = supplier.get_for_trigger_action(row['value'][0]).first()['value']
+        provider = jungler.rd_baker.bake_to_get_provider(value[0])['local'][0]
+        backend_m.choose_appropriate_provider(provider).action(value[1], action, None)
+
+
+if __name__ == '__main__':
+    config.logger.setLevel(logging.INFO)
+    #Note: The action of the slow backend only sleeps, it can be called by several threads at the same time
+    config.OCNI_ACTION_PARALLELISM = '8'
+    load_registry()
+
+    backend_file = tempfile.NamedTemporaryFile(suffix='.py', delete=False)
+    backend_file.write(SLOW_BACKEND)
+    backend_file.close()
+    backends_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    json.dump({'backends': [{'name': 'dummy', 'path': backend_file.name}]}, backends_file)
+    backends_file.close()
+    config.BACKENDS_FILE = backends_file.name
+
+    jungler = MultiEntityJungler()
+    action = {'term': 'stop', 'scheme': 'http://schemas.ogf.org/occi/infrastructure/compute/action#'}
+
+    print "Action on the N resources of a kind, %.1f ms per query, %.1f ms per backend call, %s calls at once" % (
+        DB_LATENCY * 1000, BACKEND_LATENCY * 1000, config.OCNI_ACTION_PARALLELISM)
+    try:
+        for size in SIZES:
+            jungler.rd_baker.resource_sup = FakeSupplier(size)
+
+            start = time.time()
+            former_pipeline(jungler, action)
+            former_time = time.time() - start
+
+            start = time.time()
+            var, resp_code = jungler.channel_trigger_actions({'actions': [action]},
+                config.PyOCNI_Server_Address + '/compute/', 'stop')
+            fan_out_time = time.time() - start
+
+            assert var['succeeded'] == size
+            print "%6d resources : %8.1f ms former pipeline, %7.1f ms fan-out (x%.1f)" % (size,
+                former_time * 1000, fan_out_time * 1000, former_time / fan_out_time)
+    finally:
+        os.remove(backends_file.name)
+        os.remove(backend_file.name)
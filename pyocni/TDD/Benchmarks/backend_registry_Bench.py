@@ -0,0 +1,95 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures N backend dispatches (backendManager.create_entity): the backends file read and the backend module loaded
+for each entity (former choose_appropriate_provider) against the BackendRegistry cache. The backends file points
+to the dummy backend, the compute kind is put in the category registry.
+
+    python -m pyocni.TDD.Benchmarks.backend_registry_Bench
+"""
+
+import os
+import imp
+import time
+import logging
+import tempfile
+import pyocni.pyocni_tools.config as config
+import pyocni.junglers.managers.backendManager as backend_m
+from pyocni.TDD.Benchmarks.bulk_create_Bench import load_registry, KIND
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+SIZES = [100, 1000, 10000]
+
+
+def former_choose_appropriate_provider(provider):
+    backend = None
+    backends_json_data = open(config.BACKENDS_FILE)
+    backends_list = json.load(backends_json_data)
+    backends_json_data.close()
+
+    for i in backends_list["backends"]:
+        if i["name"] == provider:
+            backend_instance = imp.load_source('', i["path"])
+            backend = backend_instance.backend()
+
+    return backend
+
+
+def dispatch(entities):
+    for entity in entities:
+        backend_m.create_entity(entity)
+
+
+if __name__ == '__main__':
+    config.logger.setLevel(logging.INFO)
+    load_registry()
+
+    backends_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    json.dump({'backends': [{'name': 'dummy', 'path': os.path.join(os.path.dirname(backend_m.__file__),
+        '../../backends/dummy_backend.py')}]}, backends_file)
+    backends_file.close()
+    config.BACKENDS_FILE = backends_file.name
+
+    cached = backend_m.choose_appropriate_provider
+    print "Dispatch of N entity creations to the dummy backend"
+    try:
+        for size in SIZES:
+            entities = [{'OCCI_Description': {'kind': KIND, 'id': 'vm' + str(i)}} for i in range(size)]
+
+            backend_m.choose_appropriate_provider = former_choose_appropriate_provider
+            start = time.time()
+            dispatch(entities)
+            former_time = time.time() - start
+
+            backend_m.choose_appropriate_provider = cached
+            start = time.time()
+            dispatch(entities)
+            cached_time = time.time() - start
+
+            print "%6d entities : %8.1f ms loading the backend each time, %6.1f ms cached (x%.0f)" % (size,
+                former_time * 1000, cached_time * 1000, former_time / cached_time)
+    finally:
+        os.remove(backends_file.name)
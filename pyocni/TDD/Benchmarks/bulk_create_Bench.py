@@ -0,0 +1,152 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures the creation of N resources posted on a kind: the former pipeline (one _bulk_docs request holding every
+document, then one backend dispatch per entity) against the bulk pipeline
+(_bulk_docs chunks of CouchDB_BULK_CHUNK_SIZE documents, then one create_entities call per provider).
+
+CouchDB is stood in by a small HTTP server answering _bulk_docs and the for_check_locations view, LATENCY seconds
+per request. The backends file points to the dummy backend.
+
+    python -m pyocni.TDD.Benchmarks.bulk_create_Bench
+"""
+
+import os
+import time
+import logging
+import tempfile
+import threading
+import eventlet
+from eventlet import wsgi
+import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.occi_Joker as joker
+import pyocni.junglers.managers.backendManager as backend_m
+from pyocni.junglers.multi_entityJungler import MultiEntityJungler
+from pyocni.junglers.postMan.the_post_man import PostMan
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.pyocni_tools.service_Container import get_service
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+SIZES = [1000, 10000]
+
+LATENCY = 0.0005
+
+KIND = "http://schemas.ogf.org/occi/infrastructure#compute"
+
+def fake_couchdb(environ, start_response):
+    """
+    Answers _bulk_docs (every document is written), the view requests (no row) and an empty object to anything else
+    """
+    time.sleep(LATENCY)
+    if environ['PATH_INFO'].endswith('/_bulk_docs'):
+        docs = json.loads(environ['wsgi.input'].read(int(environ['CONTENT_LENGTH'])))['docs']
+        body = json.dumps([{'id': doc['_id'], 'rev': '1-0'} for doc in docs])
+    elif environ['PATH_INFO'].find('/_view/') is not -1:
+        body = json.dumps({'total_rows': 0, 'offset': 0, 'rows': []})
+    else:
+        body = "{}"
+    start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+    return [body]
+
+
+def start_fake_couchdb():
+    sock = eventlet.listen(('127.0.0.1', 0))
+    server = threading.Thread(target=wsgi.server, args=(sock, fake_couchdb), kwargs={'log_output': False})
+    server.daemon = True
+    server.start()
+    return sock.getsockname()[1]
+
+
+def load_registry():
+    """
+    Puts the compute kind, served by the dummy backend, in the category registry
+    """
+    registry = get_service(CategoryRegistry)
+    kind = {'_id': 'compute', '_rev': '1-0', 'Type': 'Kind', 'OCCI_ID': KIND, 'Provider': {'local': ['dummy']},
+            'OCCI_Location': config.PyOCNI_Server_Address + '/compute/',
+            'OCCI_Description': {'term': 'compute', 'scheme': KIND.split('#')[0] + '#', 'attributes': {}}}
+    registry.by_doc_id = {'compute': kind}
+    registry.reindex()
+    registry.loaded = True
+    #Note: No _changes feed to follow
+    registry.following = True
+
+
+def make_request(size):
+    resources = list()
+    for i in range(size):
+        resources.append({'kind': KIND, 'id': 'vm' + str(i), 'attributes': {'occi': {'compute': {'cores': 2}}}})
+    return {'resources': resources}
+
+
+def former_pipeline(jungler, jreq, req_path):
+    """
+    Steps 2a to 5a of the former channel_post_multi_resources
+    """
+    new_locations = [joker.make_entity_location_from_url(req_path, desc['id']) for desc in jreq['resources']]
+    kind_occi_id, db_locations = jungler.rd_baker.bake_to_post_multi_resources_2a(req_path, new_locations)
+    default_attributes = jungler.rd_baker.bake_to_get_default_attributes(req_path)
+    entities, resp_code = jungler.manager_r.register_resources(jreq['resources'], req_path, kind_occi_id,
+        db_locations, default_attributes)
+    jungler.PostMan.database.save_docs(entities, use_uuids=True, all_or_nothing=True)
+    for entity in entities:
+        backend_m.create_entity(entity)
+    return [entity['OCCI_Location'] for entity in entities]
+
+
+if __name__ == '__main__':
+    config.logger.setLevel(logging.INFO)
+    config.DB_IP = '127.0.0.1'
+    config.DB_PORT = str(start_fake_couchdb())
+    get_service(PostMan)._database = config.get_PyOCNI_server()[config.PyOCNI_DB]
+    load_registry()
+
+    backends_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    json.dump({'backends': [{'name': 'dummy', 'path': os.path.join(os.path.dirname(backend_m.__file__),
+        '../../backends/dummy_backend.py')}]}, backends_file)
+    backends_file.close()
+    config.BACKENDS_FILE = backends_file.name
+
+    jungler = MultiEntityJungler()
+    req_path = config.PyOCNI_Server_Address + '/compute/'
+
+    print "Creation of N resources, %.1f ms per round trip, chunks of %s documents" % (LATENCY * 1000,
+        config.DB_BULK_CHUNK_SIZE)
+    try:
+        for size in SIZES:
+            start = time.time()
+            former = former_pipeline(jungler, make_request(size), req_path)
+            former_time = time.time() - start
+
+            start = time.time()
+            bulk, resp_code = jungler.channel_post_multi_resources(make_request(size), req_path, dict())
+            bulk_time = time.time() - start
+
+            assert former == bulk
+            print "%6d resources : %8.1f ms former pipeline, %7.1f ms bulk pipeline (x%.1f)" % (size,
+                former_time * 1000, bulk_time * 1000, former_time / bulk_time)
+    finally:
+        os.remove(backends_file.name)
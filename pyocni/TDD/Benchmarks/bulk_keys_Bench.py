@@ -0,0 +1,127 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures the fetch of N entity documents before a mixin association: one view request per location (former
+bake_to_post_multi_resources_2b2) against the chunked multi-key requests of ResourceSupplier.get_rows_by_keys.
+
+CouchDB is stood in by a small HTTP server answering the for_associate_mixin view, LATENCY seconds per request
+(the network round trip), so that the number of round trips is what is measured.
+
+    python -m pyocni.TDD.Benchmarks.bulk_keys_Bench
+"""
+
+import time
+import threading
+import urlparse
+import eventlet
+from eventlet import wsgi
+import pyocni.pyocni_tools.config as config
+from pyocni.suppliers.resourceSupplier import ResourceSupplier
+from pyocni.dataBakers.resource_dataBaker import ResourceDataBaker
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+SIZES = [100, 1000, 5000]
+
+LATENCY = 0.0005
+
+#Note: The rows of the fake for_associate_mixin view, by JSON encoded key
+ROWS = dict()
+
+
+def fake_couchdb(environ, start_response):
+    """
+    Answers the view requests (key=... or POST {"keys": [...]}) and an empty object to anything else
+    """
+    time.sleep(LATENCY)
+    if environ['PATH_INFO'].find('/_view/') is not -1:
+        if environ['REQUEST_METHOD'] == 'POST':
+            keys = json.loads(environ['wsgi.input'].read(int(environ['CONTENT_LENGTH'])))['keys']
+        else:
+            keys = [json.loads(urlparse.parse_qs(environ['QUERY_STRING'])['key'][0])]
+        rows = list()
+        for key in keys:
+            row = ROWS.get(json.dumps(key))
+            if row is not None:
+                rows.append(row)
+        body = json.dumps({'total_rows': len(ROWS), 'offset': 0, 'rows': rows})
+    else:
+        body = "{}"
+    start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+    return [body]
+
+
+def start_fake_couchdb():
+    sock = eventlet.listen(('127.0.0.1', 0))
+    server = threading.Thread(target=wsgi.server, args=(sock, fake_couchdb), kwargs={'log_output': False})
+    server.daemon = True
+    server.start()
+    return sock.getsockname()[1]
+
+
+def make_rows(size):
+    ROWS.clear()
+    locations = list()
+    for i in range(size):
+        location = config.PyOCNI_Server_Address + "/compute/vm" + str(i)
+        doc = {'_id': str(i), 'OCCI_Location': location, 'Type': 'Resource',
+               'OCCI_Description': {'kind': 'http://schemas.ogf.org/occi/infrastructure#compute', 'id': 'vm' + str(i)}}
+        ROWS[json.dumps([location])] = {'id': str(i), 'key': [location], 'value': doc}
+        locations.append(location)
+    return locations
+
+
+def one_request_per_location(supplier, locations):
+    db_docs = list()
+    for item in locations:
+        db_docs.append(supplier.get_for_associate_mixin(item).first()['value'])
+    return db_docs
+
+
+if __name__ == '__main__':
+    config.DB_IP = '127.0.0.1'
+    config.DB_PORT = str(start_fake_couchdb())
+    database = config.get_PyOCNI_server()[config.PyOCNI_DB]
+
+    supplier = ResourceSupplier()
+    supplier._database = database
+    baker = ResourceDataBaker()
+    baker.resource_sup = supplier
+
+    print "Fetch of N entities, %.1f ms per round trip, chunks of %s keys" % (LATENCY * 1000, config.DB_KEYS_CHUNK_SIZE)
+    for size in SIZES:
+        locations = make_rows(size)
+
+        start = time.time()
+        one_by_one = one_request_per_location(supplier, locations)
+        one_by_one_time = time.time() - start
+
+        start = time.time()
+        chunked = baker.bake_to_post_multi_resources_2b2(locations)
+        chunked_time = time.time() - start
+
+        assert one_by_one == chunked
+        print "%5d entities : %8.1f ms one by one, %7.1f ms chunked (x%.1f)" % (size, one_by_one_time * 1000,
+            chunked_time * 1000, one_by_one_time / chunked_time)
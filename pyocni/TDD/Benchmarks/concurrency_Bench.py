@@ -0,0 +1,82 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures the throughput of a running PyOCNI server with 1, 10 and 100 parallel GET requests on /compute/.
+Run it once with OCNI_GREEN_IO = 0 and once with OCNI_GREEN_IO = 1 (occi_server.conf) to compare:
+without green I/O the throughput stays flat whatever the concurrency, every CouchDB call blocks the server.
+
+    python -m pyocni.TDD.Benchmarks.concurrency_Bench [requests per concurrency level]
+"""
+
+import sys
+import time
+import eventlet
+from eventlet.green import httplib
+import pyocni.pyocni_tools.config as config
+
+CONCURRENCY = [1, 10, 100]
+
+REQUESTS = 500
+
+PATH = '/compute/'
+
+
+def get_compute(status):
+    """
+    Sends one GET /compute/ and records its status code
+    """
+    conn = httplib.HTTPConnection(config.OCNI_IP, int(config.OCNI_PORT))
+    try:
+        conn.request('GET', PATH, headers={'accept': 'application/occi+json'})
+        response = conn.getresponse()
+        response.read()
+        status[response.status] = status.get(response.status, 0) + 1
+    except Exception:
+        status['error'] = status.get('error', 0) + 1
+    finally:
+        conn.close()
+
+
+def run(concurrency, requests):
+    """
+    Sends the requests, at most concurrency of them in flight at the same time
+    Returns:
+        @return: (requests per second, status codes count)
+    """
+    pool = eventlet.GreenPool(concurrency)
+    status = dict()
+    start = time.time()
+    for i in range(requests):
+        pool.spawn_n(get_compute, status)
+    pool.waitall()
+    return requests / (time.time() - start), status
+
+
+if __name__ == '__main__':
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else REQUESTS
+    print "GET " + config.PyOCNI_Server_Address + PATH + " x " + str(requests)
+    reference = None
+    for concurrency in CONCURRENCY:
+        throughput, status = run(concurrency, requests)
+        if reference is None:
+            reference = throughput
+        print "%4d parallel : %8.1f req/s (x%.2f)  %s" % (concurrency, throughput, throughput / reference, status)
@@ -0,0 +1,102 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures the filtering of N entity descriptions: one OCCIFilterSet.matches call per description (OCNI_FILTER_ENGINE
+= python) against the columnar and the numpy engines (the latter when NumPy is installed).
+The three engines must select the same entities, in the same order.
+
+    python -m pyocni.TDD.Benchmarks.filter_engine_Bench
+"""
+
+import time
+import random
+import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.occi_Filter as occi_filter
+import pyocni.pyocni_tools.columnar_Filter as columnar_filter
+
+SIZES = [10000, 100000]
+
+KIND = "http://schemas.ogf.org/occi/infrastructure#compute"
+
+FILTERS = [{"kind": KIND, "attributes": {"occi": {"compute": {"state": "active", "cores": 4}}}},
+           {"attributes": {"occi": {"compute": {"state": "suspended", "hostname": "vm7"}}}},
+           {"mixins": ["http://example.com/occi/tags#gold"], "attributes": {"occi": {"compute": {"memory": 2.0}}}}]
+
+#Note: A request selecting a set of hosts, one filter per host
+HOST_FILTERS = [{"kind": KIND, "attributes": {"occi": {"compute": {"state": "active", "hostname": "vm" + str(i)}}}}
+                for i in range(12)]
+
+
+def make_descriptions(size):
+    generator = random.Random(size)
+    descriptions = list()
+    for i in range(size):
+        compute = {"state": generator.choice(["active", "inactive", "suspended"]),
+                   "cores": generator.choice([1, 2, 4, 8]),
+                   "memory": generator.choice([1.0, 2.0, 4.0]),
+                   "hostname": "vm" + str(generator.randint(0, 20))}
+        description = {"kind": KIND, "id": "vm" + str(i), "attributes": {"occi": {"compute": compute}}}
+        if generator.random() < 0.5:
+            description['mixins'] = [generator.choice(["http://example.com/occi/tags#gold",
+                                                       "http://example.com/occi/tags#silver"])]
+        if generator.random() < 0.1:
+            #Note: Descriptions without the attributes the filters look for
+            del compute['state']
+        descriptions.append({'OCCI_ID': "/compute/vm" + str(i), 'OCCI_Description': description})
+    return descriptions
+
+
+def one_match_per_description(filters, descriptions):
+    return [desc['OCCI_ID'] for desc in descriptions if filters.matches(desc['OCCI_Description']) is True]
+
+
+def timed(function, *args):
+    start = time.time()
+    result = function(*args)
+    return result, time.time() - start
+
+
+def compare(filters, descriptions):
+    one_by_one, one_by_one_time = timed(one_match_per_description, filters, descriptions)
+
+    config.OCNI_FILTER_ENGINE = 'columnar'
+    row_numbers, row_numbers_time = timed(columnar_filter.select_matching, filters, descriptions)
+
+    assert one_by_one == row_numbers
+    line = "%6d entities (%5d selected) : %7.1f ms one by one, %7.1f ms columnar (x%.1f)" % (len(descriptions),
+        len(one_by_one), one_by_one_time * 1000, row_numbers_time * 1000, one_by_one_time / row_numbers_time)
+
+    if columnar_filter.numpy is not None:
+        config.OCNI_FILTER_ENGINE = 'numpy'
+        masks, masks_time = timed(columnar_filter.select_matching, filters, descriptions)
+        assert one_by_one == masks
+        line += ", %7.1f ms numpy (x%.1f)" % (masks_time * 1000, one_by_one_time / masks_time)
+    return line
+
+
+if __name__ == '__main__':
+    print "Filtering of N descriptions, batches of %s" % config.OCNI_FILTER_BATCH
+    for size in SIZES:
+        descriptions = make_descriptions(size)
+        for name, filter_docs in (("mixed", FILTERS), ("hosts", HOST_FILTERS)):
+            print "%2d %s filters, %s" % (len(filter_docs), name,
+                compare(occi_filter.compile_filters(filter_docs), descriptions))
@@ -0,0 +1,141 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Bilel Msekni
+@contact: bilel.msekni@telecom-sudparis.eu
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures the per-request routing overhead of the occi_server route table: the former linear regex router
+(one webob Request in the router, a second one in the controller) against the compiled Router.
+The dispatchers are replaced by empty controllers so that only the routing cost is measured.
+"""
+
+import re
+import timeit
+from webob import Request
+from webob import exc
+import pyocni.pyocni_tools.DoItYourselfWebOb as url_mapper
+
+NUMBER = 20000
+
+PATHS = ['/-/',
+         '/compute/',
+         '/compute/user1/',
+         '/template/resource/medium/',
+         '/compute/vm01',
+         '/compute/user1/vm01']
+
+
+class Empty_Dispatcher(object):
+    """
+    Stands for the OCCI dispatchers: does nothing but answering
+    """
+
+    def __init__(self, req, location=None, idontknow=None, idontcare=None):
+        self.req = req
+
+    def get(self):
+        return empty_response
+
+
+class Regex_Router(object):
+    """
+    The former router: every compiled regex is tried in order on each call
+    """
+
+    def __init__(self):
+        self.routes = []
+
+    def add_route(self, template, controller, **vars):
+        self.routes.append((re.compile(url_mapper.template_to_regex(template)), controller, vars))
+
+    def __call__(self, environ, start_response):
+        req = Request(environ)
+        for regex, controller, vars in self.routes:
+            match = regex.match(req.path_info)
+            if match:
+                req.urlvars = match.groupdict()
+                req.urlvars.update(vars)
+                return controller(environ, start_response)
+        return exc.HTTPNotFound()(environ, start_response)
+
+
+def regex_rest_controller(cls):
+    """
+    The former rest_controller: builds its own request for the environ
+    """
+
+    def replacement(environ, start_response):
+        req = Request(environ)
+        instance = cls(req, **req.urlvars)
+        resp = getattr(instance, req.method.lower())()
+        return resp(environ, start_response)
+
+    return replacement
+
+
+def make_occi_routes(app, controller_factory):
+    """
+    Registers the occi_server routes on the router provided
+    """
+    operation = controller_factory(Empty_Dispatcher)
+
+    app.add_route('/-/', controller=operation)
+
+    app.add_route('/{location}/', controller=operation)
+    app.add_route('/{location}/{idontknow}/', controller=operation)
+    app.add_route('/{location}/{idontknow}/{idontcare}/', controller=operation)
+
+    app.add_route('/{location}/{idontknow}', controller=operation)
+    app.add_route('/{location}/{idontknow}/{idontcare}', controller=operation)
+    return app
+
+
+def empty_response(environ, start_response):
+    start_response('200 OK', [])
+    return []
+
+
+def start_response(status, headers, exc_info=None):
+    pass
+
+
+def bench_router(app):
+    """
+    Returns the mean routing time of a request in microseconds
+    """
+    environs = [Request.blank(path).environ for path in PATHS]
+
+    def run():
+        for environ in environs:
+            app(dict(environ), start_response)
+
+    seconds = timeit.timeit(run, number=NUMBER)
+    return seconds * 1000000.0 / (NUMBER * len(environs))
+
+
+if __name__ == '__main__':
+    before = bench_router(make_occi_routes(Regex_Router(), regex_rest_controller))
+    after = bench_router(make_occi_routes(url_mapper.Router(), url_mapper.rest_controller))
+
+    print "Routing overhead per request (" + str(NUMBER * len(PATHS)) + " requests)"
+    print "  regex router    : %.2f us" % before
+    print "  compiled router : %.2f us" % after
+    print "  speedup         : %.2fx" % (before / after)
@@ -0,0 +1,110 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Latency of the storage calls made by the suppliers, for the embedded engines: N resources are written in one
+save_docs call, then read back through the for_update_entities view (one key at a time), the entities_of_kind view
+and the for_check_locations rows. The memory engine is run without then with a journal, then the sqlite engine.
+
+    python -m pyocni.TDD.Benchmarks.storage_engine_Bench
+"""
+
+import os
+import time
+import logging
+import tempfile
+import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
+from pyocni.pyocni_tools.service_Container import container
+
+SIZES = [1000, 10000]
+
+KIND = "http://schemas.ogf.org/occi/infrastructure#compute"
+
+def make_docs(size):
+    docs = list()
+    for i in range(size):
+        location = config.PyOCNI_Server_Address + '/compute/vm' + str(i)
+        docs.append({'_id': 'vm' + str(i), 'Type': 'Resource', 'OCCI_Location': location,
+                     'OCCI_Description': {'kind': KIND, 'id': 'vm' + str(i), 'mixins': [],
+                                          'attributes': {'occi': {'compute': {'cores': 2}}}}})
+    return docs
+
+
+def run(size):
+    container.reset()
+    database = get_engine().prepare_database()
+    docs = make_docs(size)
+    locations = [doc['OCCI_Location'] for doc in docs]
+
+    start = time.time()
+    database.save_docs(docs, use_uuids=True, all_or_nothing=True)
+    write_time = time.time() - start
+
+    #Note: The memory engine builds a view index on its first query, as at startup with CouchDB_WARMUP_VIEWS = 1
+    start = time.time()
+    config.warm_up_views(database)
+    index_time = time.time() - start
+
+    start = time.time()
+    for location in locations:
+        database.view('/db_views/for_update_entities', key=location).first()
+    read_time = time.time() - start
+
+    start = time.time()
+    rows = database.view('/db_views/entities_of_kind', key=KIND).all()
+    kind_time = time.time() - start
+    assert len(rows) == size
+
+    start = time.time()
+    count = database.view('/db_views/for_check_locations', keys=locations[:100], reduce=False).count()
+    check_time = time.time() - start
+    assert count == 100
+
+    get_engine().purge()
+    return write_time, index_time, read_time / size, kind_time, check_time
+
+
+if __name__ == '__main__':
+    config.logger.setLevel(logging.INFO)
+    journal_file = tempfile.NamedTemporaryFile(suffix='.journal', delete=False)
+    journal_file.close()
+    config.DB_SQLITE_FILE = journal_file.name + '.sqlite'
+
+    try:
+        for engine, journal in [('memory', ''), ('memory', journal_file.name), ('sqlite', '')]:
+            config.DB_ENGINE = engine
+            config.DB_JOURNAL = journal
+            if engine == 'sqlite':
+                print "SQLite engine, file " + config.DB_SQLITE_FILE
+            else:
+                print "Memory engine, " + ("journal " + journal if journal else "no journal")
+            for size in SIZES:
+                write_time, index_time, read_time, kind_time, check_time = run(size)
+                print "%6d resources : %7.1f ms save_docs, %7.1f ms view warm-up, %5.1f us per key lookup, " \
+                      "%6.1f ms entities_of_kind, %5.2f ms check of 100 locations" % (size, write_time * 1000,
+                    index_time * 1000, read_time * 1000000, kind_time * 1000, check_time * 1000)
+    finally:
+        container.reset()
+        for path in [journal_file.name, config.DB_SQLITE_FILE, config.DB_SQLITE_FILE + '-wal',
+                     config.DB_SQLITE_FILE + '-shm']:
+            if os.path.exists(path):
+                os.remove(path)
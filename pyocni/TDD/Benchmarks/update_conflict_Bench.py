@@ -0,0 +1,118 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Concurrent partial updates of the same entities (each one sets its own attribute), made by the update pipeline of
+SingleEntityJungler on the memory engine. A green thread yields between the read and the save of the entity, as a
+request does on a CouchDB call with OCNI_GREEN_IO = 1.
+
+The updates are saved with force_update (as before the revision was checked), then with the revision they were read
+with: the attributes missing at the end are the lost updates.
+
+    python -m pyocni.TDD.Benchmarks.update_conflict_Bench
+"""
+
+import time
+import logging
+import eventlet
+import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
+from pyocni.junglers.postMan.the_post_man import PostMan
+from pyocni.junglers.single_entityJungler import SingleEntityJungler
+from pyocni.pyocni_tools.service_Container import container, get_service
+
+ENTITIES = 10
+
+#Note: (updates of each entity at the same time, OCNI_UPDATE_RETRIES)
+RUNS = [(5, 3), (20, 3), (20, 20)]
+
+KIND = "http://schemas.ogf.org/occi/infrastructure#compute"
+
+
+class ForcedPostMan(PostMan):
+    """
+    Saves the updated entities whatever their revision
+    """
+
+    def save_updated_entity_in_db(self, entity):
+        return self.database.save_doc(entity, force_update=True)
+
+
+def make_docs():
+    docs = list()
+    for i in range(ENTITIES):
+        location = config.PyOCNI_Server_Address + '/compute/vm' + str(i)
+        docs.append({'_id': 'vm' + str(i), 'Type': 'Resource', 'OCCI_Location': location,
+                     'OCCI_Description': {'kind': KIND, 'id': 'vm' + str(i), 'mixins': [],
+                                          'attributes': {'occi': {'compute': {'cores': 2}}}}})
+    return docs
+
+
+def run(updates, forced):
+    container.reset()
+    database = get_engine().prepare_database()
+    database.save_docs(make_docs(), use_uuids=True, all_or_nothing=True)
+    jungler = get_service(SingleEntityJungler)
+    if forced is True:
+        jungler.PostMan = ForcedPostMan()
+
+    def apply_update(old_doc, jBody):
+        eventlet.sleep(0)
+        return jungler.apply_partial_update(old_doc, jBody)
+
+    def update(location, agent):
+        jBody = {'resources': [{'attributes': {'occi': {'compute': {'agent' + str(agent): agent}}}}]}
+        jungler.update_entity(location, apply_update, jBody)
+
+    pool = eventlet.GreenPool(ENTITIES * updates)
+    start = time.time()
+    for agent in range(updates):
+        for i in range(ENTITIES):
+            pool.spawn_n(update, config.PyOCNI_Server_Address + '/compute/vm' + str(i), agent)
+    pool.waitall()
+    elapsed = time.time() - start
+
+    saved = 0
+    for i in range(ENTITIES):
+        saved += len(database.open_doc('vm' + str(i))['OCCI_Description']['attributes']['occi']['compute']) - 1
+    stats = jungler.stats()
+    get_engine().purge()
+    return elapsed, saved, stats
+
+
+if __name__ == '__main__':
+    #Note: The updates answered 409 are logged as errors
+    config.logger.setLevel(logging.CRITICAL)
+    config.DB_ENGINE = 'memory'
+    config.DB_JOURNAL = ''
+
+    try:
+        print "%d entities, memory engine" % ENTITIES
+        for updates, retries in RUNS:
+            config.OCNI_UPDATE_RETRIES = str(retries)
+            for forced in [True, False]:
+                elapsed, saved, stats = run(updates, forced)
+                lost = ENTITIES * updates - stats['failed'] - saved
+                print "%3d updates per entity, %s : %7.1f ms, %4d lost, %4d answered 409, %5d retries" % (updates,
+                    "forced          " if forced else "retries = %-6d" % retries, elapsed * 1000, lost,
+                    stats['failed'], stats['retries'])
+    finally:
+        container.reset()
@@ -0,0 +1,112 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Measures a burst of N partial updates (monitoring agents posting occi.compute.state), each made by its own green
+thread as the requests of the server: one PUT per document (CouchDB_WRITE_BATCH_WINDOW = 0) against the write
+coalescer (CouchDB_WRITE_BATCH_WINDOW = WINDOW ms).
+
+CouchDB is stood in by a small HTTP server answering the document PUTs and _bulk_docs, LATENCY seconds per request.
+
+    python -m pyocni.TDD.Benchmarks.write_batch_Bench
+"""
+
+import time
+import logging
+import threading
+import eventlet
+from eventlet import wsgi
+import pyocni.pyocni_tools.config as config
+from pyocni.junglers.postMan.the_post_man import PostMan
+from pyocni.pyocni_tools.service_Container import get_service
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+SIZES = [100, 1000]
+
+LATENCY = 0.0005
+
+WINDOW = 5
+
+requests = {'count': 0}
+
+def fake_couchdb(environ, start_response):
+    """
+    Answers _bulk_docs and the document PUTs (every document is written) and an empty object to anything else
+    """
+    time.sleep(LATENCY)
+    requests['count'] += 1
+    if environ['PATH_INFO'].endswith('/_bulk_docs'):
+        docs = json.loads(environ['wsgi.input'].read(int(environ['CONTENT_LENGTH'])))['docs']
+        body = json.dumps([{'id': doc['_id'], 'rev': '2-0'} for doc in docs])
+    elif environ['REQUEST_METHOD'] == 'PUT':
+        body = json.dumps({'ok': True, 'id': environ['PATH_INFO'].split('/')[-1], 'rev': '2-0'})
+    else:
+        body = "{}"
+    start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+    return [body]
+
+
+def start_fake_couchdb():
+    sock = eventlet.listen(('127.0.0.1', 0))
+    server = threading.Thread(target=wsgi.server, args=(sock, fake_couchdb), kwargs={'log_output': False})
+    server.daemon = True
+    server.start()
+    return sock.getsockname()[1]
+
+
+def make_doc(i):
+    return {'_id': 'vm' + str(i), '_rev': '1-0', 'Type': 'Resource',
+            'OCCI_Location': config.PyOCNI_Server_Address + '/compute/vm' + str(i),
+            'OCCI_Description': {'kind': 'http://schemas.ogf.org/occi/infrastructure#compute',
+                                 'attributes': {'occi': {'compute': {'state': 'active'}}}}}
+
+
+def burst(post_man, size):
+    requests['count'] = 0
+    pool = eventlet.GreenPool(size)
+    start = time.time()
+    for i in range(size):
+        pool.spawn_n(post_man.save_updated_entity_in_db, make_doc(i))
+    pool.waitall()
+    return time.time() - start, requests['count']
+
+
+if __name__ == '__main__':
+    config.logger.setLevel(logging.INFO)
+    config.DB_IP = '127.0.0.1'
+    config.DB_PORT = str(start_fake_couchdb())
+    post_man = get_service(PostMan)
+    post_man._database = config.get_PyOCNI_server()[config.PyOCNI_DB]
+
+    print "Burst of N partial updates, %.1f ms per round trip, %d ms window" % (LATENCY * 1000, WINDOW)
+    for size in SIZES:
+        config.DB_WRITE_BATCH_WINDOW = '0'
+        single_time, single_requests = burst(post_man, size)
+
+        config.DB_WRITE_BATCH_WINDOW = str(WINDOW)
+        batch_time, batch_requests = burst(post_man, size)
+
+        print "%5d updates : %8.1f ms in %4d PUTs, %7.1f ms in %3d _bulk_docs (x%.1f)" % (size,
+            single_time * 1000, single_requests, batch_time * 1000, batch_requests, single_time / batch_time)
@@ -0,0 +1,101 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Database calls counted for each request (streamed bodies and threads working for the request included), run in the
+process on the memory engine:
+
+    python -m pyocni.TDD.Tests.dbCalls_Tests
+"""
+
+from unittest import TestLoader, TextTestRunner
+import threading
+import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.db_Calls as db_calls
+from pyocni.TDD.fake_Data.memory_Server import MemoryServerTestCase
+
+
+class test_db_calls(MemoryServerTestCase):
+    """
+    Counter of the database calls of a request, read through the test hook
+    """
+
+    def test_get_entity_db_calls(self):
+        """
+        get a resource in one database call
+        """
+        location = self.create_resource('a1')
+
+        res = self.call('GET', location)
+
+        self.assertEqual(res.status_int, 200)
+        self.assertEqual(self.get_db_calls(res), 1)
+        self.assertFalse(res.headers.has_key('X-PyOCNI-DB-Calls'))
+
+    def test_debug_header(self):
+        """
+        with OCNI_DEBUG_DB_CALLS = 1 the response has the calls made before it started
+        """
+        location = self.create_resource('a1')
+        config.OCNI_DEBUG_DB_CALLS = '1'
+
+        res = self.call('GET', location)
+
+        self.assertEqual(res.headers['X-PyOCNI-DB-Calls'], '1')
+
+    def test_streamed_collection(self):
+        """
+        the pages of a streamed collection read after the response started are counted
+        """
+        for i in range(5):
+            self.create_resource('a' + str(i))
+        config.DB_PAGE_SIZE = '2'
+        config.OCNI_DEBUG_DB_CALLS = '1'
+
+        res = self.call('GET', '/compute/')
+
+        self.assertEqual(res.status_int, 200)
+        self.assertTrue(self.get_db_calls(res) >= int(res.headers['X-PyOCNI-DB-Calls']) + 2)
+
+    def test_carried_to_thread(self):
+        """
+        the calls made by a thread working for the request are counted for it, the caller keeps its counter
+        """
+        environ = dict()
+        db_calls.start_counting(environ)
+        thread = threading.Thread(target=db_calls.carry(db_calls.count_db_call))
+        thread.start()
+        thread.join()
+        db_calls.carry(db_calls.count_db_call)()
+        db_calls.count_db_call()
+
+        self.assertEqual(db_calls.get_db_calls(environ), 3)
+
+
+if __name__ == '__main__':
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Create the testing suites
+    db_calls_suite = loader.loadTestsFromTestCase(test_db_calls)
+
+    #Run tests
+    runner.run(db_calls_suite)
@@ -0,0 +1,196 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Matching of the compiled filters (OCCIFilter, OCCIFilterSet) and filtering of the entities below a path, with each
+filter engine:
+
+    python -m pyocni.TDD.Tests.filter_Tests
+"""
+
+from unittest import TestCase, TestLoader, TextTestRunner
+import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.occi_Filter as occi_filter
+from pyocni.junglers.pathJungler import get_filtered
+from pyocni.pyocni_tools.config import return_code
+
+COMPUTE = "http://schemas.ogf.org/occi/infrastructure#compute"
+NETWORK = "http://schemas.ogf.org/occi/infrastructure#networkinterface"
+MEDIUM = "http://example.com/template/resource#medium"
+LARGE = "http://example.com/template/resource#large"
+
+VM = {"kind": COMPUTE, "mixins": [MEDIUM, LARGE],
+      "attributes": {"occi": {"compute": {"state": "active", "cores": 2, "hostname": None}}}}
+
+
+def make_description(occi_id, entity_type, description):
+    return {'OCCI_ID': occi_id, 'Type': entity_type, 'OCCI_Description': description}
+
+
+class test_filter(TestCase):
+    """
+    A filter document matches the descriptions having every one of its terms
+    """
+
+    def test_terms(self):
+        """
+        the kind and a nested attribute are both compared
+        """
+        occi_filter_doc = {"kind": COMPUTE, "attributes": {"occi": {"compute": {"state": "active"}}}}
+        self.assertTrue(occi_filter.OCCIFilter(occi_filter_doc).matches(VM))
+        occi_filter_doc['attributes']['occi']['compute']['state'] = "inactive"
+        self.assertFalse(occi_filter.OCCIFilter(occi_filter_doc).matches(VM))
+
+    def test_missing_path(self):
+        """
+        a term on an attribute the description does not have does not match, even when its value is None
+        """
+        self.assertFalse(occi_filter.OCCIFilter({"attributes": {"occi": {"storage": {"size": 1}}}}).matches(VM))
+        self.assertFalse(occi_filter.OCCIFilter({"attributes": {"occi": {"compute": {"speed": None}}}}).matches(VM))
+        self.assertTrue(occi_filter.OCCIFilter({"attributes": {"occi": {"compute": {"hostname": None}}}}).matches(VM))
+        self.assertFalse(occi_filter.OCCIFilter({"kind": {"term": "compute"}}).matches(VM))
+
+    def test_list(self):
+        """
+        a list of mixins matches a description holding all of them, in any order
+        """
+        self.assertTrue(occi_filter.OCCIFilter({"mixins": [LARGE]}).matches(VM))
+        self.assertTrue(occi_filter.OCCIFilter({"mixins": [LARGE, MEDIUM]}).matches(VM))
+        self.assertFalse(occi_filter.OCCIFilter({"mixins": [MEDIUM, "http://example.com/#small"]}).matches(VM))
+        self.assertFalse(occi_filter.OCCIFilter({"mixins": MEDIUM}).matches(VM))
+
+    def test_empty(self):
+        """
+        a filter without terms matches every description
+        """
+        self.assertTrue(occi_filter.OCCIFilter({}).matches(VM))
+
+    def test_index_term(self):
+        """
+        only a term on a single indexed attribute value can be looked up in the index
+        """
+        compiled = occi_filter.OCCIFilter({"kind": COMPUTE, "attributes": {"occi": {"compute": {"cores": 2,
+                                                                                              "state": "active"}}}})
+        self.assertEqual(compiled.get_term(('kind',)), COMPUTE)
+        self.assertEqual(compiled.get_term(('title',)), None)
+        self.assertEqual(sorted(compiled.get_attribute_terms()), [("occi.compute.cores", 2),
+                                                                  ("occi.compute.state", "active")])
+        self.assertEqual(compiled.get_index_term(["occi.compute.state"]), ("occi.compute.state", "active"))
+        self.assertEqual(compiled.get_index_term(["occi.compute.memory"]), None)
+
+
+class test_filter_set(TestCase):
+    """
+    The filter documents of a request, a description matches when one of them does
+    """
+
+    def test_matches(self):
+        """
+        one matching filter is enough
+        """
+        filters = occi_filter.compile_filters([{"kind": NETWORK}, {"mixins": [MEDIUM]}])
+        self.assertTrue(filters.matches(VM))
+        filters = occi_filter.compile_filters([{"kind": NETWORK}, {"mixins": ["http://example.com/#small"]}])
+        self.assertFalse(filters.matches(VM))
+
+    def test_single_document(self):
+        """
+        a filter document given alone is a set of one filter
+        """
+        filters = occi_filter.compile_filters({"kind": COMPUTE})
+        self.assertEqual(len(filters.filters), 1)
+        self.assertTrue(filters.matches(VM))
+
+    def test_no_filter(self):
+        """
+        an empty list of filter documents matches nothing
+        """
+        self.assertFalse(occi_filter.compile_filters([]).matches(VM))
+
+    def test_index_terms(self):
+        """
+        the index is used only when every filter has an indexed term, each term is looked up once
+        """
+        indexed = ["occi.compute.state"]
+        filters = occi_filter.compile_filters([{"attributes": {"occi": {"compute": {"state": "active"}}}},
+                                               {"attributes": {"occi": {"compute": {"state": "active"}}},
+                                                "kind": COMPUTE}])
+        self.assertEqual(filters.get_index_terms(indexed), [("occi.compute.state", "active")])
+        filters.filters.append(occi_filter.OCCIFilter({"kind": COMPUTE}))
+        self.assertEqual(filters.get_index_terms(indexed), None)
+
+
+class test_path_filtering(TestCase):
+    """
+    Entities below a path matched against the filters of their Type, with the python, columnar and numpy engines
+    """
+
+    def setUp(self):
+        self.filter_engine = config.OCNI_FILTER_ENGINE
+        self.descriptions = [make_description('/compute/vm1', 'Resource', VM),
+                             make_description('/compute/vm2', 'Resource', {"kind": COMPUTE, "mixins": []}),
+                             make_description('/link/l1', 'Link', {"kind": NETWORK, "mixins": [MEDIUM]}),
+                             make_description('/link/l2', 'Link', {"kind": NETWORK, "source": "/compute/vm1"})]
+
+    def tearDown(self):
+        config.OCNI_FILTER_ENGINE = self.filter_engine
+
+    def check_engines(self, filters, expected):
+        for engine in ['python', 'columnar', 'numpy']:
+            config.OCNI_FILTER_ENGINE = engine
+            result, resp_code = get_filtered(filters, iter(self.descriptions))
+            self.assertEqual(resp_code, return_code['OK'])
+            self.assertEqual(result, expected, engine)
+
+    def test_by_type(self):
+        """
+        a resource filter does not select the links matching it, and the other way round
+        """
+        filters = {'Resource': occi_filter.compile_filters({"mixins": [MEDIUM]}),
+                   'Link': occi_filter.compile_filters({"source": "/compute/vm1"})}
+        self.check_engines(filters, ['/compute/vm1', '/link/l2'])
+
+    def test_one_type(self):
+        """
+        without filters for a Type, no entity of that Type is selected
+        """
+        filters = {'Link': occi_filter.compile_filters([{"kind": NETWORK}])}
+        self.check_engines(filters, ['/link/l1', '/link/l2'])
+
+    def test_order(self):
+        """
+        the entities are given in the order they were read
+        """
+        self.descriptions.reverse()
+        filters = {'Resource': occi_filter.compile_filters({"kind": COMPUTE}),
+                   'Link': occi_filter.compile_filters({"kind": NETWORK})}
+        self.check_engines(filters, ['/link/l2', '/link/l1', '/compute/vm2', '/compute/vm1'])
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_filter))
+    runner.run(loader.loadTestsFromTestCase(test_filter_set))
+    runner.run(loader.loadTestsFromTestCase(test_path_filtering))
@@ -0,0 +1,146 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Backend jobs (202 answer, jobs of an exited process claimed once), run in the process on the memory engine:
+
+    python -m pyocni.TDD.Tests.jobs_Tests
+"""
+
+from unittest import TestLoader, TextTestRunner
+import os
+import time
+import socket
+import pyocni.pyocni_tools.config as config
+from pyocni.junglers.managers.jobManager import JobManager, make_task, make_timestamp, make_owner
+from pyocni.junglers.postMan.the_post_man import PostMan
+from pyocni.suppliers.resourceSupplier import ResourceSupplier
+from pyocni.pyocni_tools.service_Container import get_service
+from pyocni.TDD.fake_Data import entities
+from pyocni.TDD.fake_Data.memory_Server import MemoryServerTestCase
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+
+def exited_pid():
+    """
+    Returns the pid of a process that has exited
+    """
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0)
+    os.waitpid(pid, 0)
+    return pid
+
+
+def make_job(job_id, owner):
+    now = make_timestamp()
+    task = make_task("dummy", "read", [{'id': job_id}])
+    task.update({'Status': "pending", 'Attempts': 0, 'Error': None})
+    return {'_id': job_id, 'Type': "Job", 'Status': "pending", 'Created': now, 'Updated': now, 'Owner': owner,
+            'Tasks': [task]}
+
+
+def wait_for_status(job_id, status):
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        job = get_service(ResourceSupplier).get_job(job_id)
+        if job['Status'] == status:
+            return job
+        time.sleep(0.05)
+    return get_service(ResourceSupplier).get_job(job_id)
+
+
+class JobsTestCase(MemoryServerTestCase):
+    """
+    The backend calls are queued as jobs (OCNI_BACKEND_JOBS = 1)
+    """
+
+    def setUp(self):
+        self.backend_jobs = config.OCNI_BACKEND_JOBS
+        config.OCNI_BACKEND_JOBS = '1'
+        MemoryServerTestCase.setUp(self)
+
+    def tearDown(self):
+        MemoryServerTestCase.tearDown(self)
+        config.OCNI_BACKEND_JOBS = self.backend_jobs
+
+    def test_job_location_header(self):
+        """
+        A request whose backend calls are queued is answered 202 with the location of the job
+        """
+        resource = json.loads(entities.resource)['resources'][0]
+        res = self.call('POST', '/compute/', json.dumps({'resources': [resource]}))
+
+        self.assertEqual(res.status_int, 202)
+        self.assertEqual(res.headers['Location'], res.headers['X-PyOCNI-Job'])
+        self.assertTrue(res.headers['Location'].startswith(config.PyOCNI_Server_Address + '/-/jobs/'))
+
+    def test_resume_claims_job_of_exited_process(self):
+        """
+        The job of a process that has exited is claimed and driven to its end
+        """
+        get_service(PostMan).save_job_in_db(make_job('job1', socket.gethostname() + ":" + str(exited_pid())))
+
+        self.assertTrue(get_service(JobManager).resume())
+
+        job = wait_for_status('job1', "succeeded")
+        self.assertEqual(job['Status'], "succeeded")
+        self.assertEqual(job['Owner'], make_owner())
+
+    def test_resume_leaves_job_of_running_process(self):
+        """
+        The job of a process still running, or of another host, is left to it
+        """
+        get_service(PostMan).save_job_in_db(make_job('job1', socket.gethostname() + ":" + str(os.getppid())))
+        get_service(PostMan).save_job_in_db(make_job('job2', "otherhost:" + str(exited_pid())))
+
+        self.assertTrue(get_service(JobManager).resume())
+
+        for job_id in ('job1', 'job2'):
+            job = get_service(ResourceSupplier).get_job(job_id)
+            self.assertEqual(job['Status'], "pending")
+            self.assertEqual(job['Tasks'][0]['Attempts'], 0)
+
+    def test_claim_once(self):
+        """
+        Two processes claiming the same job: the one saving a stale revision loses
+        """
+        get_service(PostMan).save_job_in_db(make_job('job1', socket.gethostname() + ":" + str(exited_pid())))
+        first = get_service(ResourceSupplier).get_job('job1')
+        second = get_service(ResourceSupplier).get_job('job1')
+
+        self.assertTrue(get_service(JobManager).claim(first))
+        self.assertFalse(get_service(JobManager).claim(second))
+
+
+if __name__ == '__main__':
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Create the testing suites
+    jobs_suite = loader.loadTestsFromTestCase(JobsTestCase)
+
+    #Run tests
+    runner.run(jobs_suite)
@@ -0,0 +1,150 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Paging of the collections, run in the process on the memory engine:
+
+    python -m pyocni.TDD.Tests.paging_Tests
+"""
+
+from unittest import TestLoader, TextTestRunner
+import urllib
+from pyocni.TDD.fake_Data.memory_Server import MemoryServerTestCase
+from pyocni.suppliers.resourceSupplier import ResourceSupplier, category_range
+from pyocni.pyocni_tools.service_Container import get_service
+import pyocni.pyocni_tools.config as config
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+KIND = "http://schemas.ogf.org/occi/infrastructure#compute"
+
+
+class test_streamed_pages(MemoryServerTestCase):
+    """
+    Collections read from the database a page at a time
+    """
+
+    def test_last_row_of_page_deleted(self):
+        """
+        the row after the last one of a page is read when that one is deleted before the next page
+        """
+        locations = [self.create_resource(resource_id) for resource_id in ['a1', 'a2', 'a3']]
+        key_range = category_range(KIND, 'Resource')
+        rows = get_service(ResourceSupplier).iter_rows_in_range('entities_of_kind_paged', key_range['startkey'],
+            key_range['endkey'], page_size=1)
+
+        self.assertEqual(rows.next()['key'][2], locations[0])
+        self.assertEqual(self.call('DELETE', locations[0]).status_int, 200)
+        self.assertEqual([row['key'][2] for row in rows], locations[1:])
+
+    def test_all_pages(self):
+        """
+        every row is read once
+        """
+        locations = [self.create_resource('a' + str(i)) for i in range(7)]
+        key_range = category_range(KIND, 'Resource')
+        rows = get_service(ResourceSupplier).iter_rows_in_range('entities_of_kind_paged', key_range['startkey'],
+            key_range['endkey'], page_size=2)
+
+        self.assertEqual([row['key'][2] for row in rows], sorted(locations))
+
+    def test_later_page_error(self):
+        """
+        the streamed list is not closed when a later page can not be read
+        """
+        for i in range(5):
+            self.create_resource('a' + str(i))
+        config.DB_PAGE_SIZE = '2'
+        database = get_service(ResourceSupplier).database
+        view = database.view
+
+        def failing_view(name, **kwargs):
+            #Note: the next pages are read from the last key of the previous one
+            if name.endswith('_paged') and len(kwargs['startkey']) > 2:
+                raise IOError("the database is not reachable")
+            return view(name, **kwargs)
+
+        database.view = failing_view
+        try:
+            res = self.call('GET', '/compute/')
+            self.assertEqual(res.status_int, 200)
+            body = list()
+            self.assertRaises(IOError, body.extend, res.app_iter)
+            self.assertFalse(''.join(body).endswith(']}'))
+        finally:
+            database.view = view
+
+
+class test_cursor(MemoryServerTestCase):
+    """
+    Pages of a collection asked for with limit and cursor
+    """
+
+    def get_page(self, path, cursor=None):
+        if cursor is not None:
+            path += '&cursor=' + urllib.quote(cursor)
+        res = self.call('GET', path)
+        self.assertEqual(res.status_int, 200)
+        return json.loads(res.body)['X-OCCI-Location'], res.headers.get('X-PyOCNI-Cursor')
+
+    def test_cursor_row_deleted(self):
+        """
+        the page after a cursor starts with the next entity when the entity of the cursor is deleted
+        """
+        locations = [self.create_resource(resource_id) for resource_id in ['a1', 'a2', 'a3']]
+
+        page, cursor = self.get_page('/compute/?limit=1')
+        self.assertEqual(page, locations[:1])
+        self.assertEqual(self.call('DELETE', locations[0]).status_int, 200)
+
+        page, cursor = self.get_page('/compute/?limit=1', cursor)
+        self.assertEqual(page, locations[1:2])
+        page, cursor = self.get_page('/compute/?limit=1', cursor)
+        self.assertEqual(page, locations[2:])
+        self.assertEqual(cursor, None)
+
+    def test_all_pages(self):
+        """
+        the pages give every entity once
+        """
+        locations = [self.create_resource('a' + str(i)) for i in range(5)]
+
+        found = list()
+        page, cursor = self.get_page('/compute/?limit=2')
+        found.extend(page)
+        while cursor is not None:
+            page, cursor = self.get_page('/compute/?limit=2', cursor)
+            found.extend(page)
+        self.assertEqual(found, sorted(locations))
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_streamed_pages))
+    runner.run(loader.loadTestsFromTestCase(test_cursor))
@@ -0,0 +1,189 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Restart and stop of the pre-fork server (workers of an old generation killed after graceful_timeout, keep-alive
+connections closed by a draining worker), the master runs in a forked process:
+
+    python -m pyocni.TDD.Tests.preforkServer_Tests
+"""
+
+from unittest import TestCase, TestLoader, TextTestRunner
+import os
+import time
+import errno
+import signal
+import socket
+import eventlet
+from pyocni.pyocni_tools.prefork_Server import PreforkServer
+
+GRACEFUL_TIMEOUT = 1
+
+
+def app(environ, start_response):
+    """
+    /pid answers the pid of the worker, /slow/<seconds> answers after the given time
+    """
+    path = environ['PATH_INFO']
+    if path.startswith('/slow/'):
+        eventlet.sleep(float(path[len('/slow/'):]))
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [str(os.getpid())]
+
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        if e.errno == errno.ESRCH:
+            return False
+        raise
+    return True
+
+
+def wait_until(predicate, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
+
+
+class PreforkTestCase(TestCase):
+    """
+    Each test starts a master with one worker and a graceful_timeout of 1 second
+    """
+
+    def setUp(self):
+        self.port = free_port()
+        self.master = os.fork()
+        if self.master == 0:
+            status = 0
+            try:
+                PreforkServer(app, ('127.0.0.1', self.port), workers=1, graceful_timeout=GRACEFUL_TIMEOUT).run()
+            except BaseException:
+                status = 1
+            os._exit(status)
+        self.assertTrue(wait_until(self.is_listening, 5))
+
+    def tearDown(self):
+        if self.master is None:
+            return
+        if is_alive(self.master):
+            os.kill(self.master, signal.SIGKILL)
+        os.waitpid(self.master, 0)
+
+    def is_listening(self):
+        try:
+            self.get('/pid')
+        except socket.error:
+            return False
+        return True
+
+    def connect(self):
+        sock = socket.create_connection(('127.0.0.1', self.port), timeout=5)
+        return sock
+
+    def send(self, sock, path, keepalive=False):
+        connection = 'keep-alive' if keepalive else 'close'
+        sock.sendall('GET ' + path + ' HTTP/1.1\r\nHost: localhost\r\nConnection: ' + connection + '\r\n\r\n')
+
+    def read_until_closed(self, sock):
+        data = ''
+        while True:
+            chunk = sock.recv(4096)
+            if chunk == '':
+                return data
+            data += chunk
+
+    def get(self, path):
+        sock = self.connect()
+        try:
+            self.send(sock, path)
+            return self.read_until_closed(sock).split('\r\n\r\n', 1)[1]
+        finally:
+            sock.close()
+
+    def test_restart_kills_old_worker_after_graceful_timeout(self):
+        """
+        A worker of the old generation busy with a long request is killed after graceful_timeout
+        """
+        old_worker = int(self.get('/pid'))
+        busy = self.connect()
+        self.send(busy, '/slow/30')
+        time.sleep(0.2)
+
+        os.kill(self.master, signal.SIGHUP)
+
+        self.assertTrue(wait_until(lambda: not is_alive(old_worker), GRACEFUL_TIMEOUT + 3))
+        self.assertNotEqual(int(self.get('/pid')), old_worker)
+        busy.close()
+
+    def test_stop_kills_busy_worker_after_graceful_timeout(self):
+        """
+        The master stops within graceful_timeout even if a worker is busy
+        """
+        worker = int(self.get('/pid'))
+        busy = self.connect()
+        self.send(busy, '/slow/30')
+        time.sleep(0.2)
+
+        os.kill(self.master, signal.SIGTERM)
+
+        self.assertTrue(wait_until(lambda: os.waitpid(self.master, os.WNOHANG)[0] != 0, GRACEFUL_TIMEOUT + 3))
+        #Note: The master is reaped already
+        self.master = None
+        self.assertFalse(is_alive(worker))
+        busy.close()
+
+    def test_draining_worker_closes_keepalive_connection(self):
+        """
+        A keep-alive request in progress when the worker is asked to exit is answered, then the connection is closed
+        """
+        sock = self.connect()
+        self.send(sock, '/slow/0.5', keepalive=True)
+        time.sleep(0.2)
+
+        os.kill(self.master, signal.SIGHUP)
+
+        response = self.read_until_closed(sock)
+        sock.close()
+        self.assertTrue(response.startswith('HTTP/1.1 200'))
+
+
+if __name__ == '__main__':
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Create the testing suites
+    prefork_suite = loader.loadTestsFromTestCase(PreforkTestCase)
+
+    #Run tests
+    runner.run(prefork_suite)
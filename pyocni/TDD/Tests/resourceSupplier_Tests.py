@@ -0,0 +1,93 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Multi-key lookups of the resource supplier, run in the process on the memory engine:
+
+    python -m pyocni.TDD.Tests.resourceSupplier_Tests
+"""
+
+from unittest import TestLoader, TextTestRunner
+import pyocni.pyocni_tools.config as config
+from pyocni.TDD.fake_Data.memory_Server import MemoryServerTestCase
+from pyocni.suppliers.resourceSupplier import ResourceSupplier
+from pyocni.pyocni_tools.service_Container import get_service
+
+
+class test_keys_chunks(MemoryServerTestCase):
+    """
+    Keys sent CouchDB_KEYS_CHUNK_SIZE at a time
+    """
+
+    def setUp(self):
+        MemoryServerTestCase.setUp(self)
+        self.chunk_size = config.DB_KEYS_CHUNK_SIZE
+        config.DB_KEYS_CHUNK_SIZE = '2'
+        self.supplier = get_service(ResourceSupplier)
+        self.database = self.supplier.database
+        self.view = self.database.view
+        self.calls = list()
+
+        def counted_view(name, **params):
+            self.calls.append(params)
+            return self.view(name, **params)
+
+        self.database.view = counted_view
+
+    def tearDown(self):
+        self.database.view = self.view
+        config.DB_KEYS_CHUNK_SIZE = self.chunk_size
+        MemoryServerTestCase.tearDown(self)
+
+    def test_existing_locations(self):
+        """
+        the locations already taken are found in every chunk, with one view call per chunk
+        """
+        taken = [self.create_resource(resource_id) for resource_id in ['a1', 'a4', 'a5']]
+        locations = [config.PyOCNI_Server_Address + '/compute/a' + str(i) for i in range(1, 6)]
+        del self.calls[:]
+
+        rows = self.supplier.get_existing_locations(locations)
+        self.assertEqual(sorted([row['key'] for row in rows]), taken)
+        self.assertEqual(len(self.calls), 3)
+        for params in self.calls:
+            self.assertTrue(len(params['keys']) <= 2)
+            self.assertEqual(params['reduce'], False)
+
+    def test_error(self):
+        """
+        an error on a chunk is reported as None
+        """
+
+        def failing_view(name, **params):
+            raise IOError("the database is not reachable")
+
+        self.database.view = failing_view
+        self.assertEqual(self.supplier.get_existing_locations(['/compute/a1']), None)
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_keys_chunks))
@@ -0,0 +1,191 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Precedence of the routes of the compiled router (DoItYourselfWebOb.Router):
+
+    python -m pyocni.TDD.Tests.router_Tests
+"""
+
+from unittest import TestCase, TestLoader, TextTestRunner
+import pyocni.pyocni_tools.DoItYourselfWebOb as url_mapper
+
+PATHS = ['/', '/-/', '/-/jobs/j1', '/-/jobs/j1/', '/-/stats', '/compute/', '/compute', '/compute/vm1',
+         '/compute/vm1/', '/a/b/c', '/a/b/c/', '/a/b/c/d', '/compute//', '//vm1', '/compute/vm1?action=stop',
+         '/v2/compute/vm1', '/v2/compute/', '/vx/compute/']
+
+
+class Controller(object):
+    """
+    Controller told apart by its name (a string would be loaded as module:function)
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, Controller) and other.name == self.name
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "Controller(" + self.name + ")"
+
+
+def regex_match(router, path):
+    """
+    Matching of the former router: the first route whose regex matches the path
+    """
+    for regex, controller, vars in router.routes:
+        match = regex.match(path)
+        if match:
+            urlvars = match.groupdict()
+            urlvars.update(vars)
+            return controller, urlvars
+    return None, None
+
+
+class test_match(TestCase):
+    """
+    The first route added that matches a path is chosen, whether it is in the table or a regex route
+    """
+
+    def test_first_route(self):
+        """
+        among the routes of the same shape, the first one added wins
+        """
+        router = url_mapper.Router()
+        router.add_route('/-/{job_id}', controller=Controller('first'))
+        router.add_route('/{location}/{id}', controller=Controller('second'))
+        router.add_route('/-/jobs', controller=Controller('third'))
+
+        self.assertEqual(router.match('/-/jobs'), (Controller('first'), {'job_id': 'jobs'}))
+        self.assertEqual(router.match('/compute/vm1'), (Controller('second'), {'location': 'compute',
+                                                                                'id': 'vm1'}))
+
+    def test_trailing_slash(self):
+        """
+        a path ending with a slash only matches the templates ending with one
+        """
+        router = url_mapper.Router()
+        router.add_route('/{location}/', controller=Controller('collection'))
+        router.add_route('/{location}', controller=Controller('single'))
+
+        self.assertEqual(router.match('/compute/'), (Controller('collection'), {'location': 'compute'}))
+        self.assertEqual(router.match('/compute'), (Controller('single'), {'location': 'compute'}))
+        self.assertEqual(router.match('/compute/vm1/'), (None, None))
+
+    def test_empty_segment(self):
+        """
+        a variable does not match an empty segment
+        """
+        router = url_mapper.Router()
+        router.add_route('/{location}/{id}', controller=Controller('single'))
+
+        self.assertEqual(router.match('//vm1'), (None, None))
+        self.assertEqual(router.match('/compute/'), (None, None))
+
+    def test_regex_route_before(self):
+        """
+        a regex route added before a matching table route wins
+        """
+        router = url_mapper.Router()
+        router.add_route('/{version:v[0-9]+}/{location}/', controller=Controller('versioned'))
+        router.add_route('/{location}/{id}/', controller=Controller('table'))
+
+        self.assertEqual(router.match('/v2/compute/'), (Controller('versioned'), {'version': 'v2',
+                                                                                  'location': 'compute'}))
+        self.assertEqual(router.match('/vx/compute/'), (Controller('table'), {'location': 'vx', 'id': 'compute'}))
+
+    def test_regex_route_after(self):
+        """
+        a regex route added after a matching table route only matches the paths the table does not
+        """
+        router = url_mapper.Router()
+        router.add_route('/{location}/{id}/', controller=Controller('table'))
+        router.add_route('/{version:v[0-9]+}/{location}/', controller=Controller('versioned'))
+        router.add_route('/{version:v[0-9]+}/{location}/{id}', controller=Controller('versioned_single'))
+
+        self.assertEqual(router.match('/v2/compute/'), (Controller('table'), {'location': 'v2', 'id': 'compute'}))
+        self.assertEqual(router.match('/v2/compute/vm1'), (Controller('versioned_single'), {'version': 'v2',
+            'location': 'compute', 'id': 'vm1'}))
+
+    def test_vars(self):
+        """
+        the variables given with the route are added to those of the path
+        """
+        router = url_mapper.Router()
+        router.add_route('/{location}/', controller=Controller('collection'), action='list')
+        router.add_route('/{version:v[0-9]+}/{location}', controller=Controller('versioned'), action='read')
+
+        self.assertEqual(router.match('/compute/'), (Controller('collection'), {'location': 'compute',
+                                                                                'action': 'list'}))
+        self.assertEqual(router.match('/v1/compute'), (Controller('versioned'), {'version': 'v1',
+            'location': 'compute', 'action': 'read'}))
+
+    def test_same_as_regex(self):
+        """
+        routes shaped as those of the server, with regex routes added between them, match as the first matching
+        regex would
+        """
+        router = url_mapper.Router()
+        router.add_route('/{version:v[0-9]+}/{location}/{id}', controller=Controller('versioned'))
+        router.add_route('/-/', controller=Controller('query'))
+        router.add_route('/-/jobs/{job_id}', controller=Controller('job'))
+        router.add_route('/-/stats', controller=Controller('stats'))
+        router.add_route('/{location}/', controller=Controller('multi'))
+        router.add_route('/{location}/{a}/', controller=Controller('multi'))
+        router.add_route('/{version:v[0-9]+}/{location}/', controller=Controller('versioned_multi'))
+        router.add_route('/{location}/{a}/{b}/', controller=Controller('multi'))
+        router.add_route('/{location}/{a}', controller=Controller('single'))
+        router.add_route('/{location}/{a}/{b}', controller=Controller('single'))
+
+        for path in PATHS:
+            self.assertEqual(router.match(path), regex_match(router, path), path)
+
+    def test_server_routes(self):
+        """
+        the paths of the server go to their dispatcher
+        """
+        from pyocni.occi_server import occi_server
+        app = occi_server.app
+        #Note: The controllers are read from the class dictionary, not as unbound methods
+        controllers = occi_server.__dict__
+
+        self.assertEqual(app.match('/-/')[0], controllers['operationQuery'])
+        self.assertEqual(app.match('/-/jobs/j1'), (controllers['operationJob'], {'job_id': 'j1'}))
+        self.assertEqual(app.match('/-/stats'), (controllers['operationStats'], {}))
+        self.assertEqual(app.match('/compute/')[0], controllers['operationMultiEntity'])
+        self.assertEqual(app.match('/compute/vm1')[0], controllers['operationSingleEntity'])
+        self.assertEqual(app.match('/a/b/c/')[0], controllers['operationMultiEntity'])
+        self.assertEqual(app.match('/a/b/c/d'), (None, None))
+        for path in PATHS:
+            self.assertEqual(app.match(path), regex_match(app, path), path)
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_match))
@@ -0,0 +1,172 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Front ends of OCNI_SERVER_MODE: the requests of the interface tests are sent over HTTP to an eventlet server and to
+a threaded one, both on the memory engine in a forked process, and must get the same answers:
+
+    python -m pyocni.TDD.Tests.serverModes_Tests
+"""
+
+from unittest import TestLoader, TextTestRunner
+import os
+import time
+import signal
+import socket
+import httplib
+import pyocni.pyocni_tools.config as config
+from pyocni.occi_server import occi_server
+from pyocni.storage.engine import get_engine
+from pyocni.TDD.fake_Data import categories, entities
+from pyocni.TDD.fake_Data.memory_Server import MemoryServerTestCase, JSON
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+MODES = ['eventlet', 'threaded']
+
+
+def make_resource(resource_id):
+    resource = json.loads(entities.resource)['resources'][0]
+    resource['id'] = resource_id
+    return json.dumps({'resources': [resource]})
+
+
+def make_scenario():
+    """
+    Requests of the query, multi entity and single entity interface tests: (method, path, body, headers)
+    """
+    update = json.loads(make_resource('vm1'))
+    update['resources'][0]['title'] = 'updated'
+    return [
+        ('POST', '/-/', categories.kind, {}),
+        ('POST', '/-/', categories.mixin, {}),
+        ('GET', '/-/', None, {}),
+        ('POST', '/compute/', make_resource('vm1'), {}),
+        ('POST', '/compute/', make_resource('vm2'), {}),
+        ('GET', '/compute/', None, {}),
+        ('GET', '/compute/vm1', None, {}),
+        ('GET', '/compute/', None, {'Accept': 'text/plain'}),
+        ('GET', '/compute/', None, {'Accept': 'text/uri-list'}),
+        ('PUT', '/compute/vm1', json.dumps(update), {}),
+        ('GET', '/compute/vm1', None, {}),
+        ('DELETE', '/compute/vm2', None, {}),
+        ('GET', '/compute/vm2', None, {}),
+        ('GET', '/compute/', None, {}),
+        ('GET', '/-/jobs/unknown', None, {}),
+        ('GET', '/nowhere/', None, {}),
+    ]
+
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class ServerModesTestCase(MemoryServerTestCase):
+    """
+    One server per mode, each one with its own empty memory store
+    """
+
+    def setUp(self):
+        MemoryServerTestCase.setUp(self)
+        self.server_mode = config.OCNI_SERVER_MODE
+        self.servers = dict()
+        for mode in MODES:
+            self.servers[mode] = self.start_server(mode)
+
+    def tearDown(self):
+        for pid, port in self.servers.values():
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        config.OCNI_SERVER_MODE = self.server_mode
+        MemoryServerTestCase.tearDown(self)
+
+    def start_server(self, mode):
+        port = free_port()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                config.OCNI_SERVER_MODE = mode
+                get_engine().install()
+                occi_server().serve(('127.0.0.1', port))
+            except BaseException:
+                status = 1
+            os._exit(status)
+
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except socket.error:
+                time.sleep(0.05)
+        return pid, port
+
+    def send(self, port, method, path, body, headers):
+        """
+        Returns the status, content type and body of the answer
+        """
+        #Note: The locations are made from the configured address of the server
+        request_headers = {'Host': config.OCNI_IP + ':' + config.OCNI_PORT, 'Accept': JSON, 'Content-Type': JSON}
+        request_headers.update(headers)
+        connection = httplib.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            connection.request(method, path, body, request_headers)
+            res = connection.getresponse()
+            return res.status, res.getheader('Content-Type'), res.read()
+        finally:
+            connection.close()
+
+    def test_same_answers(self):
+        """
+        The threaded server answers the requests of the interface tests as the eventlet one
+        """
+        for method, path, body, headers in make_scenario():
+            answers = dict()
+            for mode in MODES:
+                answers[mode] = self.send(self.servers[mode][1], method, path, body, headers)
+            self.assertEqual(answers['threaded'], answers['eventlet'], method + " " + path)
+
+    def test_answers(self):
+        """
+        The scenario reaches every interface
+        """
+        port = self.servers['threaded'][1]
+        statuses = [self.send(port, *request)[0] for request in make_scenario()]
+        self.assertEqual(statuses, [200, 200, 200, 201, 201, 200, 200, 200, 200, 201, 200, 200, 404, 200, 404, 200])
+
+
+if __name__ == '__main__':
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Create the testing suites
+    modes_suite = loader.loadTestsFromTestCase(ServerModesTestCase)
+
+    #Run tests
+    runner.run(modes_suite)
@@ -0,0 +1,206 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+The views of the SQLite engine, answered by SQL queries (range_condition, bound_condition), compared with those of
+the memory engine for the same documents, keys and key ranges:
+
+    python -m pyocni.TDD.Tests.sqliteViews_Tests
+"""
+
+import os
+import tempfile
+from unittest import TestCase, TestLoader, TextTestRunner
+import pyocni.pyocni_tools.config as config
+from pyocni.storage.memory_engine import MemoryDatabase
+from pyocni.storage.sqlite_engine import SQLiteDatabase
+from pyocni.suppliers.kindIndexes import KindIndexes
+from pyocni.suppliers.resourceSupplier import category_range, path_range, PATH_RANGE_END
+
+COMPUTE = "http://schemas.ogf.org/occi/infrastructure#compute"
+STORAGE = "http://schemas.ogf.org/occi/infrastructure#storage"
+NETWORK = "http://schemas.ogf.org/occi/infrastructure#networkinterface"
+MEDIUM = "http://example.com/template/resource#medium"
+LARGE = "http://example.com/template/resource#large"
+
+KIND_DOC = {'_id': 'kind_compute', 'Type': 'Kind', 'OCCI_ID': COMPUTE,
+            'OCCI_Location': config.PyOCNI_Server_Address + '/compute/', 'Provider': {'local': ['dummy']},
+            'OCCI_Description': {'term': 'compute', 'scheme': 'http://schemas.ogf.org/occi/infrastructure#',
+                                 'location': '/compute/',
+                                 'attributes': {'occi': {'compute': {'cores': {'indexed': True},
+                                                                     'state': {'indexed': True}}}}}}
+
+
+def make_entity(doc_id, entity_type, location, kind, mixins, attributes):
+    return {'_id': doc_id, 'Type': entity_type, 'OCCI_ID': doc_id,
+            'OCCI_Location': config.PyOCNI_Server_Address + location,
+            'OCCI_Description': {'kind': kind, 'id': doc_id, 'mixins': mixins, 'attributes': attributes}}
+
+
+def make_docs():
+    docs = [dict(KIND_DOC),
+            {'_id': 'mixin_medium', 'Type': 'Mixin', 'OCCI_ID': MEDIUM,
+             'OCCI_Location': config.PyOCNI_Server_Address + '/template/medium/', 'OCCI_Description': {}},
+            {'_id': 'job_1', 'Type': 'Job', 'Status': 'pending', 'Created': 12.5},
+            {'_id': 'job_2', 'Type': 'Job', 'Status': 'pending', 'Created': 3},
+            {'_id': 'job_3', 'Type': 'Job', 'Status': 'failed', 'Created': 7}]
+    states = ['active', 'inactive', None, 3, 'active', {'a': 1}, 'suspended', '']
+    for i in range(len(states)):
+        mixins = [[], [MEDIUM], [MEDIUM, LARGE], [LARGE]][i % 4]
+        docs.append(make_entity('vm' + str(i), 'Resource', '/compute/vm' + str(i), COMPUTE, mixins,
+            {'occi': {'compute': {'state': states[i], 'cores': i % 3}}}))
+    docs.append(make_entity('st1', 'Resource', '/storage/st1', STORAGE, [MEDIUM], {'occi': {'storage': {}}}))
+    docs.append(make_entity('vm10', 'Resource', '/compute/sub/vm10', COMPUTE, [], {}))
+    docs.append(make_entity('no_kind', 'Resource', '/other/no_kind', None, [None], {}))
+    docs.append(make_entity('ni1', 'Link', '/link/ni1', NETWORK, [LARGE], {'occi': {'compute': {'state': 'active'}}}))
+    docs.append(make_entity('ni2', 'Link', '/compute/ni2', COMPUTE, [], {'occi': {'compute': {'state': 'active'}}}))
+    return docs
+
+
+def without_rev(value):
+    """
+    The revisions are random, the documents are compared without them
+    """
+    if type(value) is dict and value.has_key('_rev'):
+        value = dict(value)
+        del value['_rev']
+    return value
+
+
+class test_views(TestCase):
+    """
+    Rows of the views (ids, keys, values and their order) of the SQLite engine and of the memory engine
+    """
+
+    def setUp(self):
+        sqlite_file = tempfile.NamedTemporaryFile(suffix='.sqlite', delete=False)
+        sqlite_file.close()
+        self.sqlite_path = sqlite_file.name
+        self.databases = [MemoryDatabase(config.PyOCNI_DB), SQLiteDatabase(config.PyOCNI_DB, self.sqlite_path)]
+        kind_indexes = KindIndexes().make_design_doc([KIND_DOC])
+        for database in self.databases:
+            config.install_design_doc(database, config.design_doc)
+            config.install_design_doc(database, kind_indexes)
+            database.save_docs(make_docs(), use_uuids=True, all_or_nothing=True)
+        self.index_view = '/kind_indexes/' + kind_indexes['views'].keys()[0]
+
+    def tearDown(self):
+        self.databases[1].close()
+        for suffix in ['', '-wal', '-shm']:
+            if os.path.exists(self.sqlite_path + suffix):
+                os.remove(self.sqlite_path + suffix)
+
+    def check(self, view_name, **params):
+        """
+        Both engines give the same rows, returns them
+        """
+        results = list()
+        for database in self.databases:
+            rows = database.view(view_name, **params).all()
+            results.append([(row.get('id'), row['key'], without_rev(row['value']), without_rev(row.get('doc')))
+                            for row in rows])
+        self.assertEqual(results[1], results[0], view_name + " " + str(params))
+        return results[0]
+
+    def test_keys(self):
+        """
+        rows read by key and by keys
+        """
+        location = config.PyOCNI_Server_Address + '/compute/vm1'
+        self.assertEqual(len(self.check('/db_views/for_update_entities', key=location)), 1)
+        self.check('/db_views/for_check_locations', keys=[location, 'missing', location])
+        self.check('/db_views/entities_of_kind', key=COMPUTE, include_docs=True)
+        self.check('/db_views/entities_of_mixin', keys=[LARGE, MEDIUM])
+        self.check('/db_views/entities_of_kind_paged', key=[COMPUTE, 'Resource', location])
+        self.check('/db_views/entities_of_kind_paged', key=COMPUTE)
+        self.check('/db_views/for_associate_mixin', keys=[[location]])
+
+    def test_category_ranges(self):
+        """
+        the key ranges of the paged views, with limits, skip and from a key already read
+        """
+        for view_name in ['/db_views/entities_of_kind_paged', '/db_views/entities_of_mixin_paged']:
+            for category in [COMPUTE, STORAGE, NETWORK, MEDIUM, LARGE, 'missing']:
+                for entity_type in ['Resource', 'Link']:
+                    key_range = category_range(category, entity_type)
+                    rows = self.check(view_name, reduce=False, **key_range)
+                    self.check(view_name, reduce=False, limit=2, **key_range)
+                    self.check(view_name, reduce=False, skip=1, limit=2, **key_range)
+                    self.check(view_name, **key_range)
+                    for row in rows:
+                        self.check(view_name, startkey=row[1], endkey=key_range['endkey'], reduce=False, limit=3)
+                        self.check(view_name, startkey=key_range['startkey'], endkey=row[1], reduce=False,
+                            inclusive_end=False)
+
+    def test_path_ranges(self):
+        """
+        the locations below a path
+        """
+        for path in ['/compute/', '/compute/sub/', '/link/', '/', '/none/']:
+            key_range = path_range(config.PyOCNI_Server_Address + path)
+            self.check('/db_views/for_check_locations', reduce=False, **key_range)
+            self.check('/db_views/for_check_locations', reduce=False, include_docs=True, **key_range)
+
+    def test_open_ranges(self):
+        """
+        ranges with a missing bound, null, array and object bounds
+        """
+        self.check('/db_views/entities_of_kind_paged', startkey=[COMPUTE], reduce=False)
+        self.check('/db_views/entities_of_kind_paged', endkey=[COMPUTE, 'Resource'], reduce=False)
+        self.check('/db_views/entities_of_kind_paged', startkey=[COMPUTE], endkey=[COMPUTE, {}], reduce=False)
+        self.check('/db_views/entities_of_kind_paged', startkey=[COMPUTE, None], endkey=[COMPUTE, []], reduce=False)
+        self.check('/db_views/entities_of_kind_paged', startkey=None, endkey=[NETWORK], reduce=False)
+        self.check('/db_views/entities_of_kind_paged', startkey=COMPUTE, reduce=False)
+        self.check('/db_views/entities_of_kind', startkey=COMPUTE, endkey=NETWORK, reduce=False)
+        self.check('/db_views/entities_of_kind', startkey=COMPUTE, endkey=NETWORK, inclusive_end=False,
+            reduce=False)
+        self.check('/db_views/for_check_locations', startkey=None, reduce=False)
+        self.check('/db_views/jobs_by_status', startkey=['pending'], endkey=['pending', {}], reduce=False)
+        self.check('/db_views/jobs_by_status', startkey=['failed', 7], endkey=['pending', 3], reduce=False)
+        self.check('/db_views/jobs_by_status', startkey=['pending', 5], endkey=['pending', 20], reduce=False)
+
+    def test_attribute_indexes(self):
+        """
+        the attribute index views, over string, number, null and object values
+        """
+        self.check('/db_views/entities_by_attribute', reduce=False)
+        for category in [COMPUTE, MEDIUM, LARGE, NETWORK]:
+            for value in ['active', 3, '', None]:
+                for entity_type in ['Resource', 'Link']:
+                    self.check('/db_views/entities_by_attribute', reduce=False,
+                        startkey=[category, 'occi.compute.state', value, entity_type],
+                        endkey=[category, 'occi.compute.state', value, entity_type, PATH_RANGE_END])
+        self.check(self.index_view, reduce=False)
+        self.check(self.index_view, startkey=['occi.compute.cores', 1], endkey=['occi.compute.cores', 2, {}],
+            reduce=False)
+        self.check(self.index_view, startkey=['occi.compute.state', 'active', 'Resource'],
+            endkey=['occi.compute.state', 'active', 'Resource', PATH_RANGE_END], reduce=False)
+        self.check(self.index_view, startkey=['occi.compute.state', 'b'], endkey=['occi.compute.state', {}],
+            reduce=False)
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_views))
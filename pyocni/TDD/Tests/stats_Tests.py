@@ -0,0 +1,94 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+The counters of the server process, run in the process on the memory engine:
+
+    python -m pyocni.TDD.Tests.stats_Tests
+"""
+
+from unittest import TestLoader, TextTestRunner
+from pyocni.pyocni_tools.service_Container import get_service
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.TDD.fake_Data.memory_Server import MemoryServerTestCase
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+
+class test_get(MemoryServerTestCase):
+    """
+    Counters read with GET /-/stats
+    """
+
+    def get_stats(self):
+        res = self.call('GET', '/-/stats')
+        self.assertEqual(res.status_int, 200)
+        self.assertEqual(res.content_type, 'application/occi+json')
+        return json.loads(res.body)
+
+    def test_sections(self):
+        """
+        every service of the process gives its counters
+        """
+        stats = self.get_stats()
+        self.assertEqual(sorted(stats.keys()), ['categories', 'engine', 'jobs', 'pid', 'updates', 'write_coalescer'])
+        self.assertEqual(stats['engine']['engine'], 'MemoryEngine')
+        self.assertEqual(stats['categories']['categories'], 2)
+
+    def test_updates(self):
+        """
+        an update of an entity is counted
+        """
+        location = self.create_resource('a1')
+        before = self.get_stats()['updates']['updates']
+        resource = {'resources': [{'kind': 'http://schemas.ogf.org/occi/infrastructure#compute',
+                                   'attributes': {'occi': {'compute': {'speed': 3}}}}]}
+        self.assertEqual(self.call('POST', location, json.dumps(resource)).status_int, 201)
+        self.assertEqual(self.get_stats()['updates']['updates'], before + 1)
+
+    def test_category_lookups(self):
+        """
+        the lookups of the category registry are counted, not its loads
+        """
+        registry = get_service(CategoryRegistry)
+        registry.ensure_loaded()
+        before = self.get_stats()['categories']
+        registry.ensure_loaded()
+        registry.get_by_occi_id('http://schemas.ogf.org/occi/infrastructure#compute')
+        registry.get_by_occi_id('http://schemas.ogf.org/occi/infrastructure#unknown')
+        registry.get_by_location('/nowhere/')
+
+        after = self.get_stats()['categories']
+        self.assertEqual(after['hits'], before['hits'] + 1)
+        self.assertEqual(after['misses'], before['misses'] + 2)
+        self.assertEqual(after['reloads'], before['reloads'])
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_get))
@@ -0,0 +1,299 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+Batches of the write coalescer (conflicts found in submit and take_batch, documents read from the overlay and
+their placeholder revision), run in the process on the memory engine:
+
+    python -m pyocni.TDD.Tests.writeCoalescer_Tests
+"""
+
+from unittest import TestCase, TestLoader, TextTestRunner
+import eventlet
+from couchdbkit import ResourceConflict
+import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
+from pyocni.storage.write_coalescer import WriteCoalescer, PendingWrite, TOKEN_PREFIX
+from pyocni.storage.memory_engine import rev_generation
+from pyocni.pyocni_tools.service_Container import container
+
+#Note: Settings changed by the test cases, set back after each test
+SETTINGS = ['DB_ENGINE', 'DB_JOURNAL', 'DB_WRITE_BATCH_WINDOW', 'DB_WRITE_BATCH_SIZE']
+
+LOCATION = config.PyOCNI_Server_Address + '/compute/'
+
+
+def make_doc(doc_id, **fields):
+    doc = {'_id': doc_id, 'Type': 'Resource', 'OCCI_Location': LOCATION + doc_id,
+           'OCCI_Description': {'kind': 'http://schemas.ogf.org/occi/infrastructure#compute', 'id': doc_id}}
+    doc.update(fields)
+    return doc
+
+
+class CoalescerTestCase(TestCase):
+    """
+    Each test starts with an empty memory store and a coalescer whose batches wait 20 ms
+    """
+
+    def setUp(self):
+        self.settings = dict((name, getattr(config, name)) for name in SETTINGS)
+        config.DB_ENGINE = 'memory'
+        config.DB_JOURNAL = ''
+        config.DB_WRITE_BATCH_WINDOW = '20'
+        config.DB_WRITE_BATCH_SIZE = '100'
+        container.reset()
+        self.database = get_engine().install()
+        self.coalescer = WriteCoalescer()
+        self.pool = eventlet.GreenPool()
+        self.results = dict()
+
+    def tearDown(self):
+        for name, value in self.settings.items():
+            setattr(config, name, value)
+        container.reset()
+
+    def spawn(self, name, doc, force_update=False):
+        """
+        Saves a document in a green thread, its result or error is kept under name
+        """
+
+        def save():
+            try:
+                self.results[name] = self.coalescer.save(doc, force_update)
+            except Exception as e:
+                self.results[name] = e
+
+        self.pool.spawn_n(save)
+        #Note: The writer runs until it waits for its batch
+        eventlet.sleep(0)
+
+
+class test_submit(CoalescerTestCase):
+    """
+    Writes waiting for their batch
+    """
+
+    def test_one_batch(self):
+        """
+        the writes of different documents are saved in one batch, each writer gets its own result
+        """
+        for i in range(5):
+            self.spawn(i, make_doc('vm' + str(i)))
+        self.pool.waitall()
+
+        self.assertEqual(self.coalescer.stats()['batches'], 1)
+        for i in range(5):
+            self.assertEqual(self.results[i]['id'], 'vm' + str(i))
+            self.assertEqual(self.database.open_doc('vm' + str(i))['_rev'], self.results[i]['rev'])
+
+    def test_same_revision(self):
+        """
+        a write based on the revision a waiting write of the document is based on conflicts at once
+        """
+        rev = self.database.save_doc(make_doc('vm1'))['rev']
+        self.spawn('first', make_doc('vm1', _rev=rev, title='first'))
+        self.assertRaises(ResourceConflict, self.coalescer.save, make_doc('vm1', _rev=rev, title='second'))
+        #Note: The first write is still waiting, the second one was not queued
+        self.assertEqual(self.coalescer.stats()['queued'], 1)
+        self.assertEqual(self.coalescer.stats()['writes'], 1)
+        self.pool.waitall()
+
+        self.assertEqual(rev_generation(self.results['first']['rev']), 2)
+        self.assertEqual(self.database.open_doc('vm1')['title'], 'first')
+        self.assertEqual(self.coalescer.stats()['conflicts'], 1)
+
+    def test_outdated_revision(self):
+        """
+        a write based on an old revision conflicts when its batch is saved
+        """
+        rev = self.database.save_doc(make_doc('vm1'))['rev']
+        self.database.save_doc(make_doc('vm1', _rev=rev))
+        self.spawn('old', make_doc('vm1', _rev=rev))
+        self.pool.waitall()
+
+        self.assertTrue(isinstance(self.results['old'], ResourceConflict))
+
+    def test_forced_updates(self):
+        """
+        forced updates of a document are saved one per batch, in the order they were made
+        """
+        rev = self.database.save_doc(make_doc('vm1'))['rev']
+        self.spawn('first', make_doc('vm1', _rev=rev, title='first'), True)
+        self.spawn('second', make_doc('vm1', _rev=rev, title='second'), True)
+        self.pool.waitall()
+
+        self.assertEqual(self.coalescer.stats()['batches'], 2)
+        self.assertEqual(rev_generation(self.results['second']['rev']), 3)
+        self.assertEqual(self.database.open_doc('vm1')['title'], 'second')
+
+
+class test_overlay(CoalescerTestCase):
+    """
+    Documents read while their write is waiting, with the placeholder revision of that write
+    """
+
+    def read(self, doc_id):
+        rows = self.coalescer.get_pending_rows('for_update_entities', LOCATION + doc_id)
+        if rows is None:
+            return None
+        return [row['value'] for row in rows]
+
+    def test_pending_rows(self):
+        """
+        the waiting version of the document is read with a placeholder revision, until it is saved
+        """
+        self.spawn('first', make_doc('vm1', title='first'))
+        docs = self.read('vm1')
+        self.assertEqual(docs[0]['title'], 'first')
+        self.assertTrue(docs[0]['_rev'].startswith(TOKEN_PREFIX))
+        self.assertEqual(self.read('vm1')[0]['_rev'], docs[0]['_rev'])
+        self.assertEqual(self.read('vm2'), None)
+        self.pool.waitall()
+
+        self.assertEqual(self.read('vm1'), None)
+
+    def test_deleted(self):
+        """
+        a document waiting to be deleted gives no rows
+        """
+        rev = self.database.save_doc(make_doc('vm1'))['rev']
+        self.pool.spawn_n(self.coalescer.delete, make_doc('vm1', _rev=rev))
+        eventlet.sleep(0)
+        self.assertEqual(self.read('vm1'), [])
+        self.pool.waitall()
+
+    def test_write_after(self):
+        """
+        a write of a document read from the overlay is saved after the write it was read from, with its revision
+        """
+        self.spawn('first', make_doc('vm1', title='first'))
+        doc = self.read('vm1')[0]
+        doc['title'] = 'second'
+        self.spawn('second', doc)
+        self.pool.waitall()
+
+        self.assertEqual(rev_generation(self.results['first']['rev']), 1)
+        self.assertEqual(rev_generation(self.results['second']['rev']), 2)
+        self.assertEqual(self.database.open_doc('vm1')['title'], 'second')
+
+    def test_token_saved(self):
+        """
+        a document read from the overlay and written once its write is saved gets the saved revision
+        """
+        self.spawn('first', make_doc('vm1', title='first'))
+        doc = self.read('vm1')[0]
+        self.pool.waitall()
+        self.assertEqual(rev_generation(self.coalescer.save(doc)['rev']), 2)
+
+    def test_write_after_failed(self):
+        """
+        a write of a document read from a write that failed conflicts
+        """
+        rev = self.database.save_doc(make_doc('vm1'))['rev']
+        self.database.save_doc(make_doc('vm1', _rev=rev))
+        self.spawn('old', make_doc('vm1', _rev=rev))
+        doc = self.read('vm1')[0]
+        self.spawn('after', doc)
+        self.pool.waitall()
+
+        self.assertTrue(isinstance(self.results['old'], ResourceConflict))
+        self.assertTrue(isinstance(self.results['after'], ResourceConflict))
+        self.assertEqual(rev_generation(self.database.open_doc('vm1')['_rev']), 2)
+
+
+class test_take_batch(TestCase):
+    """
+    Batches taken from the queue, without saving them
+    """
+
+    def setUp(self):
+        self.coalescer = WriteCoalescer()
+
+    def queue(self, doc_id, after=None, force_update=False):
+        write = PendingWrite(make_doc(doc_id), force_update)
+        write.after = after
+        write.base = (write.doc_id, write.base_rev)
+        self.coalescer.bases[write.base] = self.coalescer.bases.get(write.base, 0) + 1
+        self.coalescer.queue.append(write)
+        return write
+
+    def test_one_write_per_document(self):
+        """
+        a second write of a document waits for the next batch, the batch keeps the order of the queue
+        """
+        writes = [self.queue('vm1'), self.queue('vm2'), self.queue('vm1'), self.queue('vm3')]
+        batch, orphans = self.coalescer.take_batch(10)
+        self.assertEqual(batch, [writes[0], writes[1], writes[3]])
+        self.assertEqual(orphans, [])
+        self.assertEqual(self.coalescer.queue, [writes[2]])
+        self.assertEqual(self.coalescer.bases, {('vm1', None): 1})
+
+    def test_size(self):
+        """
+        a batch holds at most size writes
+        """
+        writes = [self.queue('vm' + str(i)) for i in range(5)]
+        batch, orphans = self.coalescer.take_batch(2)
+        self.assertEqual(batch, writes[:2])
+        self.assertEqual(self.coalescer.queue, writes[2:])
+
+    def test_after(self):
+        """
+        a write based on a waiting write stays in the queue until that one is done, then gets its revision
+        """
+        first = self.queue('vm1')
+        second = self.queue('vm1', after=first)
+        batch, orphans = self.coalescer.take_batch(10)
+        self.assertEqual(batch, [first])
+        self.assertEqual(self.coalescer.queue, [second])
+
+        first.result = {'ok': True, 'id': 'vm1', 'rev': '1-a'}
+        first.done.send()
+        batch, orphans = self.coalescer.take_batch(10)
+        self.assertEqual(batch, [second])
+        self.assertEqual(second.doc['_rev'], '1-a')
+        self.assertEqual(second.after, None)
+        self.assertEqual(self.coalescer.bases, {})
+
+    def test_orphans(self):
+        """
+        a write based on a write that failed is taken out as an orphan, unless it is forced
+        """
+        failed = PendingWrite(make_doc('vm1'), False)
+        failed.error = ResourceConflict("Document update conflict.")
+        failed.done.send()
+        orphan = self.queue('vm1', after=failed)
+        forced = self.queue('vm2', after=failed, force_update=True)
+        batch, orphans = self.coalescer.take_batch(10)
+        self.assertEqual(orphans, [orphan])
+        self.assertEqual(batch, [forced])
+        self.assertEqual(self.coalescer.queue, [])
+
+
+if __name__ == '__main__':
+
+    #Create the testing tools
+    loader = TestLoader()
+    runner = TextTestRunner(verbosity=2)
+
+    #Run tests
+    runner.run(loader.loadTestsFromTestCase(test_submit))
+    runner.run(loader.loadTestsFromTestCase(test_overlay))
+    runner.run(loader.loadTestsFromTestCase(test_take_batch))
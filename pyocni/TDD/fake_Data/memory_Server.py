@@ -0,0 +1,108 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Test case whose requests are handled in the process by the OCCI server application, on the memory engine: neither
+CouchDB nor a running server is needed.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+from webob import Request
+import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
+from pyocni.pyocni_tools.service_Container import container
+from pyocni.pyocni_tools.db_Calls import get_db_calls
+from pyocni.TDD.fake_Data import categories, entities
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+#Note: Settings changed by the test cases, set back after each test
+SETTINGS = ['DB_ENGINE', 'DB_JOURNAL', 'DB_PAGE_SIZE', 'DB_WRITE_BATCH_WINDOW', 'BACKENDS_FILE', 'OCNI_DEBUG_DB_CALLS']
+
+JSON = 'application/occi+json'
+
+
+class MemoryServerTestCase(TestCase):
+    """
+    Each test starts with an empty memory store holding the compute kind and the medium mixin of fake_Data
+    """
+
+    def setUp(self):
+        self.settings = dict((name, getattr(config, name)) for name in SETTINGS)
+        backends_file = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+        json.dump({'backends': [{'name': 'dummy', 'path': os.path.join(os.path.dirname(config.__file__), '..',
+                                                                        'backends', 'dummy_backend.py')}]},
+                  backends_file)
+        backends_file.close()
+        config.BACKENDS_FILE = backends_file.name
+        config.DB_ENGINE = 'memory'
+        config.DB_JOURNAL = ''
+        config.DB_WRITE_BATCH_WINDOW = '0'
+        container.reset()
+        get_engine().install()
+
+        from pyocni.occi_server import occi_server
+        self.app = occi_server.app
+        self.assertEqual(self.call('POST', '/-/', categories.kind).status_int, 200)
+        self.assertEqual(self.call('POST', '/-/', categories.mixin).status_int, 200)
+
+    def tearDown(self):
+        os.remove(config.BACKENDS_FILE)
+        for name, value in self.settings.items():
+            setattr(config, name, value)
+        container.reset()
+
+    def call(self, method, path, body=None, headers=None):
+        """
+        Handles a request, returns the webob response
+        """
+        req = Request.blank(path, base_url=config.PyOCNI_Server_Address, method=method, headers={'Accept': JSON})
+        if headers is not None:
+            req.headers.update(headers)
+        if body is not None:
+            req.body = body
+            req.content_type = JSON
+        self.environ = req.environ
+        return req.get_response(self.app)
+
+    def get_db_calls(self, res):
+        """
+        Returns the number of database calls made by the request of the response, once its body is read
+        """
+        #Note: The pages of a streamed body are read, and counted, when the body is
+        self.assertIsNotNone(res.body)
+        return get_db_calls(self.environ)
+
+    def create_resource(self, resource_id, **description):
+        """
+        Creates a compute resource of fake_Data with its own id, returns its location
+        """
+        resource = json.loads(entities.resource)['resources'][0]
+        resource['id'] = resource_id
+        resource.update(description)
+        res = self.call('POST', '/compute/', json.dumps({'resources': [resource]}))
+        self.assertEqual(res.status_int, 201)
+        return json.loads(res.body)['Location'][0]
@@ -27,9 +27,13 @@ try:
     import simplejson as json
 except ImportError:
     import json
+import itertools
 import pyocni.adapters.cnv_toHTTP as extractor
 from webob import Response
 
+#Note: Number of locations written at once in a streamed response
+STREAM_BATCH_SIZE = 100
+
 class To_HTTP_Text_Plain():
     """
     Converts Response data from application/occi+json object to HTTP text/plain descriptions
@@ -125,6 +129,15 @@ class To_HTTP_Text_Plain():
             locs += "X-OCCI-Location: " + item + "\n"
         return locs
 
+    def iter_text_plain_x_locations(self, var):
+        """
+        Converts JSON locations into HTTP locations, a batch of locations at a time (streamed responses)
+        Args:
+            var: iterator on JSON locations
+        """
+        for batch in iter_batches(var):
+            yield to_bytes("".join(["X-OCCI-Location: " + item + "\n" for item in batch]))
+
 
 class To_HTTP_Text_OCCI():
     """
@@ -249,6 +262,35 @@ class To_HTTP_Text_URI_List():
 
         return resp, True
 
+    def iter_uri_locations(self, var):
+        """
+        Converts JSON locations into a URI list, a batch of locations at a time (streamed responses)
+        Args:
+            @param var: iterator on JSON locations
+        """
+        for batch in iter_batches(var):
+            yield to_bytes("".join([item + "\n" for item in batch]))
+
+
+def iter_batches(var, size=None):
+    """
+    Groups the items of an iterator in lists of STREAM_BATCH_SIZE items, one list is written to the socket at a time
+    """
+    if size is None:
+        size = STREAM_BATCH_SIZE
+    var = iter(var)
+    while True:
+        batch = list(itertools.islice(var, size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def to_bytes(text):
+    if type(text) is unicode:
+        return text.encode('utf-8')
+    return text
+
 
 def cnv_JSON_category(category, type):
     """
@@ -24,7 +24,9 @@ Created on Oct 02, 2012
 """
 
 from webob import Response
-from pyocni.adapters.httpResponse_Formater import To_HTTP_Text_OCCI, To_HTTP_Text_Plain, To_HTTP_Text_URI_List
+from pyocni.pyocni_tools.config import return_code
+from pyocni.adapters.httpResponse_Formater import To_HTTP_Text_OCCI, To_HTTP_Text_Plain, To_HTTP_Text_URI_List, \
+    iter_batches
 
 try:
     import simplejson as json
@@ -59,9 +61,17 @@ class ResponseAdapter():
         return res
 
 
-    def convert_response_entity_multi_location_content(self, var, res):
+    def convert_response_entity_multi_location_content(self, var, res, failed=None):
+        """
+        Args:
+            @param var: locations of the created entities
+            @param res: response
+            @param failed: entities that could not be created ({"location", "error", "reason"}), if any
+        """
         if str(res.content_type) == "application/occi+json":
             location_dict = {"Location": var}
+            if failed:
+                location_dict["Failed"] = failed
             res.body = json.dumps(location_dict)
 
         elif str(res.content_type) == "text/occi":
@@ -83,6 +93,9 @@ class ResponseAdapter():
             res.content_type = "text/plain"
             res.body = self.text_plain_f.format_to_text_plain_locations(var)
 
+        if failed:
+            res.headers['X-PyOCNI-Failed'] = str(len(failed))
+
         return res
 
     def convert_response_entity_location_content(self, var, res):
@@ -121,6 +134,10 @@ class ResponseAdapter():
 
     def convert_response_entity_multi_x_occi_location_content(self, var, res):
 
+        if type(var) is not list and str(res.content_type) != "text/occi":
+            #Note: An iterator on the locations is streamed, the collection is never held in memory
+            return self.stream_response_entity_multi_x_occi_location_content(var, res)
+
         if str(res.content_type) == "application/occi+json":
             x_occi_location_dict = {"X-OCCI-Location": var}
             res.body = json.dumps(x_occi_location_dict)
@@ -128,7 +145,7 @@ class ResponseAdapter():
         elif str(res.content_type) == "text/occi":
             #reformat the response to text/occi
             res.body = "OK"
-            res.headers = self.text_occi_f.format_to_text_x_occi_locations(var)
+            res.headers = self.text_occi_f.format_to_text_x_occi_locations(list(var))
 
         elif str(res.content_type) == "text/uri-list":
             #reformat the response to text/occi
@@ -146,5 +163,99 @@ class ResponseAdapter():
 
         return res
 
+    def convert_response_entity_count_content(self, count, res):
+
+        res.headers['X-PyOCNI-Count'] = str(count)
+
+        if str(res.content_type) == "application/occi+json":
+            res.body = json.dumps({"Count": count})
+
+        elif str(res.content_type) == "text/occi":
+            #reformat the response to text/occi
+            res.body = "OK"
+
+        else:
+            #reformat the response to text/plain (default OCCI response format)
+            res.content_type = "text/plain"
+            res.body = "Count: " + str(count)
+
+        return res
+
+    def stream_response_entity_multi_x_occi_location_content(self, var, res):
+        """
+        Set an iterator on the locations as the response body: the response is sent without Content-Length
+        (chunked) while the locations are read from the database
+        Args:
+            @param var: iterator on the locations
+            @param res: response
+        """
+        if str(res.content_type) == "application/occi+json":
+            res.app_iter = iter_json_x_locations(var)
 
+        elif str(res.content_type) == "text/uri-list":
+            res.app_iter = self.text_uri_f.iter_uri_locations(var)
+
+        else:
+            #reformat the response to text/plain (default OCCI response format)
+            res.content_type = "text/plain"
+            res.app_iter = self.text_plain_f.iter_text_plain_x_locations(var)
 
+        res.content_length = None
+        return res
+
+    def convert_response_action_results(self, var, res):
+        """
+        Args:
+            @param var: result of an action triggered on a kind or mixin ({"action", "succeeded", "failed", "entities"})
+            @param res: response
+        """
+        if str(res.content_type) == "application/occi+json":
+            res.body = json.dumps(var)
+
+        elif str(res.content_type) == "text/occi":
+            #reformat the response to text/occi
+            res.body = "OK"
+
+        else:
+            #reformat the response to text/plain (default OCCI response format)
+            res.content_type = "text/plain"
+            lines = ["Succeeded: " + str(var['succeeded']), "Failed: " + str(var['failed'])]
+            for entity in var['entities']:
+                if entity['status'] != "succeeded":
+                    lines.append("X-OCCI-Location: " + entity['location'] + " " + entity['status'] + " (" +
+                                 str(entity['error']) + ")")
+            res.body = "\n".join(lines)
+
+        if var['failed'] > 0:
+            res.headers['X-PyOCNI-Failed'] = str(var['failed'])
+
+        return res
+
+    def convert_response_job(self, report, res):
+        """
+        A request whose backend calls were queued as a job (OCNI_BACKEND_JOBS = 1) is answered 202 Accepted, the
+        location of the job in the Location and X-PyOCNI-Job headers
+        Args:
+            @param report: report filled by the jungler
+            @param res: response
+        """
+        job = report.get('job')
+        if job and res.status_int in (return_code['OK'], return_code['OK, and location returned'],
+                                      return_code['Accepted']):
+            res.status_int = return_code['Accepted']
+            res.headers['Location'] = job
+            res.headers['X-PyOCNI-Job'] = job
+        return res
+
+
+def iter_json_x_locations(var):
+    """
+    Writes {"X-OCCI-Location": [...]} a batch of locations at a time, the same text as json.dumps would produce.
+    The list is closed once every location was read: an error while reading aborts the response.
+    """
+    yield '{"X-OCCI-Location": ['
+    separator = ''
+    for batch in iter_batches(var):
+        yield separator + ', '.join([json.dumps(item) for item in batch])
+        separator = ', '
+    yield ']}'
@@ -47,6 +47,15 @@ class backend_interface(object):
         '''
         logger.debug('The create operation is not implemented yet')
 
+    def create_entities(self, entities):
+        '''
+
+        Create several entities of this backend at once (one create per entity unless overridden)
+
+        '''
+        for entity in entities:
+            self.create(entity)
+
     def read(self, entity):
         '''
 
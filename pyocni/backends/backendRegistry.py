@@ -0,0 +1,178 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import os
+import imp
+import threading
+import pyocni.pyocni_tools.config as config
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.pyocni_tools.service_Container import get_service
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+# getting the Logger
+logger = config.logger
+
+
+class BackendRegistry(object):
+    """
+    Process-local cache of the backends: the backends file is read again only when its modification time changes,
+    each backend module is loaded once and its instance shared by all the requests. The provider of each kind is
+    memoized and forgotten when the category registry reports a change of the kind.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.backends_file = None
+        self.backends_stamp = None
+        self.paths = dict()
+        self.instances = dict()
+        self.providers = dict()
+        self.hits = 0
+        self.loads = 0
+        self.reloads = 0
+        self.categories = get_service(CategoryRegistry)
+        self.categories.add_listener(self.on_categories_changed)
+
+    # ==================================================================================================================
+    #                                                     Backends
+    # ==================================================================================================================
+
+    def refresh(self):
+        """
+        Read the backends file again if it was modified (or if another file is configured) since it was last read
+        """
+        try:
+            stat = os.stat(config.BACKENDS_FILE)
+        except OSError as e:
+            logger.error("===== Backend_registry refresh : " + str(e) + " =====")
+            return False
+
+        #Note: The size tells apart two writes made within the resolution of the modification time
+        stamp = (stat.st_mtime, stat.st_size)
+        if config.BACKENDS_FILE == self.backends_file and stamp == self.backends_stamp:
+            return True
+
+        try:
+            backends_json_data = open(config.BACKENDS_FILE)
+            try:
+                backends_list = json.load(backends_json_data)
+            finally:
+                backends_json_data.close()
+        except Exception as e:
+            logger.error("===== Backend_registry refresh : " + str(e) + " =====")
+            return False
+
+        with self._lock:
+            self.paths = dict((item["name"], item["path"]) for item in backends_list["backends"])
+            #Note: The backend modules are loaded again on their next use
+            self.instances = dict()
+            self.backends_file = config.BACKENDS_FILE
+            self.backends_stamp = stamp
+            self.reloads += 1
+
+        logger.debug("===== Backend_registry : " + str(len(self.paths)) + " backends declared =====")
+        return True
+
+    def get_backend(self, provider):
+        """
+        Returns the backend instance of a provider (None if the provider is not in the backends file)
+        Args:
+            @param provider: provider name
+        """
+        self.refresh()
+
+        backend = self.instances.get(provider)
+        if backend is not None:
+            self.hits += 1
+            return backend
+
+        with self._lock:
+            if self.instances.has_key(provider) is False:
+                path = self.paths.get(provider)
+                if path is None:
+                    return None
+                self.instances[provider] = load_backend(provider, path)
+                self.loads += 1
+            return self.instances[provider]
+
+    # ==================================================================================================================
+    #                                                     Providers
+    # ==================================================================================================================
+
+    def get_provider_of_a_kind(self, kind):
+        """
+        Returns the local provider name of a kind (None if the kind does not exist)
+        Args:
+            @param kind: OCCI_ID of the kind
+        """
+        provider = self.providers.get(kind)
+        if provider is not None:
+            return provider
+
+        if self.categories.ensure_loaded() is False:
+            logger.error("===== Get_provider_of_a_kind : Categories could not be loaded =====")
+            return None
+
+        provider = self.categories.get_provider(kind)
+        if provider is None:
+            logger.error("===== Get_provider_of_a_kind : No such kind =====")
+            return None
+
+        self.providers[kind] = provider['local'][0]
+        return self.providers[kind]
+
+    def on_categories_changed(self, changed):
+        """
+        Listener of the category registry: forget the providers of the changed kinds (all of them if None)
+        """
+        with self._lock:
+            if changed is None:
+                self.providers = dict()
+            else:
+                for occi_id in changed:
+                    self.providers.pop(occi_id, None)
+
+    def stats(self):
+        return {"backends": len(self.paths),
+                "loaded": len(self.instances),
+                "providers": len(self.providers),
+                "hits": self.hits,
+                "loads": self.loads,
+                "reloads": self.reloads}
+
+
+def load_backend(provider, path):
+    """
+    Load the module of a backend and make its instance
+    Args:
+        @param provider: provider name
+        @param path: path of the backend module
+    """
+    #Note: Each provider gets its own module name, the modules of the other providers stay loaded
+    module_name = "pyocni_backend_" + "".join([c if c.isalnum() else '_' for c in provider])
+    backend_module = imp.load_source(module_name, path)
+    return backend_module.backend()
@@ -30,7 +30,9 @@ try:
 except ImportError:
     import json
 from pyocni.suppliers.categorySupplier import CategorySupplier
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
 import pyocni.pyocni_tools.occi_Joker as joker
+from pyocni.pyocni_tools.service_Container import get_service
 
 # getting the Logger
 logger = config.logger
@@ -42,37 +44,18 @@ class CategoryDataBaker():
 
     def __init__(self):
 
-        self.category_sup = CategorySupplier()
+        self.category_sup = get_service(CategorySupplier)
+        self.registry = get_service(CategoryRegistry)
 
     def bake_to_get_all_categories(self):
         """
         Adapt categories to the get all categories method
         """
-        db_kinds = list()
-        db_mixins = list()
-        db_actions = list()
+        #Step[1]: Get all the categories from the registry (already in the required format)
 
-        #Step[1]: Get all the categories from the supplier
+        result = self.registry.get_all_categories()
 
-        query = self.category_sup.get_all_categories()
-        result = None
-        #Step[2]: Adapt categories to the required format
-
-        if query is None:
-            return None
-
-        else:
-            for q in query:
-                if q['key'] == "Kind":
-                    db_kinds.append(q['value'])
-                elif q['key'] == "Mixin":
-                    db_mixins.append(q['value'])
-                elif q['key'] == "Action":
-                    db_actions.append(q['value'])
-
-            result = {'kinds': db_kinds, 'mixins': db_mixins, 'actions': db_actions}
-
-        #Step[3]: Return the results to the calling jungler
+        #Step[2]: Return the results to the calling jungler
 
         return result
 
@@ -27,13 +27,17 @@ Created on Oct 03, 2012
 @license: LGPL - Lesser General Public License
 """
 
+import itertools
 import pyocni.pyocni_tools.config as config
 try:
     import simplejson as json
 except ImportError:
     import json
 
-from pyocni.suppliers.resourceSupplier import ResourceSupplier
+from pyocni.suppliers.resourceSupplier import ResourceSupplier, path_range, category_range, PATH_RANGE_END
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.suppliers.kindIndexes import KindIndexes
+from pyocni.pyocni_tools.service_Container import get_service
 
 
 # getting the Logger
@@ -46,7 +50,9 @@ class ResourceDataBaker():
 
     def __init__(self):
 
-        self.resource_sup = ResourceSupplier()
+        self.resource_sup = get_service(ResourceSupplier)
+        self.registry = get_service(CategoryRegistry)
+        self.kind_indexes = get_service(KindIndexes)
 
     def bake_to_put_single(self,path_url):
         """
@@ -54,17 +60,13 @@ class ResourceDataBaker():
         @param: path_url: Path of resource
         """
 
-        #Step[1]: get the data from the supplier
-        query1 = self.resource_sup.get_for_register_entities()
-        if query1 is None:
+        #Step[1]: get the registered kinds from the registry
+        if self.registry.ensure_loaded() is False:
             return None,None
         else:
 
-            db_occi_ids_locs = list()
-            #Step[2]: prepare data
-            for q in query1:
-                db_occi_ids_locs.append({"OCCI_ID" : q['key'],"OCCI_Location":q['value']})
-            #Step[3]: get more data
+            db_kind_ids = self.registry.get_kind_ids()
+            #Step[2]: get more data
             query2 = self.resource_sup.get_my_resources(path_url)
 
             if query2 is None:
@@ -72,28 +74,8 @@ class ResourceDataBaker():
             else:
 
                 db_nb_resources = query2.count()
-            #Step[4]: return all data
-            return db_occi_ids_locs,db_nb_resources
-
-    def bake_to_put_single_updateCase(self,path_url):
-
-        """
-        Prepare data for update single resource method
-        @param path_url: URL of the resource
-        """
-
-        #Step[1]: Get data from suppliers
-        query = self.resource_sup.get_for_update_entities(path_url)
-
-        if query is None:
-
-            return None
-        else:
-            #Step[2]: prepare data
-            to_update = query.first()['value']
-
-        #Step[3]: return Data
-        return to_update
+            #Step[3]: return all data
+            return db_kind_ids,db_nb_resources
 
     def bake_to_get_single_res(self, path_url):
 
@@ -108,17 +90,19 @@ class ResourceDataBaker():
         if query is None:
             return None,None
         else:
-            if query.count() is 0:
+            row = query.first()
+            if row is None:
                 return 0,0
             else:
                 #Step[2]: prepare data
-                if query.first()['value'][0] == "Resource":
-                    res = { "resources": [query.first()['value'][1]]}
+                entity_type, description = row['value']
+                if entity_type == "Resource":
+                    res = { "resources": [description]}
                 else:
-                    res = { "links": [query.first()['value'][1]]}
+                    res = { "links": [description]}
 
                 #Step[3]: return data
-                return res,query.first()['value'][1]
+                return res,description
 
     def bake_to_post_single(self, path_url):
 
@@ -128,28 +112,17 @@ class ResourceDataBaker():
         """
 
         #Step[1]: get the data
-        query = self.resource_sup.get_for_register_entities()
-
+        query = self.resource_sup.get_for_update_entities(path_url)
         if query is None:
-            return None,None
-
-        else:
-            db_occi_ids_locs = list()
-            #Step[2]: prepare data
-            for q in query:
-                db_occi_ids_locs.append({"OCCI_ID" : q['key'],"OCCI_Location":q['value']})
-
-            #Step[3]: Get more data
-            query2 = self.resource_sup.get_for_update_entities(path_url)
-            if query2 is None:
-                return None,None
+            return None
 
-            #Step[4]: return data
-            elif query2.count() is 0:
-                return db_occi_ids_locs,0
+        #Step[2]: return data
+        row = query.first()
+        if row is None:
+            return 0
 
-            else:
-                return db_occi_ids_locs,query2.first()['value']
+        else:
+            return row['value']
 
     def bake_to_delete_single_resource(self, path_url):
         """
@@ -162,12 +135,13 @@ class ResourceDataBaker():
         if query is None:
             return None,None
 
-        elif query.count() is 0:
+        row = query.first()
+        if row is None:
             return 0,None
 
         else:
             #Step[2]: prepare data, then return it
-            return query.count(),query.first()['value']
+            return query.count(),row['value']
 
     def bake_to_trigger_action_on_single_resource(self, path_url):
         """
@@ -180,62 +154,75 @@ class ResourceDataBaker():
         if query is None:
             return None,None
 
-        elif query.count() is 0:
+        row = query.first()
+        if row is None:
             return 0,None
 
         else:
             #Step[2]: prepare and then return the data
-            return query.count(), query.first()['value']
+            return query.count(), row['value']
 
     def bake_to_get_provider(self,kind_id):
         """
         Prepare data for get provider method
         @param kind_id: kind OCCI ID
         """
-        #Step[1]: Get the data
-        query = self.resource_sup.get_providers(kind_id)
-
-        if query is None:
+        #Step[1]: Get the data from the registry
+        if self.registry.ensure_loaded() is False:
             return None
         else:
             #Step[2]: return data
-            return query.first()['value']
+            return self.registry.get_provider(kind_id)
 
-    def bake_to_post_multi_resources_2a(self):
+    def bake_to_post_multi_resources_2a(self, req_path, new_locations):
         """
         Prepare for post multi resources method (scenario 2a)
+        @param req_path: kind location to which the request was sent
+        @param new_locations: locations that the new entities would take
         """
-        #Step[1]: get data
-        query = self.resource_sup.get_for_register_entities()
+        #Step[1]: get the kind from the registry
+        if self.registry.ensure_loaded() is False:
+            return None,None
+
+        kind = self.registry.get_by_location(req_path)
+        if kind is None or kind['Type'] != "Kind":
+            kind_occi_id = None
+        else:
+            kind_occi_id = kind['OCCI_ID']
+
+        #Step[2]: get only the new locations that are already taken
+        if len(new_locations) is 0:
+            return kind_occi_id, set()
+
+        query = self.resource_sup.get_existing_locations(new_locations)
 
         if query is None:
-            return None
+            return None,None
         else:
-            #Step[2]: prepare data
-            db_occi_ids_locs = list()
+            db_locations = set()
             for q in query:
-                db_occi_ids_locs.append({"OCCI_ID" : q['key'],"OCCI_Location":q['value']})
+                db_locations.add(q['key'])
             #Step[3]: return data
-            return  db_occi_ids_locs
+            return kind_occi_id, db_locations
 
     def bake_to_post_multi_resources_2b(self,url_path):
         """
         Prepare data for post on multi resources 2b scenario
         @param url_path: resource URL
         """
-        #Step[1]: get data
-
-        query = self.resource_sup.get_my_mixins(url_path)
+        #Step[1]: get data from the registry
 
-        if query is None:
+        if self.registry.ensure_loaded() is False:
             return None,None
 
-        elif query.count() is 0:
+        mixin = self.registry.get_by_location(url_path)
+
+        if mixin is None or mixin['Type'] != "Mixin":
             return 0,None
 
         else:
             #Step[2]: return data
-            return query.count(), query.first()['value']
+            return 1, mixin['OCCI_ID']
 
 
     def bake_to_post_multi_resources_2b2(self,OCCI_locations):
@@ -247,61 +234,129 @@ class ResourceDataBaker():
 
         db_docs = list()
 
-        for item in OCCI_locations:
-           #Step[1]: get data
-           query = self.resource_sup.get_for_associate_mixin(item)
+        #Step[1]: get data of all the locations at once
+        rows = self.resource_sup.get_for_associate_mixin_by_keys(OCCI_locations)
 
-           if query is None:
-               return None
+        if rows is None:
+            return None
 
-           elif query.count() is 0:
+        found = dict()
+        for row in rows:
+            found[row['key'][0]] = row['value']
 
-               logger.error("===== bake_to_post_multi_resources_2b2  : " + item + "was not found =====")
-               return None
+        for item in OCCI_locations:
+            if not found.has_key(item):
+                logger.error("===== bake_to_post_multi_resources_2b2  : " + item + "was not found =====")
+                return None
 
-           else:
+            else:
                 #Step[2]: prepare data
-                q = query.first()
-                db_docs.append(q['value'])
+                db_docs.append(found[item])
         #Step[3]: return data
         return db_docs
 
-    def bake_to_get_all_entities(self, cat_type,cat_id):
+    def bake_to_get_all_entities(self, cat_type,cat_id, page=None):
 
         """
         Prepare data for get all entities method
         @param cat_type: Category type (kind/mixin)
         @param cat_id: OCCI category ID
+        @param page: paging parameters of the request (see bake_to_iter_ranges)
+        Returns an iterator on the locations, resources first then links (None if an error has occurred, 0 if the
+        cursor does not belong to this collection)
         """
 
-        #Step[1]: get data
+        #Step[1]: get data, the rows are read a page at a time
 
         if cat_type == "Kind":
 
-            query = self.resource_sup.get_entities_of_kind(cat_id)
+            view_name = 'entities_of_kind_paged'
 
         elif cat_type == "Mixin":
 
-            query = self.resource_sup.get_entities_of_mixin(cat_id)
+            view_name = 'entities_of_mixin_paged'
 
         else:
 
             return None
 
-        to_return_res = list()
-        to_return_link = list()
-        #Step[2]: prepare data
-
-        for entity in query:
-
-            if entity['value'][1] == "Resource":
-                to_return_res.append(entity['value'][0])
+        rows = self.bake_to_iter_ranges([(view_name, category_range(cat_id, "Resource")),
+                                         (view_name, category_range(cat_id, "Link"))], page)
+
+        if rows is None or rows is 0:
+            return rows
+
+        #Step[2]: return data, the location is the last item of the key [cat_id, Type, OCCI_Location]
+        return (entity['key'][2] for entity in rows)
+
+    def bake_to_iter_ranges(self, ranges, page=None, include_docs=False):
+
+        """
+        Read key ranges of views one after the other
+        @param ranges: list of (view name, {'startkey': ..., 'endkey': ...})
+        @param page: paging parameters of the request, a dictionary with:
+            - count_only: only count the rows, the number is set in page['count']
+            - cursor: key of the last row already sent, the rows are read from the next one
+            - limit: maximum number of rows, page['next_cursor'] is set to the key of the last one if there are more
+        @param include_docs: read the documents with the rows
+        Returns an iterator on the rows (None if an error has occurred, 0 if the cursor is not in the ranges).
+        Without a limit the rows are read while they are iterated over: the iterator raises the error of a later page.
+        """
+        if page is None:
+            page = dict()
+
+        #Step[1]: Count the rows, the views reduce them with _count
+        if page.get('count_only') is True:
+            count = 0
+            for view_name, key_range in ranges:
+                nb = self.resource_sup.count_rows_in_range(view_name, key_range['startkey'], key_range['endkey'])
+                if nb is None:
+                    return None
+                count += nb
+            page['count'] = count
+            return list()
+
+        #Step[2]: Skip the ranges before the cursor, the range of the cursor is read from the next key
+        cursor = page.get('cursor')
+        if cursor is not None:
+            for i in range(len(ranges)):
+                view_name, key_range = ranges[i]
+                if key_range['startkey'] <= cursor <= key_range['endkey']:
+                    ranges = [(view_name, {'startkey': cursor, 'endkey': key_range['endkey']})] + ranges[i + 1:]
+                    break
             else:
-                to_return_link.append((entity['value'][0]))
+                logger.error("===== Bake_to_iter_ranges : cursor " + str(cursor) + " is out of the ranges =====")
+                return 0
+
+        #Step[3]: Read one row more than the limit to know if there is a next page
+        limit = page.get('limit')
+        page_size = None
+        if limit is not None:
+            page_size = limit + 1
+
+        queries = list()
+        after = cursor
+        for view_name, key_range in ranges:
+            query = self.resource_sup.iter_rows_in_range(view_name, key_range['startkey'], key_range['endkey'],
+                after=after, page_size=page_size, include_docs=include_docs)
+            if query is None:
+                return None
+            queries.append(query)
+            after = None
 
-        result = to_return_res + to_return_link
-        #Step[3]: return data
-        return result
+        rows = itertools.chain(*queries)
+        if limit is None:
+            return rows
+
+        try:
+            rows = list(itertools.islice(rows, limit + 1))
+        except Exception as e:
+            logger.error("===== Bake_to_iter_ranges : " + str(e) + " =====")
+            return None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            page['next_cursor'] = rows[-1]['key']
+        return rows
 
     def bake_to_channel_get_all_entities(self, req_path):
 
@@ -309,114 +364,178 @@ class ResourceDataBaker():
         Prepare data for channel get all entities method
         @param req_path: path of the request
         """
-        #Step[1]: get data
-        query = self.resource_sup.get_for_get_entities(req_path)
-
-        if query is None:
+        #Step[1]: get the kind or mixin from the registry
+        if self.registry.ensure_loaded() is False:
             return None
-        elif query.count() is 0:
+
+        category = self.registry.get_by_location(req_path)
+
+        if category is None:
             return 0
         else:
             #Step[2]: return data
-            return query
+            return category
 
-    def bake_to_get_on_path(self):
+    def bake_to_get_on_path(self, req_path, entities_only=False, page=None):
 
         """
-        Prepare data for get on path method
+        Prepare data for get on path method, returns an iterator on the locations
+        @param req_path: path of the request
+        @param entities_only: leave out the locations of kinds and mixins
+        @param page: paging parameters of the request (see bake_to_iter_ranges)
         """
-        query = self.resource_sup.get_my_occi_locations()
-        if query is None:
-            return None
+        query = self.bake_to_iter_ranges([('for_check_locations', path_range(req_path))], page)
+        if query is None or query is 0:
+            return query
         else:
-            occi_location = list()
+            #Note: The locations are read a page at a time while they are iterated over
+            return (q['key'] for q in query
+                    if entities_only is False or q['value'] == "Resource" or q['value'] == "Link")
 
-            for q in query:
-                occi_location.append(q['value'])
-
-            return occi_location
-
-    def bake_to_get_on_path_filtered(self,locations):
+    def bake_to_get_on_path_filtered(self, req_path, filters):
 
         """
-        Prepare data for get on path filtered method
-        @param locations: location to look for
-        """
-
-        descriptions = list()
-        #Step[1]: get data
-
-        for loc in locations:
-            query = self.resource_sup.get_my_resources(loc)
-            if query is None:
-                return None
-            else:
-                descriptions.append({'OCCI_Description' : query.first()['value'][1],'OCCI_ID':loc})
-        #Step[2]: return data
-        return descriptions
+        Prepare data for get on path filtered method. When every filter names a kind and one of its indexed
+        attributes, only the index entries below the path are read.
+        @param req_path: path of the request
+        @param filters: compiled filters (OCCIFilterSet) by entity Type
+        Returns (iterator on the entities below the path: {'OCCI_ID', 'OCCI_Description', 'Type'}, views read)
+        ((None, None) if an error has occurred)
+        """
+        #Step[1]: choose the key ranges to read
+        key_range = path_range(req_path)
+        ranges = list()
+        for entity_type in filters.keys():
+            index_ranges = self.get_kind_index_ranges(filters[entity_type], entity_type, None, key_range['startkey'])
+            if index_ranges is None:
+                ranges = None
+                break
+            ranges.extend(index_ranges)
+
+        #Step[2]: get the documents with the rows, a page at a time
+        if ranges is not None and len(ranges) > 0:
+            rows = self.bake_to_iter_ranges(ranges, include_docs=True)
+            if rows is not None:
+                return iter_entity_descriptions(rows, True), get_views_read(ranges)
+            logger.warning("===== Bake_to_get_on_path_filtered : the kind indexes could not be read, "
+                           "the entities below the path are scanned =====")
+
+        ranges = [('for_check_locations', key_range)]
+        rows = self.bake_to_iter_ranges(ranges, include_docs=True)
+
+        if rows is None:
+            return None, None
+        #Step[3]: return data
+        return iter_entity_descriptions((row for row in rows if row['value'] == "Resource" or row['value'] == "Link"),
+            False), get_views_read(ranges)
 
-    def bake_to_get_filtered_entities(self, entities):
+    def bake_to_get_filtered_entities(self, cat_type, cat_id, entity_type, filters):
 
         """
-        Prepare data for get filtered entities
-        @param entities: OCCI ID of entities
+        Prepare data for get filtered entities: the entities of a kind or mixin are read with their documents in a
+        single range query. When every filter holds an indexed attribute, only the index entries of these
+        attribute values are read: the indexes declared by the kind first, then the CouchDB_INDEXED_ATTRIBUTES one.
+        @param cat_type: Category type (kind/mixin)
+        @param cat_id: OCCI category ID
+        @param entity_type: Resource or Link
+        @param filters: compiled filters (OCCIFilterSet)
+        Returns (iterator on {'OCCI_ID', 'OCCI_Description'}, views read) ((None, None) if an error has occurred)
         """
 
-        descriptions_res = list()
-        descriptions_link = list()
+        #Step[1]: choose the key ranges to read
 
-        #Step[1]: Get data
-        for entity in entities:
-            query = self.resource_sup.get_for_get_filtered(entity)
+        if cat_type == "Kind":
+            scan_ranges = [('entities_of_kind_paged', category_range(cat_id, entity_type))]
 
-            if query is None:
-                return None,None
-            else:
-                #Step[2]: prepare data
-                if query.first()['value'][1] == "Resource":
-                    descriptions_res.append({'OCCI_ID' : entity,'OCCI_Description' : query.first()['value'][0]})
-                else:
-                    descriptions_link.append({'OCCI_ID' : entity,'OCCI_Description' : query.first()['value'][0]})
-        #Step[3]: return data
-        return descriptions_res,descriptions_link
+        elif cat_type == "Mixin":
+            scan_ranges = [('entities_of_mixin_paged', category_range(cat_id, entity_type))]
 
-    def bake_to_get_filtered_entities_2(self, result):
+        else:
+            return None, None
 
-        """
-        Prepare data for get filtered entities method scenario 2
-        @param result: resource OCCI location
-        """
-        occi_descriptions = list()
-        #Step[1]: get data
-        for item in result:
+        ranges = None
+        if cat_type == "Kind":
+            ranges = self.get_kind_index_ranges(filters, entity_type, cat_id)
+
+        if ranges is None:
+            index_terms = filters.get_index_terms(config.DB_INDEXED_ATTRIBUTES)
+            if index_terms is not None:
+                ranges = list()
+                for name, value in index_terms:
+                    ranges.append(('entities_by_attribute', {'startkey': [cat_id, name, value, entity_type],
+                                                             'endkey': [cat_id, name, value, entity_type,
+                                                                        PATH_RANGE_END]}))
+
+        #Step[2]: get the documents with the rows, a page at a time
+        if ranges is not None:
+            rows = self.bake_to_iter_ranges(ranges, include_docs=True)
+            if rows is not None:
+                return iter_entity_descriptions(rows, len(ranges) > 1), get_views_read(ranges)
+            logger.warning("===== Bake_to_get_filtered_entities : the attribute index could not be read, "
+                           "the entities are scanned =====")
+
+        rows = self.bake_to_iter_ranges(scan_ranges, include_docs=True)
+
+        if rows is None:
+            return None, None
 
-            res = self.resource_sup.get_my_resources(item)
-            if res is None:
-                return None
-            else:
-                #Step[2]: prepare data
-                occi_descriptions.append(res['value'][1])
         #Step[3]: return data
-        return occi_descriptions
+        return iter_entity_descriptions(rows, False), get_views_read(scan_ranges)
+
+    def get_kind_index_ranges(self, filters, entity_type, kind_id=None, path=None):
+
+        """
+        Key ranges of the kind indexes holding all the entities that may match the filters
+        @param filters: compiled filters (OCCIFilterSet)
+        @param entity_type: Resource or Link
+        @param kind_id: OCCI ID of the kind of the entities (the kind of each filter if None)
+        @param path: only the entities below this path (ending with /)
+        Returns a list of (view, key range) (None if a filter has no indexed attribute of its kind)
+        """
+        if path is None:
+            path = ""
+        ranges = list()
+        for occi_filter in filters.filters:
+            kind = kind_id
+            if kind is None:
+                kind = occi_filter.get_term(('kind',))
+                if kind is None:
+                    return None
+
+            index_range = None
+            for name, value in occi_filter.get_attribute_terms():
+                view_name = self.kind_indexes.get_index_view(kind, name)
+                if view_name is not None:
+                    index_range = (view_name, {'startkey': [name, value, entity_type, path],
+                                               'endkey': [name, value, entity_type, path + PATH_RANGE_END]})
+                    break
+
+            if index_range is None:
+                return None
+            if index_range not in ranges:
+                ranges.append(index_range)
+        return ranges
 
     def bake_to_channel_trigger_actions(self, req_url):
         """
         Prepare data for channgel trigger actions method
         @param req_url: URL request
+        Returns the kind of each entity of the kind/mixin and the entities ({OCCI_Location, OCCI_Description}), the
+        kind and description are None for an entity deleted meanwhile
         """
-        #Step[1]: get data
-        query = self.resource_sup.get_for_get_entities(req_url)
-
-        if query is None:
+        #Step[1]: get the kind or mixin from the registry
+        if self.registry.ensure_loaded() is False:
             return None,None
 
-        elif query.count() is 0:
+        category = self.registry.get_by_location(req_url)
+
+        if category is None:
             return 0,0
 
         else:
             #Step[2]: prepare data
-            occi_id = query.first()['value'][0]
-            occi_type = query.first()['value'][1]
+            occi_id = category['OCCI_ID']
+            occi_type = category['Type']
 
             #Get resources that has this mixin or kind
             if occi_type == "Kind":
@@ -430,12 +549,21 @@ class ResourceDataBaker():
 
             else:
                 entity_kind_ids = list()
-                for q in query2:
-                    entity = q['value'][0]
-                    query3 = self.resource_sup.get_for_trigger_action(entity)
-                    entity_kind_ids.append(query3.first()['value'][0])
+                entities = list()
+                locations = [q['value'][0] for q in query2]
+                #Note: The kinds and descriptions of all the entities are fetched at once
+                rows = self.resource_sup.get_for_trigger_action_by_keys(locations)
+                if rows is None:
+                    return None,None
+                values = dict()
+                for row in rows:
+                    values[row['key']] = row['value']
+                for location in locations:
+                    value = values.get(location, [None, None])
+                    entity_kind_ids.append(value[0])
+                    entities.append({'OCCI_Location': location, 'OCCI_Description': value[1]})
                 #Step[3]: return data
-                return entity_kind_ids,query2
+                return entity_kind_ids,entities
 
     def bake_to_get_default_attributes(self, req_path):
         """
@@ -443,14 +571,17 @@ class ResourceDataBaker():
         @param req_path: URL of the request
         """
 
-        #Step[1]: get data
-        query = self.resource_sup.get_default_attributes_from_kind(req_path)
+        #Step[1]: get the kind from the registry
+        if self.registry.ensure_loaded() is False:
+            return None
 
-        if query is None:
+        kind = self.registry.get_by_location(req_path)
+
+        if kind is None or kind['Type'] != "Kind":
             return None
         else:
             #Step[2]: prepare data
-            res = recursive_for_default_attributes(query.first()['value'])
+            res = recursive_for_default_attributes(kind['OCCI_Description']['attributes'])
 
             default = {}
             for item in res:
@@ -464,9 +595,12 @@ class ResourceDataBaker():
             if type(kind_attribute_description[key]) is dict:
                 self.recursive_get_attribute_names(kind_attribute_description)
 
-    def bake_to_delete_on_path(self):
-
-        query = self.resource_sup.get_delete_on_path()
+    def bake_to_delete_on_path(self, req_path):
+        """
+        Prepare data for delete on path method
+        @param req_path: path of the request
+        """
+        query = self.resource_sup.get_delete_on_path(req_path)
 
         if query is None:
             return None, None
@@ -482,6 +616,38 @@ class ResourceDataBaker():
 #=======================================================================================================================
 #                                                   Independant functions
 #=======================================================================================================================
+def iter_entity_descriptions(rows, several_ranges):
+    """
+    Gives the descriptions of the documents read with view rows
+    @param rows: rows having a doc
+    @param several_ranges: the rows come from several ranges of the index, an entity is given once
+    """
+    seen = set()
+    for row in rows:
+        #Note: A document deleted after the index was read comes without its doc
+        if row.get('doc') is None:
+            continue
+        location = row['doc']['OCCI_Location']
+        if several_ranges is True:
+            if location in seen:
+                continue
+            seen.add(location)
+        yield {'OCCI_ID': location, 'OCCI_Description': row['doc']['OCCI_Description'], 'Type': row['doc']['Type']}
+
+
+def get_views_read(ranges):
+    """
+    Names of the views read for a list of key ranges, reported to the client
+    """
+    views = list()
+    for view_name, key_range in ranges:
+        if view_name.find('/') is -1:
+            view_name = "db_views/" + view_name
+        if view_name not in views:
+            views.append(view_name)
+    return views
+
+
 def recursive_for_default_attributes(attributes):
     """
     Method to extract attributes from kind desctiption and complete the missing ones in the resource description
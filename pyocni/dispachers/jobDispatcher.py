@@ -0,0 +1,70 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+from webob import Response
+from pyocni.junglers.jobJungler import JobJungler
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+from pyocni.pyocni_tools.config import return_code
+from pyocni.pyocni_tools.service_Container import get_service
+
+class JobDispatcher(object):
+    """
+        Dispatches requests concerning the backend jobs.
+
+    """
+
+    def __init__(self, req, job_id):
+
+        self.req = req
+        self.job_id = job_id
+        self.res = Response()
+        self.res.content_type = str(req.accept)
+        self.res.server = 'ocni-server/1.1 (linux) OCNI/1.1'
+        self.jungler = get_service(JobJungler)
+
+    def get(self):
+        """
+        Retrieval of the status of a backend job
+
+        """
+
+        #Step[1]: Get the status of the job
+
+        var, self.res.status_int = self.jungler.channel_get_job(self.job_id)
+
+        #Step[2]: The status is sent as JSON whatever the accept-type
+
+        if self.res.status_int == return_code['OK']:
+            if str(self.res.content_type) != "application/occi+json":
+                self.res.content_type = "application/json"
+            self.res.body = json.dumps(var)
+
+        else:
+            self.res.content_type = "text/html"
+            self.res.body = str(var)
+
+        return self.res
@@ -29,6 +29,8 @@ from pyocni.adapters.i_RequestAdapter import RequestAdapter
 from pyocni.junglers.multi_entityJungler import MultiEntityJungler
 from pyocni.junglers.pathJungler import PathManager
 from pyocni.pyocni_tools.config import return_code
+import pyocni.pyocni_tools.occi_Joker as joker
+from pyocni.pyocni_tools.service_Container import get_service
 
 try:
     import simplejson as json
@@ -60,10 +62,10 @@ class MultiEntityDispatcher(object):
         self.res.content_type = str(req.accept)
         self.res.server = 'ocni-server/1.1 (linux) OCNI/1.1'
 
-        self.req_adapter = RequestAdapter()
-        self.res_adapter = ResponseAdapter()
-        self.jungler = MultiEntityJungler()
-        self.jungler_p = PathManager()
+        self.req_adapter = get_service(RequestAdapter)
+        self.res_adapter = get_service(ResponseAdapter)
+        self.jungler = get_service(MultiEntityJungler)
+        self.jungler_p = get_service(PathManager)
 
 
     def post(self):
@@ -92,12 +94,15 @@ class MultiEntityDispatcher(object):
 
             if self.triggered_action is None:
 
-                var, self.res.status_int = self.jungler.channel_post_multi_resources(jBody, self.path_url)
+                report = dict()
+                var, self.res.status_int = self.jungler.channel_post_multi_resources(jBody, self.path_url, report)
 
                 #Step[4a]: Adapt response to the required Accept-Type
 
                 if self.res.status_int == return_code['OK, and location returned']:
-                    self.res_adapter.convert_response_entity_multi_location_content(var, self.res)
+                    self.res_adapter.convert_response_entity_multi_location_content(var, self.res,
+                        report.get('failed'))
+                    self.res_adapter.convert_response_job(report, self.res)
 
                 else:
                     self.res.content_type = "text/html"
@@ -105,8 +110,16 @@ class MultiEntityDispatcher(object):
 
             #Step[3b]: Trigger an action on all resources belonging to a kind
             else:
-                self.res.body, self.res.status_int = self.jungler.channel_trigger_actions(jBody, self.path_url,
-                    self.triggered_action)
+                report = dict()
+                var, self.res.status_int = self.jungler.channel_trigger_actions(jBody, self.path_url,
+                    self.triggered_action, report)
+
+                #Step[4b]: Adapt the result of each action to the required Accept-Type
+                if type(var) is dict:
+                    self.res_adapter.convert_response_action_results(var, self.res)
+                else:
+                    self.res.body = var
+                self.res_adapter.convert_response_job(report, self.res)
 
             return self.res
 
@@ -116,7 +129,17 @@ class MultiEntityDispatcher(object):
 
         """
 
-        #Step[1]: Detect the body type (HTTP ,OCCI:JSON or OCCI+JSON)
+        #Step[1]: Read the paging parameters (limit, cursor and count-only)
+
+        page, error = self.get_page_params()
+
+        if error is not None:
+            self.res.status_int = return_code['Bad Request']
+            self.res.content_type = "text/html"
+            self.res.body = error
+            return self.res
+
+        #Step[2]: Detect the body type (HTTP ,OCCI:JSON or OCCI+JSON)
 
         if  self.req.content_type == 'text/occi' or (
         self.req.body != ""):
@@ -128,18 +151,31 @@ class MultiEntityDispatcher(object):
                 self.res.body = self.req.content_type + " is an unknown request content type"
 
             else:
-                #Step[2a]: Retrieve entities matching the filter provided
-                var, self.res.status_int = self.jungler.channel_get_filtered_entities(self.path_url, jBody)
+                #Step[3a]: Retrieve entities matching the filter provided
+                var, self.res.status_int = self.jungler.channel_get_filtered_entities(self.path_url, jBody, page)
+
+                #Note: limit and cursor are for gets without filtering, count-only counts the filtered entities
+                if self.res.status_int == return_code['OK'] and page.get('count_only') is True:
+                    page['count'] = len(var)
 
         else:
-            #Step[2b]: Retrieve all the entities
-            var, self.res.status_int = self.jungler.channel_get_all_entities(self.path_url, "")
+            #Step[3b]: Retrieve all the entities
+            var, self.res.status_int = self.jungler.channel_get_all_entities(self.path_url, "", page)
 
-        #Step[3]: Adapt the response to the format defined in the Accept-Type header
+        #Step[4]: Adapt the response to the format defined in the Accept-Type header
 
         if self.res.status_int == return_code['OK']:
 
-            self.res_adapter.convert_response_entity_multi_x_occi_location_content(var, self.res)
+            if page.has_key('count'):
+                self.res_adapter.convert_response_entity_count_content(page['count'], self.res)
+            else:
+                self.res_adapter.convert_response_entity_multi_x_occi_location_content(var, self.res)
+                if page.has_key('next_cursor'):
+                    self.res.headers['X-PyOCNI-Cursor'] = joker.encode_cursor(page['next_cursor'])
+
+            if page.has_key('index'):
+                #Note: Tells which views served a filtered get (kind_indexes/... when an attribute index was used)
+                self.res.headers['X-PyOCNI-Index'] = ", ".join(page['index'])
 
         else:
             self.res.content_type = "text/html"
@@ -147,6 +183,34 @@ class MultiEntityDispatcher(object):
 
         return self.res
 
+    def get_page_params(self):
+        """
+        Read the paging parameters of a get request:
+            - limit: maximum number of entities sent
+            - cursor: value of the X-PyOCNI-Cursor header of the previous page
+            - count-only: send only the number of entities
+        Returns (page parameters, None) or (None, error message)
+        """
+        page = dict()
+
+        if self.req.params.has_key('limit'):
+            try:
+                page['limit'] = int(self.req.params['limit'])
+            except ValueError:
+                page['limit'] = 0
+            if page['limit'] < 1:
+                return None, "limit must be a positive integer"
+
+        if self.req.params.has_key('cursor'):
+            page['cursor'] = joker.decode_cursor(self.req.params['cursor'])
+            if page['cursor'] is None:
+                return None, "cursor is not valid"
+
+        if self.req.params.has_key('count-only'):
+            page['count_only'] = self.req.params['count-only'].lower() not in ("0", "false", "no")
+
+        return page, None
+
     def put(self):
         """
         Fully update the mixin collection of entities
@@ -164,7 +228,9 @@ class MultiEntityDispatcher(object):
 
             #Step[2]: Fully update the mixin collection of entities
 
-            self.res.body, self.res.status_int = self.jungler.channel_put_multi(jBody, self.path_url)
+            report = dict()
+            self.res.body, self.res.status_int = self.jungler.channel_put_multi(jBody, self.path_url, report)
+            self.res_adapter.convert_response_job(report, self.res)
 
         return self.res
 
@@ -185,7 +251,9 @@ class MultiEntityDispatcher(object):
                 self.res.body = self.req.content_type + " is an unknown request content type"
 
                 #Step[2a]: This is a dissociate mixin request
-                self.res.body, self.res.status_int = self.jungler.channel_delete_multi(jBody, self.path_url)
+                report = dict()
+                self.res.body, self.res.status_int = self.jungler.channel_delete_multi(jBody, self.path_url, report)
+                self.res_adapter.convert_response_job(report, self.res)
         else:
                 #Step[2b]: This is a delete on path request:
                 self.jungler_p.channel_delete_on_path(self.path_url)
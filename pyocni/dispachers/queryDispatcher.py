@@ -33,6 +33,7 @@ except ImportError:
 from pyocni.pyocni_tools.config import return_code
 from pyocni.adapters.i_ResponseAdapter import ResponseAdapter
 from pyocni.adapters.i_RequestAdapter import RequestAdapter
+from pyocni.pyocni_tools.service_Container import get_service
 
 class QueryDispatcher(object):
     """
@@ -46,9 +47,9 @@ class QueryDispatcher(object):
         self.res = Response()
         self.res.content_type = str(req.accept)
         self.res.server = 'ocni-server/1.1 (linux) OCNI/1.1'
-        self.req_adapter = RequestAdapter()
-        self.res_adapter = ResponseAdapter()
-        self.jungler = CategoryJungler()
+        self.req_adapter = get_service(RequestAdapter)
+        self.res_adapter = get_service(ResponseAdapter)
+        self.jungler = get_service(CategoryJungler)
 
     def get(self):
         """
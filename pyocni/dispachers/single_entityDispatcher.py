@@ -28,6 +28,7 @@ from pyocni.adapters.i_ResponseAdapter import ResponseAdapter
 from pyocni.adapters.i_RequestAdapter import RequestAdapter
 from pyocni.junglers.single_entityJungler import SingleEntityJungler
 from pyocni.pyocni_tools.config import return_code
+from pyocni.pyocni_tools.service_Container import get_service
 
 try:
     import simplejson as json
@@ -59,9 +60,9 @@ class SingleEntityDispatcher(object):
         self.res.content_type = str(req.accept)
         self.res.server = 'ocni-server/1.1 (linux) OCNI/1.1'
 
-        self.req_adapter = RequestAdapter()
-        self.res_adapter = ResponseAdapter()
-        self.jungler = SingleEntityJungler()
+        self.req_adapter = get_service(RequestAdapter)
+        self.res_adapter = get_service(ResponseAdapter)
+        self.jungler = get_service(SingleEntityJungler)
 
 
     def put(self):
@@ -79,12 +80,14 @@ class SingleEntityDispatcher(object):
 
         else:
             #Step[2]: create the resource with custom URL
-            var, self.res.status_int = self.jungler.channel_put_single_resource(jBody, self.path_url)
+            report = dict()
+            var, self.res.status_int = self.jungler.channel_put_single_resource(jBody, self.path_url, report)
 
             #Step[3]: Adapt the response to the required accept-type
 
             if self.res.status_int == return_code['OK, and location returned']:
                 self.res = self.res_adapter.convert_response_entity_location_content(var, self.res)
+                self.res = self.res_adapter.convert_response_job(report, self.res)
             else:
                 self.res.content_type = "text/html"
                 self.res.body = var
@@ -138,9 +141,10 @@ class SingleEntityDispatcher(object):
         else:
             #Step[3a]: Partially update the resource if there was no action defined.
 
+            report = dict()
             if self.triggered_action is None:
 
-                var, self.res.status_int = self.jungler.channel_post_single_resource(jBody, self.path_url)
+                var, self.res.status_int = self.jungler.channel_post_single_resource(jBody, self.path_url, report)
 
                 if self.res.status_int == return_code['OK, and location returned']:
 
@@ -154,7 +158,9 @@ class SingleEntityDispatcher(object):
                 # Step[3b]: Trigger an action on a resource
 
                 self.res.body, self.res.status_int = self.jungler.channel_triggered_action_single(jBody, self.path_url,
-                    self.triggered_action)
+                    self.triggered_action, report)
+
+            self.res = self.res_adapter.convert_response_job(report, self.res)
 
         return self.res
 
@@ -167,7 +173,9 @@ class SingleEntityDispatcher(object):
 
         #Step[1]: Delete a single resource
 
-        self.res.body, self.res.status_int = self.jungler.channel_delete_single_resource(self.path_url)
+        report = dict()
+        self.res.body, self.res.status_int = self.jungler.channel_delete_single_resource(self.path_url, report)
+        self.res = self.res_adapter.convert_response_job(report, self.res)
 
         #Step[2]: return the response back to the caller
 
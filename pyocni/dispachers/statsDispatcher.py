@@ -0,0 +1,64 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+from webob import Response
+from pyocni.junglers.statsJungler import StatsJungler
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+from pyocni.pyocni_tools.service_Container import get_service
+
+class StatsDispatcher(object):
+    """
+        Dispatches requests concerning the counters of the server process.
+
+    """
+
+    def __init__(self, req):
+
+        self.req = req
+        self.res = Response()
+        self.res.content_type = str(req.accept)
+        self.res.server = 'ocni-server/1.1 (linux) OCNI/1.1'
+        self.jungler = get_service(StatsJungler)
+
+    def get(self):
+        """
+        Retrieval of the counters of the storage engine, the category registry, the updates, the jobs and the write
+        coalescer
+
+        """
+
+        #Step[1]: Get the counters
+
+        var, self.res.status_int = self.jungler.channel_get_stats()
+
+        #Step[2]: The counters are sent as JSON whatever the accept-type
+
+        if str(self.res.content_type) != "application/occi+json":
+            self.res.content_type = "application/json"
+        self.res.body = json.dumps(var)
+
+        return self.res
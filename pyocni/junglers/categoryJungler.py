@@ -36,6 +36,9 @@ from pyocni.junglers.managers.kindManager import KindManager
 from pyocni.junglers.managers.mixinManager import MixinManager
 from pyocni.dataBakers.category_dataBaker import CategoryDataBaker
 from postMan.the_post_man import PostMan
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.suppliers.kindIndexes import KindIndexes
+from pyocni.pyocni_tools.service_Container import get_service
 # getting the Logger
 logger = config.logger
 
@@ -48,11 +51,13 @@ class CategoryJungler:
 
     def __init__(self):
 
-        self.manager_k = KindManager()
-        self.manager_m = MixinManager()
-        self.manager_a = ActionManager()
-        self.d_baker = CategoryDataBaker()
-        self.PostMan = PostMan()
+        self.manager_k = get_service(KindManager)
+        self.manager_m = get_service(MixinManager)
+        self.manager_a = get_service(ActionManager)
+        self.d_baker = get_service(CategoryDataBaker)
+        self.PostMan = get_service(PostMan)
+        self.registry = get_service(CategoryRegistry)
+        self.kind_indexes = get_service(KindIndexes)
 
 
     def channel_register_categories(self, jreq):
@@ -109,6 +114,9 @@ class CategoryJungler:
 
                 #Step[3]: Save the new categories in the database using the PostMan
                 self.PostMan.save_registered_docs_in_db(categories)
+                #Note: The registry of this process must see its own writes before the next request
+                self.registry.catch_up()
+                self.kind_indexes.sync()
                 logger.debug("===== channel_register_categories ==== : Done with success")
                 return "", return_code['OK']
 
@@ -238,6 +246,9 @@ class CategoryJungler:
 
             #Step[3]: Ask to post man to delete the categories from DB
             self.PostMan.save_deleted_categories_in_db(categories, to_update)
+            #Note: The registry of this process must see its own writes before the next request
+            self.registry.catch_up()
+            self.kind_indexes.sync()
 
             logger.debug("===== channel_delete_categories ==== : Done with success")
 
@@ -309,6 +320,9 @@ class CategoryJungler:
             #Step[3]: Ask the post man to update the categories in DB
 
             self.PostMan.save_updated_docs_in_db(categories)
+            #Note: The registry of this process must see its own writes before the next request
+            self.registry.catch_up()
+            self.kind_indexes.sync()
             logger.debug("===== channel_update_categories ==== : Done with success")
 
             return "", return_code['OK']
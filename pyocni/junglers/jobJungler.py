@@ -0,0 +1,58 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import pyocni.pyocni_tools.config as config
+from pyocni.junglers.managers.jobManager import JobManager
+from pyocni.pyocni_tools.config import return_code
+from pyocni.pyocni_tools.service_Container import get_service
+
+# getting the Logger
+logger = config.logger
+
+class JobJungler(object):
+    """
+    Handles the requests on the backend jobs (/-/jobs/{job_id})
+    """
+
+    def __init__(self):
+
+        self.manager_j = get_service(JobManager)
+
+    def channel_get_job(self, job_id):
+        """
+        Channel get job request to the job manager
+        Args:
+            @param job_id: id of the job
+        """
+        #Step[1]: Get the status of the job
+
+        job = self.manager_j.get_job(job_id)
+
+        if job is None:
+            return "An error has occurred, please check log for more details", return_code['Internal Server Error']
+
+        elif job is 0:
+            return "No such job: " + job_id, return_code['Not Found']
+
+        logger.debug("===== Channel_get_job: Finished with success ===== ")
+        return job, return_code['OK']
@@ -28,73 +28,57 @@ try:
 except ImportError:
     import json
 
-import imp
+import Queue
+import threading
+import eventlet
+from eventlet import tpool
 
 import pyocni.pyocni_tools.config as config
-
-
-
-try:
-    import simplejson as json
-except ImportError:
-    import json
+import pyocni.pyocni_tools.green_IO as green_IO
+import pyocni.pyocni_tools.db_Calls as db_calls
+from pyocni.backends.backendRegistry import BackendRegistry
+import pyocni.junglers.managers.jobManager as job_manager
+from pyocni.junglers.managers.jobManager import JobManager, make_task, get_task_calls
+from pyocni.pyocni_tools.service_Container import get_service
 from pyocni.pyocni_tools.config import return_code
+
 # getting the Logger
 logger = config.logger
 
-try:
-    import simplejson as json
-except ImportError:
-    import json
 
+if int(config.OCNI_BACKEND_THREADS) > 0:
+    tpool.set_num_threads(int(config.OCNI_BACKEND_THREADS))
 
-def choose_appropriate_provider(provider):
 
+def call_backend(method, *args):
     """
-    Retrieves the provider of the resource to use its backend
-
-        @param provider: provider name
+    Calls a backend method. With OCNI_BACKEND_THREADS > 0 the call runs in a thread of the eventlet thread pool, so a
+    slow (blocking) provider does not stop the server from serving the other requests meanwhile. The threaded server
+    mode already runs each request in its own thread.
+        @param method: bound method of the backend instance
+        @param args: arguments of the method
     """
-    backend = None
-    backends_json_data = open(config.BACKENDS_FILE)
-    backends_list = json.load(backends_json_data)
-    backends_json_data.close()
+    if int(config.OCNI_BACKEND_THREADS) > 0 and str(config.OCNI_SERVER_MODE) != 'threaded':
+        return tpool.execute(db_calls.carry(method), *args)
+    return method(*args)
+
 
-    for i in backends_list["backends"]:
-        if i["name"] == provider:
+def choose_appropriate_provider(provider):
 
-            backend_instance = imp.load_source('', i["path"])
-            backend = backend_instance.backend()
+    """
+    Retrieves the provider of the resource to use its backend (loaded once, see BackendRegistry)
 
-    return backend
+        @param provider: provider name
+    """
+    return get_service(BackendRegistry).get_backend(provider)
 
 def get_provider_of_a_kind(kind):
 
     """
-    Get the provider name
+    Get the provider name (memoized until the kind changes, see BackendRegistry)
     @param kind: OCCI_ID of the kind
     """
-    database = config.prepare_PyOCNI_db()
-
-    provider = None
-
-    #Step[1]: Extract the kind description
-    try:
-        query = database.view('/db_views/my_providers', key=kind)
-
-    except Exception as e:
-        logger.error("===== Get_provider_of_a_kind : =====" + e.message)
-        return provider
-
-    if query.count() is 0:
-        logger.error("===== Get_provider_of_a_kind : No such kind =====")
-        return provider
-
-    #Step[2]: return the provider name
-    else:
-        provider = query.first()['value']
-
-    return provider['local'][0]
+    return get_service(BackendRegistry).get_provider_of_a_kind(kind)
 
 #======================================================================================================================
 #                                               Actions on single entities
@@ -109,10 +93,8 @@ def delete_entity(entity,kind):
 
     #Step[1]: retrieve the provider name
     provider = get_provider_of_a_kind(kind)
-    #Step[2]: Dynamically load the backend
-    backend = choose_appropriate_provider(provider)
-    #Step[3]: Perform the delete method
-    backend.delete(entity)
+    #Step[2]: Perform the delete method
+    return run_tasks([make_task(provider, "delete", [entity])])
 
 
 def create_entity(entity):
@@ -123,10 +105,8 @@ def create_entity(entity):
     #Step[1]: get the provider
     kind = entity['OCCI_Description']['kind']
     provider = get_provider_of_a_kind(kind)
-    #Step[2]: load the backend
-    backend = choose_appropriate_provider(provider)
-    #Step[3]: perform the create method
-    backend.create(entity['OCCI_Description'])
+    #Step[2]: perform the create method
+    return run_tasks([make_task(provider, "create", [entity['OCCI_Description']])])
 
 
 def update_entity(old_data, new_data):
@@ -138,10 +118,8 @@ def update_entity(old_data, new_data):
     #Step[1]: get the provider name
     kind = old_data['kind']
     provider = get_provider_of_a_kind(kind)
-    #Step[2]: load the backend
-    backend = choose_appropriate_provider(provider)
-    #Step[3]: perform the update method
-    backend.update(old_data,new_data)
+    #Step[2]: perform the update method
+    return run_tasks([make_task(provider, "update", [old_data, new_data])])
 
 
 def read_entity(entity,kind):
@@ -153,10 +131,8 @@ def read_entity(entity,kind):
 
     #Step[1]: get the provider name
     provider = get_provider_of_a_kind(kind)
-    #Step[2]: load the backend
-    backend = choose_appropriate_provider(provider)
-    #Step[3]: perform the read method
-    backend.read(entity)
+    #Step[2]: perform the read method
+    return run_tasks([make_task(provider, "read", [entity])])
 
 
 def trigger_action_on_a_resource(path_url, action, provider,attributes):
@@ -167,13 +143,14 @@ def trigger_action_on_a_resource(path_url, action, provider,attributes):
         @param action: Action description
         @param provider: Provider of the resource
         @param attributes: Attributes sent with the request
+    Returns the job location ("" when the action was run right away) and the response code
     """
     #Step[1]: Retrieve the appropriate provider backend
     backend = choose_appropriate_provider(provider)
     if backend is not None:
         #Step[2]: Call the action methods of the backend with the action name and attributes
-        backend.action(path_url,action,attributes)
-        return "", return_code['Accepted']
+        job = run_tasks([make_task(provider, "action", [path_url, action, attributes])])
+        return job or "", return_code['Accepted']
     else:
         logger.error("trigger action_on_resource : Unknown provider")
         return " An error has occurred, please check logs for more details", return_code['Not Found']
@@ -182,16 +159,28 @@ def trigger_action_on_a_resource(path_url, action, provider,attributes):
 #                                               Actions on multiple entities
 #======================================================================================================================
 
-#Note: This is basically a multiple "call on a single resource"
+#Note: This is basically a multiple "call on a single resource", made of the tasks of a single job
 
 def create_entities(entities):
     """
-    perform create entity method on a list of entities
+    perform create entity method on a list of entities, grouped by provider: each backend is loaded once and gets
+    all its entities in one create_entities call
     @param entities: list of entities
     """
-
-    for i in range(len(entities)):
-        create_entity(entities[i])
+    #Step[1]: group the entities by provider, looked up once per kind
+    providers = dict()
+    by_provider = dict()
+    for entity in entities:
+        kind = entity['OCCI_Description']['kind']
+        if providers.has_key(kind) is False:
+            providers[kind] = get_provider_of_a_kind(kind)
+        by_provider.setdefault(providers[kind], list()).append(entity['OCCI_Description'])
+
+    #Step[2]: perform the create method on all the entities of each provider
+    tasks = list()
+    for provider in by_provider.keys():
+        tasks.append(make_task(provider, "create_entities", [by_provider[provider]]))
+    return run_tasks(tasks)
 
 
 def update_entities(old_docs, new_docs):
@@ -200,9 +189,11 @@ def update_entities(old_docs, new_docs):
     @param old_docs: old entities OCCI description
     @param new_docs: new entities OCCI description
     """
-
+    tasks = list()
     for i in range(len(old_docs)):
-        update_entity(old_docs[i],new_docs[i])
+        provider = get_provider_of_a_kind(old_docs[i]['kind'])
+        tasks.append(make_task(provider, "update", [old_docs[i], new_docs[i]]))
+    return run_tasks(tasks)
 
 
 def read_entities(entities):
@@ -210,23 +201,151 @@ def read_entities(entities):
     perform read entity method on a list of entities
     @param entities: list of entities
     """
+    tasks = list()
     for i in range(len(entities)):
-        read_entity(entities[i],entities[i]['kind'])
+        provider = get_provider_of_a_kind(entities[i]['kind'])
+        tasks.append(make_task(provider, "read", [entities[i]]))
+    return run_tasks(tasks)
 
 
-def trigger_action_on_multi_resource(entities,providers, action,parameters):
+def trigger_action_on_multi_resource(entities, providers, action, parameters):
     """
-    Trigger the action on multiple resource
+    Trigger the action on multiple resource: the entities are grouped by provider, each backend is loaded once and at
+    most OCNI_ACTION_PARALLELISM action calls run at the same time (1 by default: the action methods of the backends
+    are not expected to be thread-safe)
     Args:
-        @param entities: entities on which the action will be triggered
-        @param providers: providers of the entities
+        @param entities: entities on which the action will be triggered ({OCCI_Location, OCCI_Description})
+        @param providers: provider name of each entity (None if it is unknown)
         @param action: action to be performed
         @param parameters: parameters belonging to the action
+    Returns the job location (None when the actions were run right away) and the result of each action, in the order
+    of the entities ({"location", "provider", "status", "error"}, None when the actions were queued)
     """
+    #Step[1]: group the entities by provider
+    by_provider = dict()
+    for i in range(len(entities)):
+        if providers[i] is not None:
+            by_provider.setdefault(providers[i], list()).append(i)
+
+    if job_manager.is_enabled():
+        tasks = list()
+        for provider in by_provider.keys():
+            for i in by_provider[provider]:
+                tasks.append(make_task(provider, "action", [entities[i]['OCCI_Description'], action, parameters]))
+        job = get_service(JobManager).submit(tasks) if len(tasks) > 0 else None
+        if job is not None:
+            return job, None
+        logger.warning("===== Trigger_action_on_multi_resource : the job could not be saved, the actions are run "
+                       "right away =====")
+
+    #Step[2]: make the calls of each provider, with the backend loaded once
+    results = list()
     for i in range(len(entities)):
-        trigger_action_on_a_resource(entities[i],action,providers[i]['local'][0],parameters)
+        results.append({"location": entities[i]['OCCI_Location'], "provider": providers[i], "status": "failed",
+                        "error": "Unknown provider"})
+
+    calls = list()
+    rows = list()
+    for provider in by_provider.keys():
+        backend = choose_appropriate_provider(provider)
+        if backend is None:
+            continue
+        for i in by_provider[provider]:
+            calls.append((backend.action, [entities[i]['OCCI_Description'], action, parameters]))
+            rows.append(i)
+
+    #Step[3]: run the calls and report the result of each entity
+    errors = fan_out(calls, int(config.OCNI_ACTION_PARALLELISM))
+    for k in range(len(rows)):
+        results[rows[k]]['status'] = "failed" if errors[k] is not None else "succeeded"
+        results[rows[k]]['error'] = errors[k]
+
+    return None, results
 
-    return "",return_code['OK']
+
+def fan_out(calls, parallelism):
+    """
+    Runs backend calls, at most parallelism of them at the same time (green threads running the calls in the eventlet
+    thread pool when the sockets are green-patched, threads otherwise)
+    Args:
+        @param calls: (backend method, arguments) to call
+        @param parallelism: number of calls run at the same time
+    Returns the error of each call (None if it succeeded)
+    """
+    errors = [None] * len(calls)
+
+    @db_calls.carry
+    def run(index):
+        method, args = calls[index]
+        try:
+            if green_IO.is_patched():
+                tpool.execute(db_calls.carry(method), *args)
+            else:
+                method(*args)
+        except Exception as e:
+            errors[index] = str(e) or e.__class__.__name__
+            logger.error("===== Fan_out : " + errors[index] + " =====")
+
+    parallelism = min(parallelism, len(calls))
+    if parallelism <= 1:
+        for index in range(len(calls)):
+            run(index)
+
+    elif green_IO.is_patched():
+        pool = eventlet.GreenPool(parallelism)
+        for index in range(len(calls)):
+            pool.spawn_n(run, index)
+        pool.waitall()
+
+    else:
+        indexes = Queue.Queue()
+        for index in range(len(calls)):
+            indexes.put(index)
+
+        def work():
+            while True:
+                try:
+                    index = indexes.get_nowait()
+                except Queue.Empty:
+                    return
+                run(index)
+
+        workers = [threading.Thread(target=work, name="ActionCall-" + str(i)) for i in range(parallelism)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+    return errors
+
+#======================================================================================================================
+#                                               Backend tasks
+#======================================================================================================================
+
+def run_tasks(tasks):
+    """
+    Runs the backend calls: queued as a job when OCNI_BACKEND_JOBS = 1, right away otherwise
+    @param tasks: backend calls (jobManager.make_task)
+    Returns the location of the job (None if the calls were run right away)
+    """
+    if len(tasks) == 0:
+        return None
+
+    if job_manager.is_enabled():
+        job = get_service(JobManager).submit(tasks)
+        if job is not None:
+            return job
+        logger.warning("===== Run_tasks : the job could not be saved, the backend calls are run right away =====")
+
+    registry = get_service(BackendRegistry)
+    for task in tasks:
+        calls = get_task_calls(registry, task)
+        if calls is None:
+            logger.error("===== Run_tasks : Unknown provider " + str(task['Provider']) + " =====")
+            continue
+        for method, args in calls:
+            call_backend(method, *args)
+    return None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,438 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import os
+import time
+import Queue
+import errno
+import socket
+import threading
+import eventlet
+from eventlet import tpool
+from eventlet import queue as green_queue
+from eventlet import semaphore as green_semaphore
+from couchdbkit import ResourceConflict
+import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.green_IO as green_IO
+import pyocni.pyocni_tools.uuid_Generator as uuid_Generator
+from pyocni.backends.backendRegistry import BackendRegistry
+from pyocni.suppliers.resourceSupplier import ResourceSupplier
+from pyocni.junglers.postMan.the_post_man import PostMan
+from pyocni.pyocni_tools.service_Container import get_service
+
+# getting the Logger
+logger = config.logger
+
+#Note: Path of the job documents in the OCCI API, followed by the job id
+JOBS_PATH = "/-/jobs/"
+
+#Note: Backend methods a task can call (backend_interface)
+OPERATIONS = ("create", "create_entities", "read", "update", "delete", "action")
+
+#Note: Time (s) to wait before trying a failed backend call again, multiplied by the number of attempts
+RETRY_DELAY = 1
+
+
+class JobTimeout(Exception):
+    """
+    A backend call lasted more than OCNI_JOB_TIMEOUT seconds
+    """
+    pass
+
+
+class JobManager(object):
+    """
+    Backend job queue (OCNI_BACKEND_JOBS = 1): the backend calls of a request are saved as the tasks of a job
+    document, the request is answered at once and a pool of OCNI_JOB_WORKERS workers drives the calls, each one
+    tried again up to OCNI_JOB_RETRIES times, at most OCNI_JOB_TIMEOUT seconds per attempt and at most
+    OCNI_JOB_PROVIDER_LIMIT calls at the same time on a provider. The job document is saved at each step so that
+    its status can be read through GET /-/jobs/{job_id}.
+
+    A job is driven by the process named in its Owner field. The unfinished jobs of a process that has exited are
+    claimed by another one: the Owner is changed and the document saved with the revision read, only one claim of a
+    job succeeds.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.queue = make_queue()
+        self.jobs = dict()
+        self.job_locks = dict()
+        self.limits = dict()
+        self.started = False
+        self.PostMan = get_service(PostMan)
+        self.resource_sup = get_service(ResourceSupplier)
+        self.backends = get_service(BackendRegistry)
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+
+    # ==================================================================================================================
+    #                                                     Jobs
+    # ==================================================================================================================
+
+    def submit(self, tasks):
+        """
+        Save a job made of the tasks and queue them
+        Args:
+            @param tasks: backend calls (see make_task)
+        @return : the location of the job (None if it could not be saved, the tasks are then left to the caller)
+        """
+        now = make_timestamp()
+        job = {'_id': uuid_Generator.get_UUID(), 'Type': "Job", 'Status': "pending", 'Created': now, 'Updated': now,
+               'Owner': make_owner(), 'Tasks': list()}
+        for task in tasks:
+            task = dict(task)
+            task.update({'Status': "pending", 'Attempts': 0, 'Error': None})
+            job['Tasks'].append(task)
+
+        try:
+            self.PostMan.save_job_in_db(job)
+        except Exception as e:
+            logger.error("===== Submit_job : " + str(e) + " =====")
+            return None
+
+        self.start()
+        self.queue_job(job)
+        self.submitted += 1
+        return make_job_location(job['_id'])
+
+    def queue_job(self, job):
+        with self._lock:
+            self.jobs[job['_id']] = job
+            self.job_locks[job['_id']] = make_lock()
+        for index in range(len(job['Tasks'])):
+            if job['Tasks'][index]['Status'] in ("pending", "running"):
+                self.queue.put((job['_id'], index))
+
+    def resume(self):
+        """
+        Claim and queue again the unfinished jobs whose owner has exited (a previous run of the server or a pre-fork
+        worker that was replaced)
+        """
+        claimed = list()
+        for status in ("pending", "running"):
+            jobs = self.resource_sup.get_jobs_of_status(status)
+            if jobs is None:
+                return False
+            for job in jobs:
+                if self.is_orphaned(job) is True and self.claim(job) is True:
+                    claimed.append(job)
+
+        if len(claimed) > 0:
+            self.start()
+        for job in claimed:
+            logger.debug("===== Resume_job : " + job['_id'] + " =====")
+            self.queue_job(job)
+        return True
+
+    def is_orphaned(self, job):
+        """
+        A job is orphaned if its owner is a process of this host that has exited (the jobs owned by another host
+        are left to it)
+        """
+        owner = job.get('Owner')
+        if owner is None:
+            return True
+        host, pid = owner.rsplit(":", 1)
+        if host != socket.gethostname():
+            return False
+        if int(pid) == os.getpid():
+            return self.jobs.has_key(job['_id']) is False
+        return is_process_alive(int(pid)) is False
+
+    def claim(self, job):
+        """
+        Make this process the owner of a job, False if another process has claimed it (or changed it) first
+        """
+        job['Owner'] = make_owner()
+        try:
+            self.PostMan.save_job_in_db(job)
+        except ResourceConflict:
+            return False
+        except Exception as e:
+            logger.error("===== Claim_job : " + job['_id'] + " " + str(e) + " =====")
+            return False
+        return True
+
+    def follow_orphans(self):
+        """
+        Claim the orphaned jobs now and every OCNI_JOB_RESUME_INTERVAL seconds (pre-fork workers, once per process)
+        """
+
+        def follow():
+            while True:
+                try:
+                    self.resume()
+                except Exception as e:
+                    logger.error("===== Follow_orphans : " + str(e) + " =====")
+                time.sleep(int(config.OCNI_JOB_RESUME_INTERVAL))
+
+        if green_IO.is_patched():
+            eventlet.spawn_n(follow)
+        else:
+            follower = threading.Thread(target=follow, name="JobFollower")
+            follower.daemon = True
+            follower.start()
+
+    def get_job(self, job_id):
+        """
+        Returns the status of a job (0 if there is no such job, None if an error has occurred)
+        Args:
+            @param job_id: id of the job document
+        """
+        #Note: A job in progress in this process is more recent in memory
+        job = self.jobs.get(job_id)
+        if job is None:
+            job = self.resource_sup.get_job(job_id)
+            if job is None or job is 0:
+                return job
+        return describe_job(job)
+
+    # ==================================================================================================================
+    #                                                     Workers
+    # ==================================================================================================================
+
+    def start(self):
+        """
+        Start the workers (once per process)
+        """
+        with self._lock:
+            if self.started is True:
+                return
+            self.started = True
+
+        for i in range(int(config.OCNI_JOB_WORKERS)):
+            if green_IO.is_patched():
+                eventlet.spawn_n(self.work)
+            else:
+                worker = threading.Thread(target=self.work, name="JobWorker-" + str(i))
+                worker.daemon = True
+                worker.start()
+
+    def work(self):
+        while True:
+            job_id, index = self.queue.get()
+            try:
+                self.run_task(job_id, index)
+            except Exception as e:
+                logger.error("===== Job_worker : " + str(e) + " =====")
+
+    def run_task(self, job_id, index):
+        """
+        Drive one task of a job: call the backend, try again on failure, then record the result
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        task = job['Tasks'][index]
+        retries = int(config.OCNI_JOB_RETRIES)
+        timeout = int(config.OCNI_JOB_TIMEOUT)
+
+        self.update_task(job, index, "running", None)
+        while True:
+            calls = get_task_calls(self.backends, task)
+            if calls is None:
+                self.update_task(job, index, "failed", "Unknown provider or operation")
+                return
+
+            task['Attempts'] += 1
+            limit = self.get_limit(task['Provider'])
+            limit.acquire()
+            try:
+                for method, args in calls:
+                    run_with_timeout(method, args, timeout)
+                error = None
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            finally:
+                limit.release()
+
+            if error is None:
+                self.update_task(job, index, "succeeded", None)
+                return
+            if task['Attempts'] > retries:
+                self.update_task(job, index, "failed", error)
+                return
+
+            self.retried += 1
+            logger.warning("===== Job_worker : " + job_id + " " + task['Operation'] + " failed (" + error +
+                           "), attempt " + str(task['Attempts']) + " =====")
+            time.sleep(RETRY_DELAY * task['Attempts'])
+
+    def update_task(self, job, index, status, error):
+        """
+        Record the status of a task and of its job then save the job document
+        """
+        with self.job_locks[job['_id']]:
+            task = job['Tasks'][index]
+            task['Status'] = status
+            task['Error'] = error
+
+            statuses = [item['Status'] for item in job['Tasks']]
+            if "pending" in statuses or "running" in statuses:
+                job['Status'] = "running"
+                finished = False
+            else:
+                job['Status'] = "failed" if "failed" in statuses else "succeeded"
+                finished = True
+            job['Updated'] = make_timestamp()
+
+            try:
+                self.PostMan.save_job_in_db(job)
+            except Exception as e:
+                logger.error("===== Job_worker : job " + job['_id'] + " not saved, " + str(e) + " =====")
+
+        if finished is True:
+            if job['Status'] == "failed":
+                self.failed += 1
+            else:
+                self.succeeded += 1
+            with self._lock:
+                self.jobs.pop(job['_id'], None)
+                self.job_locks.pop(job['_id'], None)
+
+    def get_limit(self, provider):
+        with self._lock:
+            if self.limits.has_key(provider) is False:
+                self.limits[provider] = make_semaphore(int(config.OCNI_JOB_PROVIDER_LIMIT))
+            return self.limits[provider]
+
+    def stats(self):
+        return {"queued": self.queue.qsize(),
+                "in_progress": len(self.jobs),
+                "submitted": self.submitted,
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "retried": self.retried}
+
+
+def make_task(provider, operation, arguments):
+    """
+    Makes a task: a call of a backend method, saved in the job document
+    Args:
+        @param provider: provider name
+        @param operation: backend method (one of OPERATIONS)
+        @param arguments: arguments of the method (JSON serializable)
+    """
+    return {'Provider': provider, 'Operation': operation, 'Arguments': arguments}
+
+
+def get_task_calls(backends, task):
+    """
+    Returns the (backend method, arguments) calls of a task (None if its provider or operation is unknown)
+    Args:
+        @param backends: backend registry
+        @param task: task of a job
+    """
+    backend = backends.get_backend(task['Provider'])
+    if backend is None or task['Operation'] not in OPERATIONS:
+        return None
+    if task['Operation'] == "create_entities" and hasattr(backend, 'create_entities') is False:
+        return [(backend.create, [description]) for description in task['Arguments'][0]]
+    return [(getattr(backend, task['Operation']), task['Arguments'])]
+
+
+def run_with_timeout(method, args, timeout):
+    """
+    Calls a backend method, raises JobTimeout if it lasts more than timeout seconds (the call itself can not be
+    interrupted, its result is then ignored)
+    """
+    if green_IO.is_patched():
+        with eventlet.Timeout(timeout, JobTimeout("The backend call lasted more than " + str(timeout) + " s")):
+            return tpool.execute(method, *args)
+
+    result = dict()
+
+    def call():
+        try:
+            result['value'] = method(*args)
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=call, name="JobCall")
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise JobTimeout("The backend call lasted more than " + str(timeout) + " s")
+    if result.has_key('error'):
+        raise result['error']
+    return result.get('value')
+
+
+def describe_job(job):
+    """
+    Returns the status of a job as shown by GET /-/jobs/{job_id}
+    """
+    tasks = list()
+    for task in job['Tasks']:
+        tasks.append({"provider": task['Provider'], "operation": task['Operation'], "status": task['Status'],
+                      "attempts": task['Attempts'], "error": task['Error']})
+    return {"id": job['_id'], "location": make_job_location(job['_id']), "status": job['Status'],
+            "created": job['Created'], "updated": job['Updated'], "tasks": tasks}
+
+
+def make_job_location(job_id):
+    return config.PyOCNI_Server_Address + JOBS_PATH + job_id
+
+
+def make_owner():
+    return socket.gethostname() + ":" + str(os.getpid())
+
+
+def is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno != errno.ESRCH
+    return True
+
+
+def make_timestamp():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+#Note: The workers are green threads when the sockets are green-patched, their queue and locks must then be too
+
+def make_queue():
+    if green_IO.is_patched():
+        return green_queue.LightQueue()
+    return Queue.Queue()
+
+
+def make_lock():
+    if green_IO.is_patched():
+        return green_semaphore.Semaphore(1)
+    return threading.Lock()
+
+
+def make_semaphore(value):
+    if green_IO.is_patched():
+        return green_semaphore.Semaphore(value)
+    return threading.Semaphore(value)
+
+
+def is_enabled():
+    return str(config.OCNI_BACKEND_JOBS) == '1'
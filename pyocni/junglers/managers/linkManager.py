@@ -30,6 +30,7 @@ Created on Jun 12, 2012
 
 import pyocni.pyocni_tools.config as config
 import pyocni.pyocni_tools.occi_Joker as joker
+import pyocni.pyocni_tools.columnar_Filter as columnar_filter
 
 import pyocni.pyocni_tools.uuid_Generator as uuid_Generator
 
@@ -47,25 +48,20 @@ class LinkManager(object):
     """
     Manager of link documents.
     """
-    def register_links_explicit(self,occi_descriptions,url_path,db_occi_ids_locs, default_attributes):
+    def register_links_explicit(self,occi_descriptions,url_path,kind_occi_id,db_locations, default_attributes):
         """
         Add new links to database
         Args:
             @param occi_descriptions: The new Link OCCI descriptions
-            @param db_occi_ids_locs: OCCI ID and locations extracted from the database
             @param url_path: URL path of the request
+            @param kind_occi_id: OCCI ID of the kind of the sent request (None if there is none)
+            @param db_locations: locations of the new links that are already taken in the database
             @param default_attributes: The default attributes extracted from the kind
         """
 
         loc_res = list()
-        kind_occi_id = None
 
-        #Step[1] Extract the kind of the sent request
-
-        for elem in db_occi_ids_locs:
-            if elem['OCCI_Location'] == url_path:
-                kind_occi_id = elem['OCCI_ID']
-                break
+        #Step[1] Verify the kind of the sent request
 
         if kind_occi_id is not None:
 
@@ -77,7 +73,7 @@ class LinkManager(object):
 
                     loc = joker.make_entity_location_from_url(url_path,desc['id'])
                     #Note: Verify the uniqueness of the Address.
-                    exist_same = joker.verify_existences_teta([loc],db_occi_ids_locs)
+                    exist_same = loc in db_locations
 
                     if exist_same is False:
                         jData = dict()
@@ -89,6 +85,8 @@ class LinkManager(object):
                         jData['OCCI_Description']= desc
                         jData['Type']= "Link"
                         loc_res.append(jData)
+                        #Note: Two entities of the same request can not take the same location either
+                        db_locations.add(loc)
                     else:
                         logger.error(" ===== Register links explicit : Bad Link id ===== ")
                         return list(),return_code['Conflict']
@@ -110,36 +108,35 @@ class LinkManager(object):
         """
         Retrieve the resources that match the filters provided
         Args:
-            @param filters: Filters
-            @param descriptions_link: Link descriptions
+            @param filters: Compiled filters (OCCIFilterSet)
+            @param descriptions_link: Link descriptions (iterator)
         """
         var = list()
         try:
+            if columnar_filter.is_enabled() is True:
+                return columnar_filter.select_matching(filters, descriptions_link), return_code['OK']
+
             for desc in descriptions_link:
-                #Step[1]: Check if the descriptions match the filters
-                for filter in filters:
-                    checks =joker.filter_occi_description(desc['OCCI_Description'],filter)
-                    if checks is True:
-                        #Step[2]: Keep the record of those descriptions matching the filter
-                        var.append(desc['OCCI_ID'])
-                        logger.debug(" ===== Get_filtered_links : A link document was found =====")
-                        break
+                #Step[1]: Check if the descriptions match one of the filters
+                if filters.matches(desc['OCCI_Description']) is True:
+                    #Step[2]: Keep the record of those descriptions matching the filter
+                    var.append(desc['OCCI_ID'])
             return var,return_code['OK']
 
         except Exception as e:
             logger.error(" ===== Get_filtered_links : " + e.message + " ===== ")
             return list(),return_code['Internal Server Error']
 
-    def register_custom_link(self, occi_description, path_url, db_occi_ids_locs):
+    def register_custom_link(self, occi_description, path_url, db_kind_ids):
         """
         Add a new link with a custom URL to the database
         Args:
             @param occi_description: link description
             @param path_url: Custom URL of the link
-            @param db_occi_ids_locs: Ids and locations from the database
+            @param db_kind_ids: OCCI IDs of the registered kinds
         """
         #Step[1]: Verify if the kind of the new link exists
-        ok_k = joker.verify_existences_beta([occi_description['kind']],db_occi_ids_locs)
+        ok_k = occi_description['kind'] in db_kind_ids
         #Step[2]: Create the link
         if ok_k is True:
 
@@ -167,10 +164,11 @@ class LinkManager(object):
         try:
 
             logger.debug("===== Update_link: Link sent for update =====")
-            #Step[1]: Replace the old occi description with the new occi description
-            old_doc['OCCI_Description'] = occi_new_description
+            #Step[1]: Replace the old occi description with the new occi description (in a copy of the old document)
+            new_doc = dict(old_doc)
+            new_doc['OCCI_Description'] = occi_new_description
             #Step[2]: Return the hole document for update
-            return old_doc, return_code['OK, and location returned']
+            return new_doc, return_code['OK, and location returned']
 
         except Exception as e:
 
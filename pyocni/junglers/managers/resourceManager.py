@@ -25,6 +25,7 @@ Created on Jun 01, 2012
 
 import pyocni.pyocni_tools.config as config
 import pyocni.pyocni_tools.occi_Joker as joker
+import pyocni.pyocni_tools.columnar_Filter as columnar_filter
 
 import pyocni.pyocni_tools.uuid_Generator as uuid_Generator
 
@@ -43,25 +44,20 @@ class ResourceManager(object):
     Manager of resource documents
     """
 
-    def register_resources(self, occi_descriptions, url_path, db_occi_ids_locs, default_attributes):
+    def register_resources(self, occi_descriptions, url_path, kind_occi_id, db_locations, default_attributes):
         """
         Add new resources to the database
         Args:
 
             @param occi_descriptions: the OCCI description of the new resources
-            @param db_occi_ids_locs: OCCI IDs and OCCI Location extracted from the database
             @param url_path: URL path of the request
+            @param kind_occi_id: OCCI ID of the kind on which the request was sent (None if there is none)
+            @param db_locations: locations of the new resources that are already taken in the database
             @param default_attributes: the default attributes extracted from kind
         """
         loc_res = list()
-        kind_occi_id = None
 
-        #Step[1]: Get the kind on which the request was sent
-
-        for elem in db_occi_ids_locs:
-            if elem['OCCI_Location'] == url_path:
-                kind_occi_id = elem['OCCI_ID']
-                break
+        #Step[1]: Verify the kind on which the request was sent
 
         if kind_occi_id is not None:
             for desc in occi_descriptions:
@@ -69,7 +65,7 @@ class ResourceManager(object):
                 if desc['kind'] == kind_occi_id:
                     #Note: create the url of the id based on the id provided in the request
                     loc = joker.make_entity_location_from_url(url_path, desc['id'])
-                    exist_same = joker.verify_existences_teta([loc], db_occi_ids_locs)
+                    exist_same = loc in db_locations
 
                     #Step[2]: Create the new resource
                     if exist_same is False:
@@ -82,6 +78,8 @@ class ResourceManager(object):
                         jData['OCCI_Description'] = desc
                         jData['Type'] = "Resource"
                         loc_res.append(jData)
+                        #Note: Two entities of the same request can not take the same location either
+                        db_locations.add(loc)
                     else:
                         logger.error(" ===== Register_resources : Bad Resource id ===== ")
                         return list(), return_code['Conflict']
@@ -105,20 +103,19 @@ class ResourceManager(object):
         """
         Retrieve the resources that match the filters provided
         Args:
-            @param filters: Filters
-            @param descriptions_res: Resource descriptions
+            @param filters: Compiled filters (OCCIFilterSet)
+            @param descriptions_res: Resource descriptions (iterator)
         """
         var = list()
         try:
-            for desc in descriptions_res:
-                for filter in filters:
-                    #Step[1]: Check if descriptions match the filters
-                    checks = joker.filter_occi_description(desc['OCCI_Description'], filter)
+            if columnar_filter.is_enabled() is True:
+                return columnar_filter.select_matching(filters, descriptions_res), return_code['OK']
 
-                    if checks is True:
-                        #Step[2]: Keep record of those description matching the filter
-                        var.append(desc['OCCI_ID'])
-                        logger.debug("===== Get_filtered_resources: A resource document is found =====")
+            for desc in descriptions_res:
+                #Step[1]: Check if descriptions match one of the filters
+                if filters.matches(desc['OCCI_Description']) is True:
+                    #Step[2]: Keep record of those description matching the filter
+                    var.append(desc['OCCI_ID'])
 
             return var, return_code['OK']
 
@@ -126,18 +123,18 @@ class ResourceManager(object):
             logger.error("===== Get_filtered_resources : " + e.message + " =====")
             return list(), return_code['Internal Server Error']
 
-    def register_custom_resource(self, occi_description, path_url, db_occi_ids_locs):
+    def register_custom_resource(self, occi_description, path_url, db_kind_ids):
         """
         Add a new resource with a custom URL to the database
         Args:
 
             @param occi_description: Resource description
             @param path_url: Custom URL of the resource
-            @param db_occi_ids_locs: Ids and locations from the database
+            @param db_kind_ids: OCCI IDs of the registered kinds
         """
 
         #Step[1]: Verify if the kind of the new resource exists
-        ok_k = joker.verify_existences_beta([occi_description['kind']], db_occi_ids_locs)
+        ok_k = occi_description['kind'] in db_kind_ids
 
         #Step[2]: create the resource
         if ok_k is True:
@@ -166,10 +163,11 @@ class ResourceManager(object):
         try:
 
             logger.debug("===== Update_resource: Resource sent for update =====")
-            #Step[1]: Replace the old occi description with the new occi description
-            old_doc['OCCI_Description'] = occi_new_description
+            #Step[1]: Replace the old occi description with the new occi description (in a copy of the old document)
+            new_doc = dict(old_doc)
+            new_doc['OCCI_Description'] = occi_new_description
             #Step[2]: Return the hole document for update
-            return old_doc, return_code['OK, and location returned']
+            return new_doc, return_code['OK, and location returned']
 
         except Exception as e:
 
@@ -32,6 +32,9 @@ from pyocni.pyocni_tools.config import return_code
 from pyocni.junglers.pathJungler import PathManager
 from pyocni.junglers.managers.linkManager import LinkManager
 from pyocni.junglers.managers.resourceManager import ResourceManager
+from pyocni.pyocni_tools.service_Container import get_service
+import pyocni.pyocni_tools.occi_Joker as joker
+import pyocni.pyocni_tools.occi_Filter as occi_filter
 
 try:
     import simplejson as json
@@ -53,18 +56,20 @@ class MultiEntityJungler(object):
 
     def __init__(self):
 
-        self.manager_r = ResourceManager()
-        self.manager_l = LinkManager()
-        self.jungler_p = PathManager()
-        self.rd_baker = ResourceDataBaker()
-        self.PostMan = PostMan()
+        self.manager_r = get_service(ResourceManager)
+        self.manager_l = get_service(LinkManager)
+        self.jungler_p = get_service(PathManager)
+        self.rd_baker = get_service(ResourceDataBaker)
+        self.PostMan = get_service(PostMan)
 
-    def channel_post_multi_resources(self, jreq, req_path):
+    def channel_post_multi_resources(self, jreq, req_path, report=None):
         """
         Identifies the post path's goal : create a resource instance or update a mixin collection
         Args:
             @param jreq: Body content of the post request
             @param req_path: Address to which this post request was sent
+            @param report: dict receiving the entities that could not be written (failed) when creating entities and
+            the location of the backend job (job), if the backend calls were queued
         """
         #Step[1]: detect the goal of the request
 
@@ -77,12 +82,17 @@ class MultiEntityJungler(object):
 
             #Step[2a]: This is a create new resources request
 
-            db_occi_ids_locs = self.rd_baker.bake_to_post_multi_resources_2a()
+            #Note: Only the locations that the new entities would take are looked for in the database
+            new_locations = list()
+            for desc in jreq.get('resources', list()) + jreq.get('links', list()):
+                new_locations.append(joker.make_entity_location_from_url(req_path, desc['id']))
+
+            kind_occi_id, db_locations = self.rd_baker.bake_to_post_multi_resources_2a(req_path, new_locations)
 
             #Step[3a]: Look for the default attributes to complete the attribute description of the resource:
             default_attributes = self.rd_baker.bake_to_get_default_attributes(req_path)
 
-            if db_occi_ids_locs is None or default_attributes is None:
+            if db_locations is None or default_attributes is None:
                 return "An error has occurred, please check log for more details", return_code['Internal Server Error']
             else:
 
@@ -92,7 +102,7 @@ class MultiEntityJungler(object):
                     logger.debug(
                         "===== Channel_post_multi_resources ==== : Post on kind path to create a new resource channeled")
                     new_resources, resp_code_r = self.manager_r.register_resources(jreq['resources'], req_path,
-                        db_occi_ids_locs, default_attributes)
+                        kind_occi_id, db_locations, default_attributes)
                 else:
                     new_resources = list()
                     resp_code_r = return_code['OK, and location returned']
@@ -101,7 +111,7 @@ class MultiEntityJungler(object):
                     logger.debug(
                         "===== Channel_post_multi_resources ==== : Post on kind path to create a new link channeled")
                     new_links, resp_code_l = self.manager_l.register_links_explicit(jreq['links'], req_path,
-                        db_occi_ids_locs, default_attributes)
+                        kind_occi_id, db_locations, default_attributes)
                 else:
                     new_links = list()
                     resp_code_l = return_code['OK, and location returned']
@@ -110,18 +120,35 @@ class MultiEntityJungler(object):
                 or resp_code_l is not return_code['OK, and location returned']:
                     return "An error has occurred, please check log for more details", return_code['Bad Request']
 
-                #Step[5a]: Save the new resources
+                #Step[5a]: Save the new resources, chunk by chunk
                 entities = new_resources + new_links
 
-                self.PostMan.save_registered_docs_in_db(entities)
+                results = self.PostMan.save_new_entities_in_db(entities)
+
+                #Step[6a]: Report each entity as created or failed
+                created, failed = split_bulk_results(entities, results)
+                if report is not None:
+                    report['failed'] = failed
+
+                if len(created) is 0 and len(failed) > 0:
+                    logger.error("===== Channel_post_multi_resources ==== : No entity could be saved")
+                    for item in failed:
+                        if item['error'] != "conflict":
+                            return "An error has occurred, please check log for more details", return_code[
+                                                                                               'Internal Server Error']
+                    return "The entities conflict with existing documents", return_code['Conflict']
+
                 logger.debug("===== Channel_post_multi_resources ==== : Finished (2a) with success")
 
                 locations = list()
 
-                for item in entities:
+                for item in created:
                     locations.append(item['OCCI_Location'])
 
-                backend_m.create_entities(entities)
+                #Step[7a]: Send the created entities to their backends, grouped by provider
+                job = backend_m.create_entities(created)
+                if report is not None:
+                    report['job'] = job
 
                 return locations, return_code['OK, and location returned']
 
@@ -156,18 +183,21 @@ class MultiEntityJungler(object):
 
                     self.PostMan.save_updated_docs_in_db(updated_entities)
                     logger.debug("===== Channel_post_multi_resources ==== : Finished (2b) with success")
-                    backend_m.update_entities(db_docs, updated_entities)
+                    job = backend_m.update_entities(db_docs, updated_entities)
+                    if report is not None:
+                        report['job'] = job
                     return "", return_code['OK']
         else:
             return "An error has occurred, please check log for more details", return_code['Bad Request']
 
-    def channel_get_all_entities(self, req_path, jreq):
+    def channel_get_all_entities(self, req_path, jreq, page=None):
         """
         Retrieve all entities belonging to a kind or a mixin or get on a path
 
         Args:
             @param req_path: Address to which this post request was sent
             @param jreq: Data provided for filtering
+            @param page: Paging parameters (limit, cursor, count_only) of a get without filtering
         """
 
         #Step[1]: Retrieve the kind/mixin from DB
@@ -181,73 +211,94 @@ class MultiEntityJungler(object):
 
             logger.warning("===== Channel_get_all_multi_entities ===== : This is a get on a path " + req_path)
             #Step[1b]: Get on path to retrieve the entities under that path
-            var, resp_code = self.jungler_p.channel_get_on_path(req_path, jreq)
+            var, resp_code = self.jungler_p.channel_get_on_path(req_path, jreq, page)
             return var, resp_code
 
         else:
-            q = res.first()
             #Step[2]: Retrieve the entities related to the kind/mixin
-            entities = self.rd_baker.bake_to_get_all_entities(q['value'][1], q['value'][0])
+            entities = self.rd_baker.bake_to_get_all_entities(res['Type'], res['OCCI_ID'], page)
             if entities is None:
                 return "An error has occurred, please check log for more details", return_code['Internal Server Error']
 
+            elif entities is 0:
+                return "The cursor does not belong to this collection", return_code['Bad Request']
+
             else:
 
                 logger.debug("===== Channel_get_all_entities ==== : Finished with success")
                 return entities, return_code['OK']
 
-    def channel_get_filtered_entities(self, req_path, terms):
+    def channel_get_filtered_entities(self, req_path, terms, page=None):
         """
         Retrieve entities belonging to a kind or a mixin matching the terms specified or get entities on a path with filtering
         Args:
             @param req_path: Address to which this post request was sent
             @param terms: Terms to filter entities
+            @param page: Paging parameters, the views read are reported in page['index']
         """
-        #Step[1]: Get all the entities related to kind/mixin or get on a path with filtering
-        entities, ok = self.channel_get_all_entities(req_path, terms)
+        if page is None:
+            page = dict()
+
+        #Step[1]: Retrieve the kind/mixin from DB
+
+        res = self.rd_baker.bake_to_channel_get_all_entities(req_path)
 
-        if ok == return_code['OK']:
-            #Note: We now need the resources OCCI descriptions so we go back to the database
-            descriptions_res, descriptions_link = self.rd_baker.bake_to_get_filtered_entities(entities)
+        if res is None:
+            return "An error has occurred, please check log for more details", return_code['Internal Server Error']
 
+        elif res is 0:
+            logger.warning("===== Channel_get_filtered_entities ===== : This is a get on a path " + req_path)
+            #Step[1b]: Get on path with filtering
+            return self.jungler_p.channel_get_on_path(req_path, terms, page)
+
+        #Step[2]: Compile the filters once, the managers apply them while the documents are read from DB
+        page['index'] = list()
+        if terms.has_key('resources'):
+            logger.debug("===== Channel_get_filtered: Resources are sent to filter =====")
+            filters_res = occi_filter.compile_filters(terms['resources'])
+            descriptions_res, views = self.rd_baker.bake_to_get_filtered_entities(res['Type'], res['OCCI_ID'],
+                "Resource", filters_res)
             if descriptions_res is None:
                 return "An error has occurred, please check log for more details", return_code['Internal Server Error']
-            else:
-                #Step[2]: Ask the managers to do the filtering
-                if terms.has_key('resources'):
-                    logger.debug("===== Channel_get_filtered: Resources are sent to filter =====")
-                    filtered_res, resp_code_r = self.manager_r.get_filtered_resources(terms['resources'],
-                        descriptions_res)
-                else:
-                    logger.debug("===== Channel_get_filtered: No Resource filter =====")
-                    filtered_res = list()
-                    resp_code_r = return_code['OK']
-
-                if terms.has_key('links'):
-                    logger.debug("===== Channel_get_filtered: Links are sent to filter =====")
-                    filtered_links, resp_code_l = self.manager_l.get_filtered_links(terms['links'], descriptions_link)
-                else:
-                    logger.debug("===== Channel_get_filtered: No Links filter =====")
-                    filtered_links = list()
-                    resp_code_l = return_code['OK']
+            page['index'].extend(views)
+            filtered_res, resp_code_r = self.manager_r.get_filtered_resources(filters_res, descriptions_res)
+        else:
+            logger.debug("===== Channel_get_filtered: No Resource filter =====")
+            filtered_res = list()
+            resp_code_r = return_code['OK']
+
+        if terms.has_key('links'):
+            logger.debug("===== Channel_get_filtered: Links are sent to filter =====")
+            filters_link = occi_filter.compile_filters(terms['links'])
+            descriptions_link, views = self.rd_baker.bake_to_get_filtered_entities(res['Type'], res['OCCI_ID'],
+                "Link", filters_link)
+            if descriptions_link is None:
+                return "An error has occurred, please check log for more details", return_code['Internal Server Error']
+            page['index'].extend(views)
+            filtered_links, resp_code_l = self.manager_l.get_filtered_links(filters_link, descriptions_link)
+        else:
+            logger.debug("===== Channel_get_filtered: No Links filter =====")
+            filtered_links = list()
+            resp_code_l = return_code['OK']
 
-                if resp_code_l is not return_code['OK'] or resp_code_r is not return_code['OK']:
-                    return "An error has occurred, please check log for more details", return_code['Bad Request']
+        if resp_code_l is not return_code['OK'] or resp_code_r is not return_code['OK']:
+            return "An error has occurred, please check log for more details", return_code['Bad Request']
 
-                result = filtered_res + filtered_links
+        result = filtered_res + filtered_links
 
-                logger.debug("===== Channel_get_filtered_entities ==== : Finished with success")
+        logger.debug("===== Channel_get_filtered_entities ==== : Finished with success")
 
-                return result, return_code['OK']
+        return result, return_code['OK']
 
 
-    def channel_put_multi(self, jreq, req_url):
+    def channel_put_multi(self, jreq, req_url, report=None):
         """
         Update the mixin collection of resources
         Args:
 
             @param jreq: OCCI_Locations of the resources
             @param req_url: URL of the request
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued
         """
 
         #Step[1]: Get the necessary data from DB
@@ -277,16 +328,19 @@ class MultiEntityJungler(object):
                 self.PostMan.save_updated_docs_in_db(updated_entities)
 
                 logger.debug("===== Channel_put_multi_resources ==== : Finished (2b) with success")
-                backend_m.update_entities(db_docs, updated_entities)
+                job = backend_m.update_entities(db_docs, updated_entities)
+                if report is not None:
+                    report['job'] = job
                 return "", return_code['OK']
 
 
-    def channel_delete_multi(self, jreq, req_url):
+    def channel_delete_multi(self, jreq, req_url, report=None):
         """
         Remove the mixin from the resources
         Args:
             @param jreq: OCCI_Locations of the resources
             @param req_url: URL of the request
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued
         """
 
         #Step[1]: Get the necessary data from DB
@@ -318,17 +372,22 @@ class MultiEntityJungler(object):
 
             self.PostMan.save_updated_docs_in_db(updated_entities)
 
-            backend_m.update_entities(db_docs,updated_entities)
+            job = backend_m.update_entities(db_docs,updated_entities)
+            if report is not None:
+                report['job'] = job
 
             return "", return_code['OK']
 
-    def channel_trigger_actions(self, jBody, req_url, triggered_action):
+    def channel_trigger_actions(self, jBody, req_url, triggered_action, report=None):
         """
         Trigger action on a collection of resources related to a kind or mixin
         Args:
             @param jBody: Action provided
             @param req_url: URL of the request
             @param triggered_action: Action name
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued,
+            and the number of entities on which the action failed (failed)
+        Returns the result of the action on each entity (see make_action_results), "" if the actions were queued
         """
 
         #Step[1]: Get the necessary data:
@@ -340,11 +399,14 @@ class MultiEntityJungler(object):
         if kind_ids is 0:
             return "An error has occured, please check log for more details", return_code['Not Found']
         else:
+            #Step[2]: Get the providers of the instances, looked up once per kind
+            kind_providers = dict()
             providers = list()
-            #Step[2]: Get the providers of the instances
             for item in kind_ids:
-                provider = self.rd_baker.bake_to_get_provider(item)
-                providers.append(provider)
+                if item is not None and kind_providers.has_key(item) is False:
+                    provider = self.rd_baker.bake_to_get_provider(item)
+                    kind_providers[item] = provider['local'][0] if provider is not None else None
+                providers.append(kind_providers.get(item))
 
             if jBody.has_key('attributes') is True:
 
@@ -352,16 +414,51 @@ class MultiEntityJungler(object):
             else:
                 parameters = None
 
-            #Step[3]: Ask the backend to trigger the action on the resources
-            backend_m.trigger_action_on_multi_resource(entities,providers, jBody['actions'][0],parameters)
+            #Step[3]: Ask the backends to trigger the action on the resources
+            job, results = backend_m.trigger_action_on_multi_resource(entities, providers, jBody['actions'][0],
+                parameters)
+            if job is not None:
+                if report is not None:
+                    report['job'] = job
+                return "", return_code['OK']
 
-            return "", return_code['OK']
+            #Note: The entities deleted since they were listed are reported as such
+            for i in range(len(entities)):
+                if kind_ids[i] is None:
+                    results[i]['status'] = "not_found"
+                    results[i]['error'] = "The entity no longer exists"
+
+            var = make_action_results(triggered_action, results)
+            if report is not None:
+                report['failed'] = var['failed']
+            if var['failed'] > 0 and var['succeeded'] is 0:
+                return var, return_code['Internal Server Error']
+            return var, return_code['OK']
 
 
 #=======================================================================================================================
 #                                           Independent Functions
 #=======================================================================================================================
 
+def split_bulk_results(entities, results):
+    """
+    Separates the entities written in the database from those that failed
+    Args:
+        @param entities: entity documents sent to _bulk_docs
+        @param results: result of each document, in the same order
+    Returns the created entity documents and the failures: {"location", "error", "reason"}
+    """
+    created = list()
+    failed = list()
+    for i in range(len(entities)):
+        if results[i].has_key('error'):
+            failed.append({"location": entities[i]['OCCI_Location'], "error": results[i]['error'],
+                           "reason": results[i].get('reason', "")})
+        else:
+            created.append(entities[i])
+    return created, failed
+
+
 def associate_entities_to_a_mixin(mix_id, db_docs):
     """
     Add a single mixin to entities
@@ -409,4 +506,15 @@ def dissociate_entities_from_a_mixin(mix_id, db_docs):
         return db_docs, return_code['OK']
     else:
         logger.debug("Dissociate mixin : Mixin description problem")
-        return list(), return_code['Not Found']
\ No newline at end of file
+        return list(), return_code['Not Found']
+
+
+def make_action_results(action, results):
+    """
+    Aggregate result of an action triggered on a kind or mixin
+    Args:
+        @param action: action name
+        @param results: result of the action on each entity ({"location", "provider", "status", "error"})
+    """
+    succeeded = len([result for result in results if result['status'] == "succeeded"])
+    return {"action": action, "succeeded": succeeded, "failed": len(results) - succeeded, "entities": results}
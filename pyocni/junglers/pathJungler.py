@@ -24,7 +24,8 @@ Created on Jun 21, 2012
 """
 
 import pyocni.pyocni_tools.config as config
-import pyocni.pyocni_tools.occi_Joker as joker
+import pyocni.pyocni_tools.occi_Filter as occi_filter
+import pyocni.pyocni_tools.columnar_Filter as columnar_filter
 from pyocni.dataBakers.resource_dataBaker import ResourceDataBaker
 from postMan.the_post_man import PostMan
 
@@ -33,6 +34,7 @@ try:
 except ImportError:
     import json
 from pyocni.pyocni_tools.config import return_code
+from pyocni.pyocni_tools.service_Container import get_service
 # getting the Logger
 logger = config.logger
 
@@ -43,68 +45,58 @@ class PathManager(object):
 
     def __init__(self):
 
-        self.rd_baker = ResourceDataBaker()
-        self.PostMan = PostMan()
+        self.rd_baker = get_service(ResourceDataBaker)
+        self.PostMan = get_service(PostMan)
 
-    def channel_get_on_path(self, req_path, terms):
+    def channel_get_on_path(self, req_path, terms, page=None):
         """
         Channel get on path request to the manager responsible
         Args:
             @param req_path: Address to which this post request was sent
             @param terms: Data provided for filtering
+            @param page: Paging parameters (limit, cursor, count_only) of a get without filtering, the views read by a
+            get with filtering are reported in page['index']
         """
 
-        locations = list()
-        #Step[1]: get the necessary data from DB
-        occi_loc = self.rd_baker.bake_to_get_on_path()
-
         if terms is "":
-            #Step[2a]: Get on path without filtering
-            if occi_loc is None:
-                return "An error has occurred, please check log for more details", return_code['Internal Server Error']
-
-            else:
+            #Step[1a]: Get on path without filtering, the locations are looked up in the path key range
+            locations = self.rd_baker.bake_to_get_on_path(req_path, page=page)
 
-                for str_loc in occi_loc:
+            if locations is None:
+                return "An error has occurred, please check log for more details", return_code['Internal Server Error']
 
-                    if str_loc.find(req_path) is not -1:
-                        locations.append(str_loc)
+            elif locations is 0:
+                return "The cursor does not belong to this path", return_code['Bad Request']
 
             logger.debug("===== Channel_get_on_Path: Finished with success ===== ")
             return locations, return_code['OK']
 
         else:
-            #Step[2b]: Get on path with filtering
-            for str_loc in occi_loc:
-
-                if str_loc.endswith("/") is False and str_loc.find(req_path) is not -1:
-                    locations.append(str_loc)
+            #Step[1b]: Compile the filters, resources are matched against the resource filters and links against
+            # the link filters
+            filters = dict()
+            if terms.has_key('resources'):
+                filters['Resource'] = occi_filter.compile_filters(terms['resources'])
+            if terms.has_key('links'):
+                filters['Link'] = occi_filter.compile_filters(terms['links'])
 
-            descriptions = self.rd_baker.bake_to_get_on_path_filtered(locations)
+            #Step[2]: Get the documents below the path, from the kind indexes when the filters allow it
+            descriptions, views = self.rd_baker.bake_to_get_on_path_filtered(req_path, filters)
 
             if descriptions is None:
                 return "An error has occurred, please check log for more details", return_code['Internal Server Error']
-            else:
-                if terms.has_key('resources'):
-                    result_res, resp_code_r = get_filtered(terms['resources'], descriptions)
-                else:
-                    result_res = list()
-                    resp_code_r = return_code['OK']
 
-                if terms.has_key('links'):
-                    result_link, resp_code_l = get_filtered(terms['links'], descriptions)
-                else:
-                    result_link = list()
-                    resp_code_l = return_code['OK']
+            if page is not None:
+                page['index'] = views
 
-                if resp_code_l is not return_code['OK'] or resp_code_r is not return_code['OK']:
-                    return "An error has occurred, please check logs for more details", return_code[
-                                                                                        'Internal Server Error']
+            result, resp_code = get_filtered(filters, descriptions)
 
-                result = result_res + result_link
+            if resp_code is not return_code['OK']:
+                return "An error has occurred, please check logs for more details", return_code[
+                                                                                    'Internal Server Error']
 
-                logger.debug("===== Channel_get_on_Path: Finished with success ===== ")
-                return result, return_code['OK']
+            logger.debug("===== Channel_get_on_Path: Finished with success ===== ")
+            return result, return_code['OK']
 
 
     def channel_delete_on_path(self, req_path):
@@ -113,19 +105,12 @@ class PathManager(object):
         Args:
             @param req_path: Address to which this post request was sent
         """
-        occi_loc,doc_loc = self.rd_baker.bake_to_delete_on_path()
+        #Note: Only the entities under the path are returned
+        occi_loc,to_delete = self.rd_baker.bake_to_delete_on_path(req_path)
 
-        if occi_loc is None or doc_loc is None:
+        if occi_loc is None or to_delete is None:
             return "An error has occurred, please check log for more details", return_code['Internal Server Error']
         else:
-            to_delete = list()
-
-            for i in range(len(occi_loc)):
-
-                str_loc = str(occi_loc[i])
-                if str_loc.find(req_path) is not -1:
-                    to_delete.append(doc_loc[i])
-
             self.PostMan.delete_entities_in_db(to_delete)
 
             logger.debug("===== Channel Delete on Path: Finished with success =====")
@@ -134,25 +119,22 @@ class PathManager(object):
 
 def get_filtered(filters, descriptions_entities):
     """
-    Retrieve the resources  that match the filters provided
+    Retrieve the entities that match the filters provided
     Args:
-        @param filters: Filters
-        @param descriptions_entities: Entity descriptions
+        @param filters: Compiled filters (OCCIFilterSet) by entity Type
+        @param descriptions_entities: Entity descriptions (iterator)
     """
     var = list()
 
     try:
-        for desc in descriptions_entities:
-            for filter in filters:
-
-                checks = joker.filter_occi_description(desc['OCCI_Description'], filter)
+        if columnar_filter.is_enabled() is True:
+            return columnar_filter.select_matching_by_type(filters, descriptions_entities), return_code['OK']
 
-                if checks is True:
-                    var.append(desc['OCCI_ID'])
-                    logger.debug("Entity filtered : document found")
-                    break
+        for desc in descriptions_entities:
+            if filters.has_key(desc['Type']) and filters[desc['Type']].matches(desc['OCCI_Description']) is True:
+                var.append(desc['OCCI_ID'])
         return var, return_code['OK']
 
     except Exception as e:
         logger.error("filtered entity : " + e.message)
-        return list(), return_code['Internal Server Error']
\ No newline at end of file
+        return list(), return_code['Internal Server Error']
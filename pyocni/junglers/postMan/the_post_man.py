@@ -23,39 +23,90 @@ Created on May 29, 2012
 @license: Apache License, Version 2.0
 """
 
+from couchdbkit import BulkSaveError
 import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
+import pyocni.storage.write_coalescer as write_coalescer
+from pyocni.pyocni_tools.service_Container import get_service
 
+# getting the Logger
+logger = config.logger
 
-class PostMan():
+class PostMan(object):
     """
     Imports new data into the database
 
     """
 
     def __init__(self):
-        #Step[1]: Create the database connection
-        self.database = config.get_PyOCNI_db()
+        self._database = None
+        #Note: Single entity writes of concurrent requests are saved together when CouchDB_WRITE_BATCH_WINDOW > 0
+        self.coalescer = get_service(write_coalescer.WriteCoalescer)
+
+    @property
+    def database(self):
+        """
+        Database connection, kept for the life of the worker (retried on the next call if it failed)
+        """
+        if self._database is None:
+            self._database = get_engine().get_database()
+        return self._database
 
     def save_registered_docs_in_db(self, docs):
         self.database.save_docs(docs, use_uuids=True, all_or_nothing=True)
 
+    def save_new_entities_in_db(self, docs):
+        """
+        Write new entity documents in _bulk_docs requests of at most CouchDB_BULK_CHUNK_SIZE documents. A failed
+        document does not stop the others from being written.
+        Args:
+            @param docs: new entity documents
+        Returns the result of each document, in the same order: {'id', 'rev'} or {'id', 'error', 'reason'}
+        """
+        results = list()
+        chunk_size = int(config.DB_BULK_CHUNK_SIZE)
+        for start in range(0, len(docs), chunk_size):
+            chunk = docs[start:start + chunk_size]
+            try:
+                results.extend(self.database.save_docs(chunk, use_uuids=True))
+            except BulkSaveError as e:
+                #Note: The documents of the chunk that were written are in the results too
+                results.extend(e.results)
+            except Exception as e:
+                logger.error("===== Save_new_entities_in_db : " + str(e) + " =====")
+                results.extend([{'id': doc['_id'], 'error': 'not_saved', 'reason': str(e)} for doc in chunk])
+        return results
+
     def save_updated_docs_in_db(self, categories):
         self.database.save_docs(categories, force_update=True, all_or_nothing=True)
 
-    def save_updated_doc_in_db(self, categories):
-        self.database.save_doc(categories, force_update=True, all_or_nothing=True)
-
-    def save_partial_updated_doc_in_db(self, categories):
-        self.database.save_doc(categories, force_update=True, all_or_nothing=True)
+    def save_updated_entity_in_db(self, entity):
+        """
+        Save an updated entity with the _rev it was read with: raise ResourceConflict if it was changed meanwhile
+        """
+        if write_coalescer.is_enabled():
+            return self.coalescer.save(entity)
+        return self.database.save_doc(entity)
 
     def save_deleted_categories_in_db(self, categories, to_update):
-        self.database.delete_docs(categories)
-        self.database.save_docs(to_update, force_update=True, all_or_nothing=True)
+        #Note: The entities are dissociated first: on the engines without rollback, the categories are not deleted if
+        # the entities using them can not be updated, and the categories left by a failed deletion are no longer used
+        with get_engine().transaction():
+            self.database.save_docs(to_update, force_update=True, all_or_nothing=True)
+            self.database.delete_docs(categories)
 
     def save_custom_resource(self, entity):
+        if write_coalescer.is_enabled():
+            return self.coalescer.save(entity)
         self.database.save_doc(entity, use_uuids=True, all_or_nothing=True)
 
+    def save_job_in_db(self, job):
+        #Note: The job keeps its latest revision, it is saved again at each step
+        self.database.save_doc(job)
+
     def delete_single_resource_in_db(self, res_value):
+        if write_coalescer.is_enabled():
+            return self.coalescer.delete(res_value)
         self.database.delete_doc(res_value)
 
     def delete_entities_in_db(self, to_delete):
@@ -23,6 +23,7 @@ Created on Jun 12, 2012
 @license: Apache License, Version 2.0
 """
 
+from couchdbkit import ResourceConflict
 import pyocni.pyocni_tools.config as config
 import pyocni.junglers.managers.backendManager as backend_m
 from pyocni.dataBakers.resource_dataBaker import ResourceDataBaker
@@ -32,6 +33,7 @@ from pyocni.pyocni_tools.config import return_code
 
 from pyocni.junglers.managers.linkManager import LinkManager
 from pyocni.junglers.managers.resourceManager import ResourceManager
+from pyocni.pyocni_tools.service_Container import get_service
 
 try:
     import simplejson as json
@@ -54,24 +56,29 @@ class SingleEntityJungler(object):
 
     def __init__(self):
 
-        self.manager_r = ResourceManager()
-        self.manager_l = LinkManager()
-        self.rd_baker = ResourceDataBaker()
-        self.PostMan = PostMan()
+        self.manager_r = get_service(ResourceManager)
+        self.manager_l = get_service(LinkManager)
+        self.rd_baker = get_service(ResourceDataBaker)
+        self.PostMan = get_service(PostMan)
+        self.updates = 0
+        self.conflicts = 0
+        self.retries = 0
+        self.failed = 0
 
-    def channel_put_single_resource(self, jBody, path_url):
+    def channel_put_single_resource(self, jBody, path_url, report=None):
         """
         Creates a new resource or performs a full update of the resource description
         Args:
             @param jBody: Data contained in the request body
             @param path_url: URL of the request
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued
         """
 
         #Step[1]: Get the data necessary from the database
 
-        db_occi_ids_locs,db_resources_nb = self.rd_baker.bake_to_put_single(path_url)
+        db_kind_ids,db_resources_nb = self.rd_baker.bake_to_put_single(path_url)
 
-        if db_occi_ids_locs is None or db_resources_nb is None:
+        if db_kind_ids is None or db_resources_nb is None:
 
             return "An error has occurred, please check log for more details",return_code['Internal Server Error']
         else:
@@ -82,13 +89,13 @@ class SingleEntityJungler(object):
 
                 if jBody.has_key('resources'):
                     logger.debug("===== Channel_put_single_resources ==== : Resource custom creation channeled")
-                    entity, resp_code_r = self.manager_r.register_custom_resource(jBody['resources'][0],path_url,db_occi_ids_locs)
+                    entity, resp_code_r = self.manager_r.register_custom_resource(jBody['resources'][0],path_url,db_kind_ids)
                 else:
                     resp_code_r = return_code['OK, and location returned']
 
                 if jBody.has_key('links'):
                     logger.debug("===== Channel_put_single_resources ==== : Link custom creation channeled")
-                    entity, resp_code_l = self.manager_l.register_custom_link(jBody['links'][0],path_url,db_occi_ids_locs)
+                    entity, resp_code_l = self.manager_l.register_custom_link(jBody['links'][0],path_url,db_kind_ids)
                 else:
                     resp_code_l = return_code['OK, and location returned']
 
@@ -97,7 +104,9 @@ class SingleEntityJungler(object):
 
                 self.PostMan.save_custom_resource(entity)
                 logger.debug("===== Channel_put_single_resource ==== : Finished (2a) with success")
-                backend_m.create_entity(entity)
+                job = backend_m.create_entity(entity)
+                if report is not None:
+                    report['job'] = job
 
                 #Step[3a]: Return the locations of the resources
                 return entity['OCCI_Location'],return_code['OK, and location returned']
@@ -105,34 +114,19 @@ class SingleEntityJungler(object):
             else:
                 #Step[2b]: This is a full update resource request (More data is needed)
 
-                olddoc = self.rd_baker.bake_to_put_single_updateCase(path_url)
+                olddoc, entity, resp_code = self.update_entity(path_url, self.apply_full_update, jBody)
 
-                if olddoc is None:
+                if olddoc is None or olddoc is 0:
                     return "An error has occurred, please check log for more details",return_code['Bad Request']
+                elif resp_code is not return_code['OK, and location returned']:
+                    return "An error has occurred, please check log for more details",resp_code
                 else:
-                    if jBody.has_key('resources'):
-                        logger.debug("===== Channel_put_single_resources ==== : Resource full update channeled")
-                        entity, resp_code_r = self.manager_r.update_resource(olddoc,jBody['resources'][0])
-                    else:
-                        resp_code_r = return_code['OK, and location returned']
-
-                    if jBody.has_key('links'):
-                        logger.debug("===== Channel_put_single_resources ==== : Link full update channeled")
-                        entity, resp_code_l = self.manager_l.update_link(olddoc,jBody['links'][0])
-                    else:
-                        resp_code_l = return_code['OK, and location returned']
-
-                    if resp_code_r is not return_code['OK, and location returned'] or resp_code_l is not return_code['OK, and location returned']:
-                        return "An error has occurred, please check log for more details",return_code['Bad Request']
-
-
-
-                    self.PostMan.save_updated_doc_in_db(entity)
-
                     logger.debug("===== Channel_put_single_resource ==== : Finished (2b) with success")
                     #return the locations of the resources
 
-                    backend_m.update_entity(olddoc['OCCI_Description'],entity['OCCI_Description'])
+                    job = backend_m.update_entity(olddoc['OCCI_Description'],entity['OCCI_Description'])
+                    if report is not None:
+                        report['job'] = job
 
                     return olddoc['OCCI_Location'],return_code['OK, and location returned']
 
@@ -151,6 +145,7 @@ class SingleEntityJungler(object):
 
         elif res is 0:
             logger.warning("===== Channel_get_single_resource ==== : Resource not found")
+            return "An error has occurred, please check log for more details",return_code['Not Found']
 
         else:
             logger.debug("===== Channel_get_single_resource ==== : Finished with success")
@@ -159,64 +154,141 @@ class SingleEntityJungler(object):
 
             return res,return_code['OK']
 
-    def channel_post_single_resource(self, jBody, path_url):
+    def channel_post_single_resource(self, jBody, path_url, report=None):
         """
         Performs a partial description update of the resource
         Args:
             @param jBody: New OCCI values
             @param path_url: URL of the request
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued
         """
 
-        #Step[1]: Get the necessary data from the database
-        db_occi_ids_locs,old_doc = self.rd_baker.bake_to_post_single(path_url)
+        #Step[1]: Get the necessary data from the database, then update only the part that exist in both the new
+        # values and the old resource description
+        old_doc, entity, resp_code = self.update_entity(path_url, self.apply_partial_update, jBody)
 
-        if old_doc is 0:
+        if old_doc is 0 or old_doc is None:
 
             logger.error("===== Channel_post_single_resource ==== : Resource not found")
             return "An error has occurred, please check logs for more details",return_code['Internal Server Error']
 
+        elif resp_code is not return_code['OK, and location returned']:
+
+            return "An error has occurred, please check log for more details",resp_code
+
         else:
+            logger.debug("===== Channel_post_single_resource ==== : Finished with success")
+            job = backend_m.update_entity(old_doc['OCCI_Description'],entity['OCCI_Description'])
+            if report is not None:
+                report['job'] = job
 
-            old_data = old_doc['OCCI_Description']
-            entity = dict()
+            #Step[2]: Return the locations of the resource
+            return old_doc['OCCI_Location'],return_code['OK, and location returned']
 
-            #Step[2]: update only the part that exist in both the new values and the old resource description
+    def update_entity(self, path_url, apply_update, jBody):
+        """
+        Update an entity with the _rev it was read with: if it was changed by another request meanwhile, it is read
+        and the update applied again (at most OCNI_UPDATE_RETRIES times, then the request fails with 409)
+        Args:
+            @param path_url: URL of the entity
+            @param apply_update: method making the new document from the old one and the request body, leaving the
+            old one as it is
+            @param jBody: Data contained in the request body
+        Returns the old document (None or 0 if it could not be read), the saved document and the status code
+        """
+        retries = int(config.OCNI_UPDATE_RETRIES)
+        attempt = 0
+        self.updates += 1
+        while True:
+            #Step[1]: Read the entity, with its current _rev
+            old_doc = self.rd_baker.bake_to_post_single(path_url)
+            if old_doc is None or old_doc is 0:
+                return old_doc, None, None
+
+            #Step[2]: Apply the update on the document read
+            entity, resp_code = apply_update(old_doc, jBody)
+            if resp_code is not return_code['OK, and location returned']:
+                return old_doc, None, resp_code
+
+            #Step[3]: Save it, unless the entity was changed since it was read
+            try:
+                self.PostMan.save_updated_entity_in_db(entity)
+                return old_doc, entity, resp_code
+            except ResourceConflict:
+                self.conflicts += 1
+                if attempt >= retries:
+                    self.failed += 1
+                    logger.error("===== Update_entity : " + path_url + " still changed by other requests after " +
+                                 str(attempt) + " retries =====")
+                    return old_doc, None, return_code['Conflict']
+                attempt += 1
+                self.retries += 1
+                logger.debug("===== Update_entity : " + path_url + " changed meanwhile, retry " + str(attempt))
+
+    def apply_full_update(self, old_doc, jBody):
+        """
+        Makes the new document of a full update (the old document is left as it is)
+        """
+        if jBody.has_key('resources'):
+            logger.debug("===== Channel_put_single_resources ==== : Resource full update channeled")
+            entity, resp_code_r = self.manager_r.update_resource(old_doc,jBody['resources'][0])
+        else:
+            resp_code_r = return_code['OK, and location returned']
 
-            if jBody.has_key('resources'):
+        if jBody.has_key('links'):
+            logger.debug("===== Channel_put_single_resources ==== : Link full update channeled")
+            entity, resp_code_l = self.manager_l.update_link(old_doc,jBody['links'][0])
+        else:
+            resp_code_l = return_code['OK, and location returned']
 
-                logger.debug("===== Channel_post_single_resource ==== : Resource was found and channeled")
-                entity, resp_code_r = self.manager_r.partial_resource_update(old_doc['OCCI_Description'],jBody['resources'][0])
+        if resp_code_r is not return_code['OK, and location returned'] or \
+           resp_code_l is not return_code['OK, and location returned']:
+            return None, return_code['Bad Request']
 
-            else:
-                logger.debug("===== Channel_post_single_resource ==== : No Resource was found")
-                resp_code_r = return_code['OK, and location returned']
+        return entity, return_code['OK, and location returned']
 
-            if jBody.has_key('links'):
-                logger.debug("===== Channel_post_single_resource ==== : Link was found and channeled")
-                entity, resp_code_l = self.manager_l.partial_link_update(old_doc['OCCI_Description'],jBody['links'][0])
-            else:
-                logger.debug("===== Channel_post_single_resource ==== : No Link was found")
-                resp_code_l = return_code['OK, and location returned']
+    def apply_partial_update(self, old_doc, jBody):
+        """
+        Makes the new document of a partial update (the old document is left as it is)
+        """
+        description = dict()
+        if jBody.has_key('resources'):
 
-            if resp_code_r is not return_code['OK, and location returned'] or resp_code_l is not return_code['OK, and location returned']:
+            logger.debug("===== Channel_post_single_resource ==== : Resource was found and channeled")
+            description, resp_code_r = self.manager_r.partial_resource_update(old_doc['OCCI_Description'],
+                jBody['resources'][0])
 
-                return "An error has occurred, please check log for more details",return_code['Bad Request']
+        else:
+            logger.debug("===== Channel_post_single_resource ==== : No Resource was found")
+            resp_code_r = return_code['OK, and location returned']
 
-            old_doc['OCCI_Description'] = entity
+        if jBody.has_key('links'):
+            logger.debug("===== Channel_post_single_resource ==== : Link was found and channeled")
+            description, resp_code_l = self.manager_l.partial_link_update(old_doc['OCCI_Description'],jBody['links'][0])
+        else:
+            logger.debug("===== Channel_post_single_resource ==== : No Link was found")
+            resp_code_l = return_code['OK, and location returned']
 
-            self.PostMan.save_partial_updated_doc_in_db(old_doc)
+        if resp_code_r is not return_code['OK, and location returned'] or \
+           resp_code_l is not return_code['OK, and location returned']:
+            return None, return_code['Bad Request']
 
-            logger.debug("===== Channel_post_single_resource ==== : Finished with success")
-            backend_m.update_entity(old_data,entity)
+        entity = dict(old_doc)
+        entity['OCCI_Description'] = description
+        return entity, return_code['OK, and location returned']
 
-            #Step[3]: Return the locations of the resource
-            return old_doc['OCCI_Location'],return_code['OK, and location returned']
+    def stats(self):
+        return {"updates": self.updates,
+                "conflicts": self.conflicts,
+                "retries": self.retries,
+                "failed": self.failed}
 
-    def channel_delete_single_resource(self, path_url):
+    def channel_delete_single_resource(self, path_url, report=None):
         """
         Delete a resource instance
         Args:
             @param path_url: URL of the resource
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued
         """
 
         #Step[1]: Get the necessary data from the database
@@ -235,17 +307,20 @@ class SingleEntityJungler(object):
             #Note: Save the entity description to send it to the backend
             entity = res_value['OCCI_Description']
 
-            backend_m.delete_entity(entity,entity['kind'])
+            job = backend_m.delete_entity(entity,entity['kind'])
+            if report is not None:
+                report['job'] = job
             logger.debug("===== Channel_delete_single_resource ==== : Finished with success")
             return "",return_code['OK']
 
-    def channel_triggered_action_single(self, jBody, path_url, triggered_action):
+    def channel_triggered_action_single(self, jBody, path_url, triggered_action, report=None):
         """
         Trigger the action on the resource
         Args:
             @param jBody: Data provided
             @param path_url: URL of the request
             @param triggered_action: Action name to trigger
+            @param report: dict receiving the location of the backend job (job), if the backend calls were queued
         """
 
         #Step[1]: Get the necessary data from DB
@@ -278,6 +353,10 @@ class SingleEntityJungler(object):
             else:
                 #Step[4]: Trigger the action on the resources
                 resp, resp_code = backend_m.trigger_action_on_a_resource(value_res[1],triggered_action,provider['local'][0],parameters)
+                if resp_code is return_code['Accepted']:
+                    if report is not None and resp != "":
+                        report['job'] = resp
+                    resp = ""
                 logger.debug("===== Channel_triggered_action_single ==== : Finished with success")
                 return resp,return_code['OK']
 
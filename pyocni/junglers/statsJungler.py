@@ -0,0 +1,63 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import os
+import pyocni.pyocni_tools.config as config
+from pyocni.junglers.single_entityJungler import SingleEntityJungler
+from pyocni.junglers.managers.jobManager import JobManager
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.storage.write_coalescer import WriteCoalescer
+from pyocni.storage.engine import get_engine
+from pyocni.pyocni_tools.config import return_code
+from pyocni.pyocni_tools.service_Container import get_service
+
+# getting the Logger
+logger = config.logger
+
+class StatsJungler(object):
+    """
+    Handles the requests on the counters of the server process (/-/stats)
+    """
+
+    def __init__(self):
+
+        self.jungler_se = get_service(SingleEntityJungler)
+        self.manager_j = get_service(JobManager)
+        self.registry = get_service(CategoryRegistry)
+        self.coalescer = get_service(WriteCoalescer)
+
+    def channel_get_stats(self):
+        """
+        Gather the counters of the services of this process (each pre-fork worker has its own)
+        """
+        #Step[1]: Read the counters of each service
+
+        var = {"pid": os.getpid(),
+               "engine": get_engine().stats(),
+               "categories": self.registry.stats(),
+               "updates": self.jungler_se.stats(),
+               "jobs": self.manager_j.stats(),
+               "write_coalescer": self.coalescer.stats()}
+
+        logger.debug("===== Channel_get_stats: Finished with success ===== ")
+        return var, return_code['OK']
@@ -22,14 +22,27 @@ Created on Jun 01, 2012
 @organization: Institut Mines-Telecom - Telecom SudParis
 @license: Apache License - Version 2.0
 """
+#Note: green_IO must be imported first, it patches the sockets before couchdbkit is loaded
+import pyocni.pyocni_tools.green_IO as green_IO
 from pyocni.dispachers.single_entityDispatcher import SingleEntityDispatcher
 from pyocni.dispachers.multi_entityDispatcher import MultiEntityDispatcher
 from pyocni.dispachers.queryDispatcher import QueryDispatcher
+from pyocni.dispachers.jobDispatcher import JobDispatcher
+from pyocni.dispachers.statsDispatcher import StatsDispatcher
 import pyocni.pyocni_tools.config as config
 import pyocni.pyocni_tools.DoItYourselfWebOb as url_mapper
+import resource
 import eventlet
 from eventlet import wsgi
 from pyocni.pyocni_tools import ask_user_details as shell_ask
+from pyocni.pyocni_tools.prefork_Server import PreforkServer
+from pyocni.pyocni_tools.threaded_Server import ThreadedServer
+from pyocni.pyocni_tools.service_Container import get_service
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.suppliers.kindIndexes import KindIndexes
+from pyocni.storage.engine import get_engine
+import pyocni.storage.write_coalescer as write_coalescer
+import pyocni.junglers.managers.jobManager as job_manager
 
 
 
@@ -55,9 +68,13 @@ class occi_server(object):
     operationQuery = url_mapper.rest_controller(QueryDispatcher)
     operationSingleEntity = url_mapper.rest_controller(SingleEntityDispatcher)
     operationMultiEntity = url_mapper.rest_controller(MultiEntityDispatcher)
+    operationJob = url_mapper.rest_controller(JobDispatcher)
+    operationStats = url_mapper.rest_controller(StatsDispatcher)
     app = url_mapper.Router()
 
     app.add_route('/-/', controller=operationQuery)
+    app.add_route('/-/jobs/{job_id}', controller=operationJob)
+    app.add_route('/-/stats', controller=operationStats)
 
     app.add_route('/{location}/', controller=operationMultiEntity)
     app.add_route('/{location}/{idontknow}/', controller=operationMultiEntity)
@@ -67,6 +84,65 @@ class occi_server(object):
     app.add_route('/{location}/{idontknow}/{idontcare}', controller=operationSingleEntity)
 
 
+    def server_options(self):
+        """
+
+        eventlet WSGI server options: number of client connections served at the same time, keep-alive and timeout of
+        the client sockets
+
+        """
+        socket_timeout = None
+        if int(config.OCNI_SOCKET_TIMEOUT) > 0:
+            socket_timeout = int(config.OCNI_SOCKET_TIMEOUT)
+        return {'max_size': int(config.OCNI_MAX_CONNECTIONS),
+                'keepalive': str(config.OCNI_KEEPALIVE) == '1',
+                'socket_timeout': socket_timeout}
+
+    def raise_open_files_limit(self):
+        """
+
+        Every client connection needs a file descriptor: raise the soft limit (up to the hard one) if needed
+
+        """
+        needed = int(config.OCNI_MAX_CONNECTIONS) + int(config.OCNI_BACKLOG) + int(config.DB_POOL_SIZE) + 64
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY and soft < needed:
+            if hard != resource.RLIM_INFINITY:
+                needed = min(needed, hard)
+            try:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (needed, hard))
+            except (ValueError, resource.error) as e:
+                logger.warning("===== Raise_open_files_limit : " + str(e) + " =====")
+
+    def init_worker(self):
+        """
+
+        Pre-fork worker: drive the jobs left by the workers that have exited
+
+        """
+        if job_manager.is_enabled():
+            get_service(job_manager.JobManager).follow_orphans()
+
+    def serve(self, address):
+        """
+
+        Serve requests on the address until the server is stopped, with the front end of OCNI_SERVER_MODE
+
+        """
+        if str(config.OCNI_SERVER_MODE) == 'threaded':
+            socket_timeout = self.server_options()['socket_timeout']
+            server = ThreadedServer(self.app, address, max_connections=int(config.OCNI_MAX_CONNECTIONS),
+                backlog=int(config.OCNI_BACKLOG), socket_timeout=socket_timeout)
+            server.run()
+        elif int(config.OCNI_WORKERS) > 0:
+            server = PreforkServer(self.app, address,
+                workers=int(config.OCNI_WORKERS), max_requests=int(config.OCNI_MAX_REQUESTS),
+                graceful_timeout=int(config.OCNI_GRACEFUL_TIMEOUT), backlog=int(config.OCNI_BACKLOG),
+                server_options=self.server_options(), worker_init=self.init_worker)
+            server.run()
+        else:
+            wsgi.server(eventlet.listen(address, backlog=int(config.OCNI_BACKLOG)), self.app, **self.server_options())
+
     def run_server(self):
         """
 
@@ -74,16 +150,52 @@ class occi_server(object):
 
         """
 
-        db_status = config.check_db()
-        if db_status == 1:
-            result = shell_ask.query_yes_no_quit(" \n_______________________________________________________________\n"
-                                                 "   Do you want to purge all databases (DB  reinitialization)?", "no")
-            if result == 'yes':
-                config.purge_PyOCNI_db()
+        if str(config.OCNI_SERVER_MODE) not in ('eventlet', 'threaded'):
+            print ("\n______________________________________________________________________________________\n"
+                   "Unknown OCNI_SERVER_MODE " + str(config.OCNI_SERVER_MODE) + ", set eventlet or threaded.")
+            return
+
+        if str(config.OCNI_SERVER_MODE) == 'threaded' and (int(config.OCNI_WORKERS) > 0 or green_IO.is_enabled() or
+                                                           write_coalescer.is_enabled()):
+            #Note: The threads of this mode block on their sockets, the green threads of eventlet can not serve them
+            print ("\n______________________________________________________________________________________\n"
+                   "The threaded server mode serves one process without eventlet, set OCNI_WORKERS = 0, "
+                   "OCNI_GREEN_IO = 0 and CouchDB_WRITE_BATCH_WINDOW = 0 to use it.")
+            return
 
+        engine = get_engine()
+        if engine.shared is False and int(config.OCNI_WORKERS) > 0:
+            print ("\n______________________________________________________________________________________\n"
+                   "The " + str(config.DB_ENGINE) + " storage engine keeps the data in one process, "
+                   "set OCNI_WORKERS = 0 to use it.")
+            return
+
+        db_status = engine.check()
+        if db_status == 1:
+            if int(config.OCNI_WORKERS) > 0:
+                #Note: The pre-fork mode runs unattended, the purge is driven by OCNI_PURGE_DB
+                if str(config.OCNI_PURGE_DB) == '1':
+                    engine.purge()
+            else:
+                result = shell_ask.query_yes_no_quit(" \n_______________________________________________________________\n"
+                                                     "   Do you want to purge all databases (DB  reinitialization)?", "no")
+                if result == 'yes':
+                    engine.purge()
+
+            #Note: The design document is installed (or upgraded) once, before serving any request
+            engine.install()
+            get_service(KindIndexes).install()
+            if int(config.OCNI_WORKERS) == 0:
+                #Note: Pre-fork workers load their own category registry on their first request
+                get_service(CategoryRegistry).load()
+                #Note: The jobs left unfinished by the previous run are driven again
+                if job_manager.is_enabled():
+                    get_service(job_manager.JobManager).resume()
+
+            self.raise_open_files_limit()
             print ("\n______________________________________________________________________________________\n"
                    "The OCNI server is running at: " + config.OCNI_IP + ":" + config.OCNI_PORT)
-            wsgi.server(eventlet.listen((config.OCNI_IP, int(config.OCNI_PORT))), self.app)
+            self.serve((config.OCNI_IP, int(config.OCNI_PORT)))
             print ("\n______________________________________________________________________________________\n"
                    "Closing correctly PyOCNI server ")
         else:
@@ -9,6 +9,8 @@ from webob import exc
 
 import eventlet
 from eventlet import wsgi
+import pyocni.pyocni_tools.db_Calls as db_calls
+import pyocni.pyocni_tools.config as config
 
 #  \{ (\w+)(?::([^}]+))?\}
 var_regex = re.compile(r'''
@@ -18,6 +20,9 @@ var_regex = re.compile(r'''
      \}          # The exact character "}"
      ''', re.VERBOSE)
 
+# environ key under which the router shares its request object with the controller
+REQUEST_KEY = 'pyocni.request'
+
 
 def template_to_regex(template):
     regex = ''
@@ -43,30 +48,153 @@ def load_controller(string):
 
 
 class Router(object):
+    """
+    Compiled routing engine.
+
+    Routes made of plain literal or {variable} segments are grouped in a table keyed by
+    (number of path segments, trailing slash): a request path is split once and only the routes of its
+    bucket are compared segment by segment. Templates using a custom :regex part keep the regex matching.
+    """
+
     def __init__(self):
         self.routes = []
+        self.table = {}
+        self.regex_routes = []
 
     def add_route(self, template, controller, **vars):
         if isinstance(controller, basestring):
             controller = load_controller(controller)
+        rank = len(self.routes)
         self.routes.append((re.compile(template_to_regex(template)),
                             controller,
                             vars))
 
+        segments = template_to_segments(template)
+        if segments is None:
+            self.regex_routes.append((rank, self.routes[rank][0], controller, vars))
+        else:
+            key = (len(segments), template.endswith('/'))
+            self.table.setdefault(key, []).append((rank, segments, controller, vars))
+
+    def match(self, path):
+        """
+        Returns (controller, urlvars) of the first route matching the path or (None, None)
+        """
+        rank = len(self.routes)
+        found = None
+
+        segments, trailing = split_path(path)
+        if segments is not None:
+            for rank_r, template_segments, controller, vars in self.table.get((len(segments), trailing), ()):
+                urlvars = match_segments(template_segments, segments)
+                if urlvars is not None:
+                    urlvars.update(vars)
+                    rank = rank_r
+                    found = controller, urlvars
+                    break
+
+        #Note: Regex routes only win over the table if they were added before the matching table route
+        for rank_r, regex, controller, vars in self.regex_routes:
+            if rank_r > rank:
+                break
+            match = regex.match(path)
+            if match:
+                urlvars = match.groupdict()
+                urlvars.update(vars)
+                return controller, urlvars
+
+        if found is None:
+            return None, None
+        return found
+
     def __call__(self, environ, start_response):
         req = Request(environ)
-        for regex, controller, vars in self.routes:
-            match = regex.match(req.path_info)
-            if match:
-                req.urlvars = match.groupdict()
-                req.urlvars.update(vars)
-                return controller(environ, start_response)
-        return exc.HTTPNotFound()(environ, start_response)
+        controller, urlvars = self.match(req.path_info)
+        if controller is None:
+            return exc.HTTPNotFound()(environ, start_response)
+        req.urlvars = urlvars
+        #Note: The controller gets the same request object instead of building a new one
+        environ[REQUEST_KEY] = req
+        db_calls.start_counting(environ)
+        if str(config.OCNI_DEBUG_DB_CALLS) != '1':
+            return controller(environ, start_response)
+
+        def start_counted_response(status, headers, exc_info=None):
+            #Note: The database calls made while a streamed body is read come after the headers, they are only in
+            # the counter of the environ
+            headers.append(('X-PyOCNI-DB-Calls', str(db_calls.get_db_calls(environ))))
+            if exc_info is None:
+                return start_response(status, headers)
+            return start_response(status, headers, exc_info)
+
+        return controller(environ, start_counted_response)
+
+
+def template_to_segments(template):
+    """
+    Compiles a route template into a tuple of (is_variable, name_or_literal) segments.
+    Returns None if the template can not be matched segment by segment (custom regex, mixed segments).
+    """
+    if not template.startswith('/'):
+        return None
+    parts = template[1:].split('/')
+    if parts[-1] == '':
+        parts.pop()
+    segments = list()
+    for part in parts:
+        if '{' not in part and '}' not in part:
+            segments.append((False, part))
+            continue
+        match = var_regex.match(part)
+        if match is None or match.end() != len(part) or match.group(2) is not None:
+            return None
+        segments.append((True, match.group(1)))
+    return tuple(segments)
+
+
+def split_path(path):
+    """
+    Splits a request path once into its segments and tells if it ends with a slash
+    """
+    if not path.startswith('/'):
+        return None, False
+    parts = path[1:].split('/')
+    trailing = parts[-1] == ''
+    if trailing:
+        parts.pop()
+    return parts, trailing
+
+
+def match_segments(template_segments, segments):
+    """
+    Compares a compiled template with the segments of a path. Returns the url variables or None
+    """
+    urlvars = {}
+    for i in range(len(segments)):
+        is_variable, value = template_segments[i]
+        segment = segments[i]
+        if is_variable:
+            if segment == '':
+                return None
+            urlvars[value] = segment
+        elif segment != value:
+            return None
+    return urlvars
+
+
+def get_request(environ):
+    """
+    Returns the request shared by the router or creates one for controllers called outside of a router
+    """
+    req = environ.get(REQUEST_KEY)
+    if req is None:
+        req = Request(environ)
+    return req
 
 
 def controller(func):
     def replacement(environ, start_response):
-        req = Request(environ)
+        req = get_request(environ)
         try:
             resp = func(req, **req.urlvars)
         except exc.HTTPException, e:
@@ -80,7 +208,7 @@ def controller(func):
 
 def rest_controller(cls):
     def replacement(environ, start_response):
-        req = Request(environ)
+        req = get_request(environ)
         try:
             instance = cls(req, **req.urlvars)
             action = req.urlvars.get('action')
@@ -0,0 +1,199 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Columnar filter engine (OCNI_FILTER_ENGINE = columnar or numpy in occi_server.conf): the descriptions are read by batches of
+OCNI_FILTER_BATCH and every attribute path used by the filters is extracted once per batch into a column (the paths
+sharing a prefix share its extraction). A term is then a comparison of a column with a value, a filter the AND of
+its terms and a filter set the OR of its filters. The columnar engine narrows down lists of row numbers term by
+term, the numpy engine (columnar when NumPy is not installed) dictionary encodes the columns into arrays of integer
+codes compared at once. The results are those of occi_Filter.OCCIFilter.matches.
+"""
+
+import itertools
+import pyocni.pyocni_tools.config as config
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# getting the Logger
+logger = config.logger
+
+#Note: Value of a path missing in a description (None is a value that can be filtered on)
+MISSING = object()
+
+#Note: Code of the dict and list values in the NumPy columns
+NO_CODE = -1
+
+
+class ColumnarBatch(object):
+    """
+    A batch of descriptions seen as columns, one per path (built on first use)
+    """
+
+    def __init__(self, descriptions, use_numpy=False):
+        self.use_numpy = use_numpy
+        self.size = len(descriptions)
+        self.columns = {(): descriptions}
+        self.codes = dict()
+
+    def get_column(self, path):
+        """
+        Returns the value of each description at this path (MISSING when it is absent)
+        Args:
+            @param path: path in the description, ('attributes', 'occi', 'compute', 'state')
+        """
+        column = self.columns.get(path)
+        if column is None:
+            key = path[-1]
+            column = [value[key] if type(value) is dict and key in value else MISSING
+                      for value in self.get_column(path[:-1])]
+            self.columns[path] = column
+        return column
+
+    def get_codes(self, path):
+        """
+        Returns the column of this path as a NumPy array of value codes and the code of each value
+        """
+        codes = self.codes.get(path)
+        if codes is None:
+            encoding = dict()
+            #Note: The dict and list values get NO_CODE, no term value is compared to them
+            codes = (numpy.fromiter([encoding.setdefault(value, len(encoding)) if type(value) not in (dict, list)
+                                     else NO_CODE for value in self.get_column(path)], dtype=numpy.int32,
+                count=self.size), encoding)
+            self.codes[path] = codes
+        return codes
+
+    def select(self, filter_set):
+        """
+        Returns the sorted row numbers of the descriptions matching one of the filters
+        """
+        if self.use_numpy is True:
+            mask = numpy.zeros(self.size, dtype=bool)
+            for occi_filter in filter_set.filters:
+                mask |= self.filter_mask(occi_filter)
+            return numpy.flatnonzero(mask).tolist()
+
+        rows = set()
+        for occi_filter in filter_set.filters:
+            rows.update(self.filter_rows(occi_filter))
+        return sorted(rows)
+
+    # ==================================================================================================================
+    #                                                 NumPy masks
+    # ==================================================================================================================
+
+    def filter_mask(self, occi_filter):
+        mask = numpy.ones(self.size, dtype=bool)
+        for path, value in occi_filter.terms:
+            if type(value) is list:
+                mask &= numpy.array([is_match(desc_value, value) for desc_value in self.get_column(path)],
+                    dtype=bool)
+            else:
+                codes, encoding = self.get_codes(path)
+                code = encoding.get(value)
+                if code is None:
+                    return numpy.zeros(self.size, dtype=bool)
+                mask &= codes == code
+        return mask
+
+    # ==================================================================================================================
+    #                                                 Row numbers
+    # ==================================================================================================================
+
+    def filter_rows(self, occi_filter):
+        rows = xrange(self.size)
+        for path, value in occi_filter.terms:
+            column = self.get_column(path)
+            #Note: Each term only looks at the rows matching the previous ones
+            if type(value) is list:
+                rows = [i for i in rows if is_match(column[i], value)]
+            else:
+                rows = [i for i in rows if column[i] == value]
+            if len(rows) == 0:
+                break
+        return rows
+
+
+def is_match(desc_value, value):
+    """
+    Term with a list value (see OCCIFilter.matches)
+    """
+    if type(desc_value) is list:
+        for item in value:
+            if item not in desc_value:
+                return False
+        return True
+    return desc_value == value
+
+
+def iter_batches(descriptions, size=None):
+    if size is None:
+        size = int(config.OCNI_FILTER_BATCH)
+    descriptions = iter(descriptions)
+    while True:
+        batch = list(itertools.islice(descriptions, size))
+        if len(batch) == 0:
+            return
+        yield batch
+
+
+def select_matching(filter_set, descriptions):
+    """
+    Returns the OCCI_IDs of the descriptions matching the filters, in the order they were read
+    Args:
+        @param filter_set: compiled filters (OCCIFilterSet)
+        @param descriptions: iterator on {'OCCI_ID', 'OCCI_Description'}
+    """
+    var = list()
+    for batch in iter_batches(descriptions):
+        columns = ColumnarBatch([desc['OCCI_Description'] for desc in batch], use_numpy())
+        var.extend([batch[i]['OCCI_ID'] for i in columns.select(filter_set)])
+    return var
+
+
+def select_matching_by_type(filter_sets, descriptions):
+    """
+    Returns the OCCI_IDs of the descriptions matching the filters of their Type, in the order they were read
+    Args:
+        @param filter_sets: compiled filters (OCCIFilterSet) by entity Type
+        @param descriptions: iterator on {'OCCI_ID', 'OCCI_Description', 'Type'}
+    """
+    var = list()
+    for batch in iter_batches(descriptions):
+        selected = list()
+        for entity_type in filter_sets.keys():
+            rows = [i for i in xrange(len(batch)) if batch[i]['Type'] == entity_type]
+            columns = ColumnarBatch([batch[i]['OCCI_Description'] for i in rows], use_numpy())
+            selected.extend([rows[i] for i in columns.select(filter_sets[entity_type])])
+        var.extend([batch[i]['OCCI_ID'] for i in sorted(selected)])
+    return var
+
+
+def is_enabled():
+    return str(config.OCNI_FILTER_ENGINE) in ('columnar', 'numpy')
+
+
+def use_numpy():
+    return str(config.OCNI_FILTER_ENGINE) == 'numpy' and numpy is not None
@@ -27,8 +27,15 @@ Created on Feb 25, 2011
 import logging.config
 from configobj import ConfigObj
 from couchdbkit import *
+from pyocni.pyocni_tools.couchdb_Pool import StatsConnectionPool
+import hashlib
 import os
 
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
 
 def get_absolute_path_from_relative_path(filename):
     return os.path.abspath(os.path.join(os.path.dirname(__file__), filename))
@@ -43,12 +50,54 @@ OCNI_IP = occi_config['OCNI_IP']
 OCNI_PORT = occi_config['OCNI_PORT']
 BACKENDS_FILE = occi_config['backends_file']
 DEFAULT_BACKEND = occi_config['default_backend']
+OCNI_PURGE_DB = occi_config.get('OCNI_PURGE_DB', '0')
+OCNI_SERVER_MODE = occi_config.get('OCNI_SERVER_MODE', 'eventlet')
+OCNI_WORKERS = occi_config.get('OCNI_WORKERS', '0')
+OCNI_MAX_REQUESTS = occi_config.get('OCNI_MAX_REQUESTS', '0')
+OCNI_GRACEFUL_TIMEOUT = occi_config.get('OCNI_GRACEFUL_TIMEOUT', '30')
+OCNI_GREEN_IO = occi_config.get('OCNI_GREEN_IO', '0')
+OCNI_MAX_CONNECTIONS = occi_config.get('OCNI_MAX_CONNECTIONS', '1024')
+OCNI_BACKLOG = occi_config.get('OCNI_BACKLOG', '1024')
+OCNI_KEEPALIVE = occi_config.get('OCNI_KEEPALIVE', '1')
+OCNI_SOCKET_TIMEOUT = occi_config.get('OCNI_SOCKET_TIMEOUT', '0')
+OCNI_BACKEND_THREADS = occi_config.get('OCNI_BACKEND_THREADS', '0')
+OCNI_FILTER_ENGINE = occi_config.get('OCNI_FILTER_ENGINE', 'python')
+OCNI_FILTER_BATCH = occi_config.get('OCNI_FILTER_BATCH', '10000')
+OCNI_BACKEND_JOBS = occi_config.get('OCNI_BACKEND_JOBS', '0')
+OCNI_JOB_WORKERS = occi_config.get('OCNI_JOB_WORKERS', '4')
+OCNI_JOB_RETRIES = occi_config.get('OCNI_JOB_RETRIES', '2')
+OCNI_JOB_TIMEOUT = occi_config.get('OCNI_JOB_TIMEOUT', '60')
+OCNI_JOB_PROVIDER_LIMIT = occi_config.get('OCNI_JOB_PROVIDER_LIMIT', '2')
+OCNI_JOB_RESUME_INTERVAL = occi_config.get('OCNI_JOB_RESUME_INTERVAL', '30')
+OCNI_ACTION_PARALLELISM = occi_config.get('OCNI_ACTION_PARALLELISM', '1')
+OCNI_UPDATE_RETRIES = occi_config.get('OCNI_UPDATE_RETRIES', '3')
+OCNI_DEBUG_DB_CALLS = occi_config.get('OCNI_DEBUG_DB_CALLS', '0')
 
 # Loading the DB server configuration file
 DB_config = ConfigObj(get_absolute_path_from_relative_path("../couchdb_server.conf"))
 DB_IP = DB_config['CouchDB_IP']
 DB_PORT = DB_config['CouchDB_PORT']
 PyOCNI_DB = DB_config['CouchDB_PyOCNI']
+DB_WARMUP_VIEWS = DB_config.get('CouchDB_WARMUP_VIEWS', '0')
+DB_POOL_SIZE = DB_config.get('CouchDB_POOL_SIZE', '10')
+DB_POOL_BACKEND = DB_config.get('CouchDB_POOL_BACKEND', 'thread')
+DB_KEYS_CHUNK_SIZE = DB_config.get('CouchDB_KEYS_CHUNK_SIZE', '500')
+DB_PAGE_SIZE = DB_config.get('CouchDB_PAGE_SIZE', '1000')
+DB_BULK_CHUNK_SIZE = DB_config.get('CouchDB_BULK_CHUNK_SIZE', '1000')
+DB_WRITE_BATCH_WINDOW = DB_config.get('CouchDB_WRITE_BATCH_WINDOW', '0')
+DB_WRITE_BATCH_SIZE = DB_config.get('CouchDB_WRITE_BATCH_SIZE', '100')
+DB_INDEXED_ATTRIBUTES = DB_config.get('CouchDB_INDEXED_ATTRIBUTES', 'occi.compute.state')
+if type(DB_INDEXED_ATTRIBUTES) is not list:
+    DB_INDEXED_ATTRIBUTES = [name.strip() for name in DB_INDEXED_ATTRIBUTES.split(',') if name.strip() != '']
+DB_ENGINE = DB_config.get('Storage_ENGINE', 'couchdb')
+DB_JOURNAL = DB_config.get('Storage_JOURNAL', '../pyocni_db.journal')
+if DB_JOURNAL != '':
+    DB_JOURNAL = get_absolute_path_from_relative_path(DB_JOURNAL)
+DB_JOURNAL_SYNC = DB_config.get('Storage_JOURNAL_SYNC', '0')
+DB_SQLITE_FILE = get_absolute_path_from_relative_path(DB_config.get('Storage_SQLITE_FILE', '../pyocni_db.sqlite'))
+if str(OCNI_GREEN_IO) == '1':
+    #Note: Green threads must wait for a free connection without blocking the hub
+    DB_POOL_BACKEND = 'eventlet'
 PyOCNI_Server_Address = 'http://' + str(OCNI_IP) + ':' + str(OCNI_PORT)
 
 # ======================================================================================
@@ -103,6 +152,10 @@ design_doc = {
         "for_register_entities": {
             "map": "(function(doc) { emit (doc.OCCI_ID,doc.OCCI_Location) });"
         },
+        "for_check_locations": {
+            "map": "(function(doc) { if (doc.OCCI_Location != null) emit (doc.OCCI_Location,doc.Type) });",
+            "reduce": "_count"
+        },
         "for_get_entities": {
             "map": "(function(doc) { if ((doc.Type == \"Kind\")||(doc.Type == \"Mixin\"))"
                    "emit (doc.OCCI_Location,[doc.OCCI_ID,doc.Type]) });"
@@ -116,6 +169,17 @@ design_doc = {
                    "{for (elem in doc.OCCI_Description.mixins) "
                    "emit (doc.OCCI_Description.mixins[elem],[doc.OCCI_Location,doc.Type]) }});"
         },
+        "entities_of_kind_paged": {
+            "map": "(function(doc) { if ((doc.Type == \"Resource\")||(doc.Type == \"Link\"))"
+                   "emit ([doc.OCCI_Description.kind,doc.Type,doc.OCCI_Location],null) });",
+            "reduce": "_count"
+        },
+        "entities_of_mixin_paged": {
+            "map": "(function(doc) { if ((doc.Type == \"Resource\")||(doc.Type == \"Link\"))"
+                   "{for (elem in doc.OCCI_Description.mixins) "
+                   "emit ([doc.OCCI_Description.mixins[elem],doc.Type,doc.OCCI_Location],null) }});",
+            "reduce": "_count"
+        },
         "for_get_filtered": {
             "map": "(function(doc) { if ((doc.Type == \"Resource\")||(doc.Type == \"Link\"))"
                    "emit (doc.OCCI_Location,[doc.OCCI_Description,doc.Type]) });"
@@ -155,53 +219,221 @@ design_doc = {
             "map": "(function(doc) { if (doc.Type == \"Kind\")"
                    "emit (doc.OCCI_Location,doc.OCCI_Description.attributes)});"
         },
-        "my_occi_locations":{
-            "map": "(function(doc) {if (doc.OCCI_Location != null)"
-                    "emit (null, doc.OCCI_Location) });"
-
-        },
         "for_delete_entities" :{
             "map": "(function(doc) {if ((doc.Type == \"Resource\")||(doc.Type == \"Link\"))"
                    "emit (doc.OCCI_Location,[doc._id,doc._rev]) });"
+        },
+        "jobs_by_status": {
+            "map": "(function(doc) { if (doc.Type == \"Job\") emit ([doc.Status,doc.Created],null) });"
         }
+    },
+    "filters": {
+        "categories": "(function(doc, req) { return (doc._deleted == true)||(doc.Type == \"Kind\")"
+                      "||(doc.Type == \"Mixin\")||(doc.Type == \"Action\") })"
     }
 
 }
 
+def make_attribute_index_view(attribute_names, kind_id=None):
+    """
+    Makes the view indexing the entities by the value of some attributes:
+    key = [kind or mixin, attribute name, value, Type, OCCI_Location], one row per category of the entity
+    or, for the entities of one kind: key = [attribute name, value, Type, OCCI_Location]
+    Args:
+        @param attribute_names: names of the indexed attributes (occi.compute.state)
+        @param kind_id: OCCI ID of the kind whose entities are indexed (all the kinds and mixins if None)
+    """
+    if kind_id is None:
+        condition = ""
+        categories = "var cats = [doc.OCCI_Description.kind].concat(doc.OCCI_Description.mixins || []); "
+        emit = "for (var k = 0; k < cats.length; k++) emit ([cats[k],names[i],value,doc.Type,doc.OCCI_Location],null) "
+    else:
+        condition = "&&(doc.OCCI_Description.kind == " + json.dumps(kind_id) + ")"
+        categories = ""
+        emit = "emit ([names[i],value,doc.Type,doc.OCCI_Location],null) "
+    return {
+        "map": "(function(doc) { if (((doc.Type == \"Resource\")||(doc.Type == \"Link\"))" + condition + ") {"
+               "var names = " + json.dumps(attribute_names) + "; " + categories +
+               "for (var i = 0; i < names.length; i++) { "
+               "var value = doc.OCCI_Description.attributes; var parts = names[i].split(\".\"); "
+               "for (var j = 0; j < parts.length && value != null; j++) value = value[parts[j]]; "
+               "if (value != null && typeof value != \"object\") " + emit + "}}});"
+    }
+
+design_doc['views']['entities_by_attribute'] = make_attribute_index_view(DB_INDEXED_ATTRIBUTES)
+#Note: What the attribute index views index, for the storage engines that do not run the JavaScript map functions
+design_doc['attribute_indexes'] = {'entities_by_attribute': {'attributes': DB_INDEXED_ATTRIBUTES, 'kind': None}}
+
+
+def make_design_doc_version(doc):
+    """
+    Computes the version of a design document: a hash of its language, views and filters
+    Args:
+        @param doc: design document
+    """
+    content = json.dumps({"language": doc['language'], "views": doc['views'], "filters": doc.get('filters', {})},
+        sort_keys=True)
+    return hashlib.sha1(content).hexdigest()
+
+design_doc['version'] = make_design_doc_version(design_doc)
+
+#Note: Tells if this process has already checked the design document
+design_doc_installed = False
+
+
+def install_design_doc(database, doc=design_doc):
+    """
+    Install the design document or upgrade it if its version changed. Saving a design document
+    gives it a new revision and CouchDB then rebuilds all its view indexes, so it is only saved when needed.
+    Args:
+        @param database: PyOCNI database
+        @param doc: design document to install
+    @return : True if the design document was saved
+    """
+    try:
+        old_doc = database.open_doc(doc['_id'])
+    except ResourceNotFound:
+        old_doc = None
+
+    if old_doc is not None and old_doc.get('version') == doc['version']:
+        logger.debug("===== Install_design_doc : " + doc['_id'] + " is up to date =====")
+        return False
+
+    new_doc = dict(doc)
+    if old_doc is not None:
+        new_doc['_rev'] = old_doc['_rev']
+    database.save_doc(new_doc)
+    logger.info("===== Install_design_doc : " + doc['_id'] + " installed (version " + doc['version'] + ") =====")
+    return True
+
+
+def warm_up_views(database, doc=design_doc):
+    """
+    Query each view of the design document once so that CouchDB builds the indexes before the traffic arrives
+    Args:
+        @param database: PyOCNI database
+        @param doc: design document whose views are warmed up
+    """
+    design_name = doc['_id'].split('/', 1)[1]
+    for view_name in sorted(doc['views'].keys()):
+        database.view('/' + design_name + '/' + view_name, limit=1).all()
+        logger.debug("===== Warm_up_views : " + view_name + " index is built =====")
+
+
+def install_PyOCNI_db(warm_up=None):
+    """
+    Get the database, install or upgrade its design document and optionally build the view indexes.
+    Called once at server startup.
+    Args:
+        @param warm_up: query every view once (defaults to CouchDB_WARMUP_VIEWS)
+    """
+    global design_doc_installed
+
+    if warm_up is None:
+        warm_up = str(DB_WARMUP_VIEWS) == '1'
+    try:
+        database = get_PyOCNI_db()
+        install_design_doc(database)
+        design_doc_installed = True
+        if warm_up is True:
+            warm_up_views(database)
+        return database
+    except Exception as e:
+        logger.error("===== Install_PyOCNI_db : Database install has failed " + e.message + "=====")
+
+
+# ======================================================================================
+#                                   PyOCNI database connection
+# ======================================================================================
+
+#Note: One server (and one pool of keep-alive connections) per worker process
+shared_server = {'pid': None, 'server': None, 'pool': None, 'database': None, 'changes': None}
+
+
+def get_PyOCNI_server():
+    """
+    Returns the CouchDB server object shared by this process. All its requests go through a bounded pool of
+    keep-alive connections (CouchDB_POOL_SIZE, CouchDB_POOL_BACKEND = thread or eventlet).
+    """
+    if shared_server['pid'] != os.getpid():
+        pool = StatsConnectionPool(max_size=int(DB_POOL_SIZE), backend=str(DB_POOL_BACKEND))
+        shared_server['server'] = Server('http://' + str(DB_IP) + ':' + str(DB_PORT), pool=pool,
+            pool_size=int(DB_POOL_SIZE), backend=str(DB_POOL_BACKEND))
+        shared_server['pool'] = pool
+        shared_server['database'] = None
+        shared_server['changes'] = None
+        shared_server['pid'] = os.getpid()
+    return shared_server['server']
+
+
+def get_PyOCNI_changes_db():
+    """
+    Returns the database used to follow the _changes feed. A long poll request holds its connection until a change
+    comes, it goes through a connection of its own so that the CouchDB_POOL_SIZE connections are left to the requests.
+    """
+    get_PyOCNI_server()
+    if shared_server['changes'] is None:
+        pool = StatsConnectionPool(max_size=1, backend=str(DB_POOL_BACKEND))
+        server = Server('http://' + str(DB_IP) + ':' + str(DB_PORT), pool=pool, pool_size=1,
+            backend=str(DB_POOL_BACKEND))
+        shared_server['changes'] = server[PyOCNI_DB]
+    return shared_server['changes']
+
+
+def get_PyOCNI_db_pool_stats():
+    """
+    Returns the statistics of the CouchDB connection pool (in use connections, wait time, reconnects...)
+    """
+    get_PyOCNI_server()
+    return shared_server['pool'].stats()
+
+
 def prepare_PyOCNI_db():
     """
-    Start the server, get the database and add Category design documents to it.
+    Start the server, get the database and make sure the Category design documents is installed.
     """
     try:
-        server = Server('http://' + str(DB_IP) + ':' + str(DB_PORT))
-        database = server.get_or_create_db(PyOCNI_DB)
-        database.save_doc(design_doc, force_update=True)
+        database = get_PyOCNI_db_or_fail()
+        if design_doc_installed is False:
+            install_PyOCNI_db(warm_up=False)
         return database
     except Exception as e:
         logger.error("===== Prepare_PyOCNI_db : Database prepare has failed " + e.message + "=====")
 
 
+def get_PyOCNI_db_or_fail():
+    """
+    Get the database shared by this process (created if needed), raise an error if CouchDB can not be reached.
+    """
+    server = get_PyOCNI_server()
+    if shared_server['database'] is None:
+        shared_server['database'] = server.get_or_create_db(PyOCNI_DB)
+    return shared_server['database']
+
+
 def get_PyOCNI_db():
     """
     Start the server and get the database.
     """
     try:
-        server = Server('http://' + str(DB_IP) + ':' + str(DB_PORT))
-        database = server.get_or_create_db(PyOCNI_DB)
-        return database
+        return get_PyOCNI_db_or_fail()
     except Exception as e:
         logger.error("===== Get_PyOCNI_db : Database prepare has failed " + e.message + "=====")
 
 
 def purge_PyOCNI_db():
+    global design_doc_installed
+
     try:
-        server = Server('http://' + str(DB_IP) + ':' + str(DB_PORT))
+        server = get_PyOCNI_server()
         server.delete_db(PyOCNI_DB)
+        shared_server['database'] = None
+        design_doc_installed = False
     except Exception as e:
         logger.error("===== Purge_PyOCNI_db: Database purge has failed + " + e.message + "=====")
 
 def check_db():
-     s = Server('http://' + str(DB_IP) + ':' + str(DB_PORT))
+     s = get_PyOCNI_server()
      if len(s.info())>0:
         logger.info("===== The DB is ON  =====" + str(s.info()))
         return 1
@@ -0,0 +1,131 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Bilel Msekni
+@contact: bilel.msekni@telecom-sudparis.eu
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import time
+from socketpool import ConnectionPool
+from restkit.conn import Connection
+from pyocni.pyocni_tools.db_Calls import count_db_call
+
+
+class PooledConnection(Connection):
+    """
+    Keep-alive connection to CouchDB that gives its slot back to the pool once, whether it is released
+    for reuse or closed after an error.
+    """
+
+    _leased = False
+
+    def close(self):
+        Connection.close(self)
+        if self._leased is True and self._pool is not None:
+            self._pool.end_lease(self, dropped=True)
+
+
+class StatsConnectionPool(ConnectionPool):
+    """
+    Pool of keep-alive connections shared by all the CouchDB calls of a worker.
+    At most max_size connections are in use at the same time, callers wait for a free slot.
+    Works with the socketpool "thread" and "eventlet" backends.
+    """
+
+    def __init__(self, factory=PooledConnection, max_size=10, backend="thread", **options):
+        ConnectionPool.__init__(self, factory, max_size=max_size, backend=backend, **options)
+        self._slots = self.backend_mod.Semaphore(max_size)
+        self._stats_lock = self.backend_mod.Semaphore(1)
+        self.in_use = 0
+        self.max_in_use = 0
+        self.leases = 0
+        self.connects = 0
+        self.reconnects = 0
+        self.dropped = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self._to_replace = 0
+
+    def get(self, **options):
+        #Step[1]: Wait for a free slot
+        start = time.time()
+        self._slots.acquire()
+        waited = time.time() - start
+
+        #Step[2]: Reuse an idle connection or open a new one
+        try:
+            conn = ConnectionPool.get(self, **options)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._stats_lock:
+            if getattr(conn, '_counted', False) is False:
+                conn._counted = True
+                self.connects += 1
+                if self._to_replace > 0:
+                    self._to_replace -= 1
+                    self.reconnects += 1
+            conn._leased = True
+            self.leases += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+        #Note: A connection is leased for each HTTP request sent to CouchDB
+        count_db_call()
+        return conn
+
+    def release_connection(self, conn):
+        self.end_lease(conn)
+        ConnectionPool.release_connection(self, conn)
+
+    def end_lease(self, conn, dropped=False):
+        """
+        Gives the slot of a connection back (only once per lease)
+        Args:
+            @param conn: connection leased by get()
+            @param dropped: True if the connection was closed instead of being given back
+        """
+        with self._stats_lock:
+            if getattr(conn, '_leased', False) is False:
+                return
+            conn._leased = False
+            self.in_use -= 1
+            if dropped is True:
+                self.dropped += 1
+                self._to_replace += 1
+        self._slots.release()
+
+    def stats(self):
+        """
+        Returns the pool statistics
+        """
+        return {"size": self.max_size,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "idle": self.size,
+                "leases": self.leases,
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+                "dropped": self.dropped,
+                "wait_time": self.wait_time,
+                "max_wait_time": self.max_wait_time}
@@ -0,0 +1,92 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Number of database calls made by a request: a CouchDB HTTP request, or a call of the memory or sqlite engine
+(open_doc, save_doc(s), delete_doc, view). A write left to the write coalescer counts as one call of its request.
+
+The counter of a request is kept in its WSGI environ (ENVIRON_KEY) and bound to the green thread handling the
+request; a thread working for the request (backend call in the eventlet thread pool or in its own thread) is bound to
+it with carry. The calls made while a streamed body is read are counted as well: the counter is complete once the
+body is consumed.
+"""
+
+import threading
+from eventlet import corolocal
+
+#Note: Key of the counter of the request in its WSGI environ
+ENVIRON_KEY = 'pyocni.db_calls'
+
+_current = corolocal.local()
+
+
+class CallCounter(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self):
+        with self._lock:
+            self.count += 1
+
+
+def start_counting(environ):
+    """
+    Starts counting the database calls of the request handled by this green thread
+    """
+    counter = CallCounter()
+    environ[ENVIRON_KEY] = counter
+    _current.counter = counter
+    return counter
+
+
+def count_db_call():
+    counter = getattr(_current, 'counter', None)
+    if counter is not None:
+        counter.add()
+
+
+def get_db_calls(environ):
+    """
+    Returns the number of database calls made so far by the request of this environ
+    """
+    counter = environ.get(ENVIRON_KEY)
+    if counter is None:
+        return 0
+    return counter.count
+
+
+def carry(method):
+    """
+    Returns method counting its database calls as calls of the request handled by the caller, whatever the thread it
+    runs in
+    """
+    counter = getattr(_current, 'counter', None)
+
+    def carried(*args, **kwargs):
+        previous = getattr(_current, 'counter', None)
+        _current.counter = counter
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _current.counter = previous
+
+    return carried
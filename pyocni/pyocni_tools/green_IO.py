@@ -0,0 +1,54 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Cooperative I/O mode: when OCNI_GREEN_IO = 1 in occi_server.conf, the socket, select and time modules are
+green-patched so that the CouchDB calls made by couchdbkit/restkit yield to the other requests instead of blocking
+the eventlet hub.
+
+Note: This module must be imported before anything that imports couchdbkit (pyocni.pyocni_tools.config included).
+"""
+
+import os
+import eventlet
+from configobj import ConfigObj
+
+occi_config = ConfigObj(os.path.abspath(os.path.join(os.path.dirname(__file__), "../occi_server.conf")))
+OCNI_GREEN_IO = occi_config.get('OCNI_GREEN_IO', '0')
+
+
+def is_enabled():
+    return str(OCNI_GREEN_IO) == '1'
+
+
+def patch():
+    """
+    Green-patch the standard modules used by the CouchDB HTTP stack (threads are left untouched)
+    """
+    eventlet.monkey_patch(os=False, socket=True, select=True, time=True, thread=False)
+
+
+def is_patched():
+    return eventlet.patcher.is_monkey_patched('socket')
+
+
+if is_enabled():
+    patch()
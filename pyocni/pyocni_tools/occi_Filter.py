@@ -0,0 +1,139 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import pyocni.pyocni_tools.config as config
+
+# getting the Logger
+logger = config.logger
+
+
+class OCCIFilter(object):
+    """
+    Filter document compiled once into a list of (path, value) terms, a description matches when every term does:
+        {"kind": "...#compute", "attributes": {"occi": {"compute": {"state": "active"}}}}
+    gives the terms (('kind',), "...#compute") and (('attributes', 'occi', 'compute', 'state'), "active").
+    A list value matches a list holding all its items (mixins), any other value must be equal.
+    """
+
+    def __init__(self, filter_doc):
+        self.terms = list()
+        flatten(filter_doc, (), self.terms)
+
+    def matches(self, description):
+        for path, value in self.terms:
+            desc_value = description
+            for key in path:
+                if type(desc_value) is not dict or desc_value.has_key(key) is False:
+                    return False
+                desc_value = desc_value[key]
+
+            if type(value) is list and type(desc_value) is list:
+                for item in value:
+                    if item not in desc_value:
+                        return False
+            elif desc_value != value:
+                return False
+
+        return True
+
+    def get_term(self, path):
+        """
+        Returns the value the filter requires at this path (None if there is no such term)
+        Args:
+            @param path: path in the description, ('kind',)
+        """
+        for term_path, value in self.terms:
+            if term_path == path:
+                return value
+        return None
+
+    def get_attribute_terms(self):
+        """
+        Returns the (attribute name, value) of the terms on a single attribute value (occi.compute.state, "active")
+        """
+        attribute_terms = list()
+        for path, value in self.terms:
+            if path[0] == 'attributes' and len(path) > 1 and type(value) not in (dict, list) and value is not None:
+                attribute_terms.append((".".join(path[1:]), value))
+        return attribute_terms
+
+    def get_index_term(self, indexed_attributes):
+        """
+        Returns (attribute name, value) of a term that can be looked up in the attribute index (None if there is none)
+        Args:
+            @param indexed_attributes: names of the indexed attributes (occi.compute.state)
+        """
+        for name, value in self.get_attribute_terms():
+            if name in indexed_attributes:
+                return name, value
+        return None
+
+
+class OCCIFilterSet(object):
+    """
+    Filter documents of a request, a description matches when one of them does
+    """
+
+    def __init__(self, filter_docs):
+        self.filters = [OCCIFilter(filter_doc) for filter_doc in filter_docs]
+
+    def matches(self, description):
+        for occi_filter in self.filters:
+            if occi_filter.matches(description) is True:
+                return True
+        return False
+
+    def get_index_terms(self, indexed_attributes):
+        """
+        Returns one (attribute name, value) per filter when every filter has an indexed term: the matching
+        descriptions are then all found in the index (None otherwise)
+        Args:
+            @param indexed_attributes: names of the indexed attributes
+        """
+        index_terms = list()
+        for occi_filter in self.filters:
+            index_term = occi_filter.get_index_term(indexed_attributes)
+            if index_term is None:
+                return None
+            if index_term not in index_terms:
+                index_terms.append(index_term)
+        return index_terms
+
+
+def flatten(filter_doc, path, terms):
+    for key in filter_doc.keys():
+        if type(filter_doc[key]) is dict:
+            flatten(filter_doc[key], path + (key,), terms)
+        else:
+            terms.append((path + (key,), filter_doc[key]))
+
+
+def compile_filters(filter_docs):
+    """
+    Compile the filter documents of a request (a filter document or a list of them)
+    Args:
+        @param filter_docs: filter documents
+    """
+    if type(filter_docs) is dict:
+        filter_docs = [filter_docs]
+    return OCCIFilterSet(filter_docs)
@@ -21,7 +21,14 @@ Created on Jun 12, 2011
 @license: Apache License, Version 2.0
 """
 
+import copy
+import base64
 import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.occi_Filter as occi_filter
+try:
+    import simplejson as json
+except ImportError:
+    import json
 
 # getting the Logger
 logger = config.logger
@@ -65,42 +72,8 @@ def update_occi_entity_description(oldData, newData):
         @param oldData: The old OCCI entity description
         @return : Updated data and a boolean (false if all fields are updated, true if there were some un-updated fields)
     """
-
-    #Try to get the keys from occi entity description dictionary
-    oldData_keys = oldData.keys()
-    newData_keys = newData.keys()
-    #    forbidden_keys = ["id","kind"]
-    #    for key in newData_keys:
-    #        try:
-    #            forbidden_keys.index(key)
-    #            if oldData[key] != newData[key]:
-    #                logger.debug("update description : " + key + " is forbidden to change")
-    #                return True,None
-    #        except ValueError:
-    for key in newData_keys:
-        try:
-            oldData_keys.index(key)
-            if key == 'attributes':
-                oldData['attributes'] = complete_occi_description_with_default_attributes(newData['attributes'],
-                    oldData['attributes'])
-
-            else:
-                oldData[key] = newData[key]
-        except ValueError:
-            #Keep the record of the keys(=parts) that couldn't be updated
-            logger.debug("update entity description : " + key + " could not be found")
-            return True, None
-
-    return False, oldData
-
-def update_occi_entity_description(oldData, newData):
-    """
-    Update only a part of the occi entity description
-    Args:
-        @param newData: The new OCCI entity description
-        @param oldData: The old OCCI entity description
-        @return : Updated data and a boolean (false if all fields are updated, true if there were some un-updated fields)
-    """
+    #Note: The old description is left as it is (it is applied again if the entity was changed meanwhile)
+    oldData = copy.deepcopy(oldData)
 
     #Try to get the keys from occi entity description dictionary
     oldData_keys = oldData.keys()
@@ -141,18 +114,13 @@ def get_description_id(occi_description):
 
 
 def is_this_attribute_exist(filter, desc):
-
-    for key in filter.keys():
-        if type(filter[key]) is dict:
-            exists = is_this_attribute_exist(desc[key], filter[key])
-
-        else:
-            if filter[key] == desc[key]:
-                exists = True
-            else:
-                return False
-
-    return exists
+    """
+    Checks if the attributes description holds all the attribute values of the filter
+    Args:
+        @param filter: The filter attributes
+        @param desc: The attributes description
+    """
+    return occi_filter.OCCIFilter(filter).matches(desc)
 
 
 def filter_occi_description(description, filter):
@@ -163,26 +131,8 @@ def filter_occi_description(description, filter):
         @param filter: The filter description
         @return : Updated  a boolean (false if no match, true if there is a match)
     """
-    #Try to get the keys from filter dictionary
-
-    filter_keys = filter.keys()
-    desc_keys = description.keys()
-
-    for key in filter_keys:
-        if key == 'attributes' and description['attributes'] is not None:
-            exists = is_this_attribute_exist(filter['attributes'], description['attributes'])
-            return exists
-        else:
-            try:
-                desc_keys.index(key)
-                if description[key] != filter[key]:
-                    return False
-                else:
-                    return True
-            except ValueError:
-                #Keep the record of the keys(=parts) that couldn't be updated
-                logger.debug("filter description : " + key + " could not be found")
-                return False
+    #Note: Every key of the filter must match, see occi_Filter.OCCIFilter
+    return occi_filter.OCCIFilter(filter).matches(description)
 
 
 def verify_existences_alpha(description, db_data):
@@ -213,26 +163,6 @@ def verify_existences_alpha(description, db_data):
     return True
 
 
-def verify_existences_beta(occi_ids, db_occi_ids_locs):
-    """
-    Verifies the existence of occi_ids in db_occi_ids_locs
-    Args
-        @param occi_ids: OCCI IDs to verify its existence
-        @param db_occi_ids_locs: OCCI IDs and locations contained in the database
-    """
-    var_ids = list()
-    for occi_ids_locs in db_occi_ids_locs:
-        var_ids.append(occi_ids_locs['OCCI_ID'])
-    try:
-        for occi_id in occi_ids:
-            var_ids.index(occi_id)
-    except ValueError as e:
-        logger.debug("exist beta : " + e.message)
-        return False
-
-    return True
-
-
 def verify_existences_delta(actions, db_occi_ids_locs):
     """
     Verifies the existence of occi_ids in db_occi_ids_locs
@@ -257,26 +187,6 @@ def verify_existences_delta(actions, db_occi_ids_locs):
     return True
 
 
-def verify_existences_teta(occi_locs, db_occi_ids_locs):
-    """
-    Verifies the existence of occi_locations in db_occi_ids_locs
-    Args
-        @param occi_locs: OCCI IDs to verify its existence
-        @param db_occi_ids_locs: OCCI IDs and locations contained in the database
-    """
-    var_ids = list()
-    for occi_ids_locs in db_occi_ids_locs:
-        var_ids.append(occi_ids_locs['OCCI_Location'])
-    try:
-        for occi_loc in occi_locs:
-            var_ids.index(occi_loc)
-    except ValueError as e:
-        logger.debug("exist teta : " + e.message)
-        return False
-
-    return True
-
-
 def make_category_location(occi_description):
     """
     Creates the location of the kind or mixin using the occi_description
@@ -415,3 +325,24 @@ def complete_occi_description_with_default_attributes(desc, default_attributes):
             default_attributes[key] = desc[key]
 
     return default_attributes
+
+
+def encode_cursor(key):
+    """
+    Makes the opaque cursor given to the client from the view key of the last entity it received
+    Args:
+        @param key: view key
+    """
+    return base64.urlsafe_b64encode(json.dumps(key))
+
+
+def decode_cursor(cursor):
+    """
+    Get back the view key of a cursor (None if the cursor is not valid)
+    Args:
+        @param cursor: cursor sent by the client
+    """
+    try:
+        return json.loads(base64.urlsafe_b64decode(str(cursor)))
+    except Exception:
+        return None
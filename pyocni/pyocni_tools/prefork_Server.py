@@ -0,0 +1,283 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import os
+import time
+import errno
+import signal
+import eventlet
+from eventlet import wsgi
+from eventlet import hubs
+import pyocni.pyocni_tools.config as config
+
+# getting the Logger
+logger = config.logger
+
+#Note: Seconds between two checks of the retiring workers by the master
+RETIRE_POLL = 0.1
+
+
+class PreforkServer(object):
+    """
+    Pre-fork serving mode: the master opens the listening socket once and forks workers that all accept on it,
+    each one running its own eventlet WSGI loop.
+
+    Signals sent to the master:
+        - SIGHUP: graceful restart, a new generation of workers is started and the old one finishes its requests
+        - SIGTERM/SIGINT: graceful stop
+    A worker asked to exit is killed if it is still running graceful_timeout seconds later.
+    A worker exits (and is replaced) after max_requests requests (0 means never).
+    server_options are given to the eventlet WSGI server of each worker, worker_init is called by each worker before
+    it serves its first request.
+    """
+
+    def __init__(self, app, address, workers=2, max_requests=0, graceful_timeout=30, backlog=50,
+                 server_options=None, worker_init=None):
+        self.app = app
+        self.address = address
+        self.backlog = backlog
+        self.server_options = server_options or dict()
+        self.worker_init = worker_init
+        self.workers = workers
+        self.max_requests = max_requests
+        self.graceful_timeout = graceful_timeout
+        self.sock = None
+        self.children = dict()
+        #Note: Workers asked to exit, by pid: the time they are killed at if they are still running
+        self.retiring = dict()
+        self.draining = False
+        self.running = False
+        self.restarting = False
+
+    # ==================================================================================================================
+    #                                                     Master
+    # ==================================================================================================================
+
+    def run(self):
+        """
+        Listen, fork the workers and keep their number constant until the master is asked to stop.
+        """
+        self.sock = eventlet.listen(self.address, backlog=self.backlog)
+        self.running = True
+
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        signal.signal(signal.SIGHUP, self.handle_restart)
+
+        logger.info("===== PreforkServer : master " + str(os.getpid()) + " starting " + str(self.workers) +
+                    " workers =====")
+        self.spawn_workers()
+
+        while self.running is True:
+            if self.restarting is True:
+                self.restart_workers()
+            #Note: While old workers are retiring, the master wakes up to kill the ones past their deadline
+            self.reap_workers(block=len(self.retiring) == 0)
+            if len(self.retiring) > 0:
+                self.kill_overdue_workers()
+                time.sleep(RETIRE_POLL)
+            if self.running is True:
+                self.spawn_workers()
+
+        self.stop_workers()
+        self.sock.close()
+        logger.info("===== PreforkServer : master " + str(os.getpid()) + " exited =====")
+
+    def handle_stop(self, signum, frame):
+        self.running = False
+
+    def handle_restart(self, signum, frame):
+        self.restarting = True
+
+    def spawn_workers(self):
+        """
+        Fork as many workers as needed to reach the configured number
+        """
+        while len(self.children) < self.workers:
+            pid = os.fork()
+            if pid == 0:
+                self.run_worker()
+            self.children[pid] = time.time()
+
+    def restart_workers(self):
+        """
+        Start a new generation of workers then ask the old one to exit once its requests are served
+        """
+        self.restarting = False
+        old_generation = self.children.keys()
+        self.children = dict()
+        self.spawn_workers()
+        logger.info("===== PreforkServer : graceful restart of workers " + str(old_generation) + " =====")
+        for pid in old_generation:
+            self.retire_worker(pid)
+
+    def retire_worker(self, pid):
+        """
+        Ask a worker to exit once its requests are served, it is killed after graceful_timeout seconds
+        """
+        self.children.pop(pid, None)
+        self.retiring[pid] = time.time() + self.graceful_timeout
+        self.kill_worker(pid, signal.SIGTERM)
+
+    def kill_overdue_workers(self):
+        """
+        Kill the retiring workers still running after their deadline
+        """
+        now = time.time()
+        for pid, deadline in self.retiring.items():
+            if deadline is not None and deadline <= now:
+                logger.warning("===== PreforkServer : worker " + str(pid) + " still running after " +
+                               str(self.graceful_timeout) + "s, killed =====")
+                #Note: The worker is forgotten once it is reaped
+                self.retiring[pid] = None
+                self.kill_worker(pid, signal.SIGKILL)
+
+    def reap_workers(self, block=False):
+        """
+        Forget about the workers that exited
+        Args:
+            @param block: wait until one worker exits (or a signal is received)
+        """
+        while True:
+            try:
+                pid, status = os.waitpid(-1, 0 if block is True else os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.EINTR or e.errno == errno.ECHILD:
+                    if e.errno == errno.ECHILD and block is True:
+                        #Note: Not even an old generation worker is left, sleep until the next signal
+                        time.sleep(1)
+                    return
+                raise
+            if pid == 0:
+                return
+            if self.children.pop(pid, None) is not None:
+                logger.info("===== PreforkServer : worker " + str(pid) + " exited with status " + str(status) +
+                            " =====")
+            elif self.retiring.has_key(pid):
+                del self.retiring[pid]
+                logger.info("===== PreforkServer : retired worker " + str(pid) + " exited with status " +
+                            str(status) + " =====")
+            block = False
+
+    def stop_workers(self):
+        """
+        Ask every worker to exit, kill the ones still running after graceful_timeout seconds (the old generations
+        keep the deadline of their restart)
+        """
+        for pid in self.children.keys():
+            self.retire_worker(pid)
+
+        while len(self.retiring) > 0:
+            self.reap_workers()
+            self.kill_overdue_workers()
+            if len(self.retiring) > 0:
+                time.sleep(RETIRE_POLL)
+
+    def kill_worker(self, pid, sig):
+        try:
+            os.kill(pid, sig)
+        except OSError as e:
+            if e.errno == errno.ESRCH:
+                self.children.pop(pid, None)
+                self.retiring.pop(pid, None)
+            else:
+                raise
+
+    # ==================================================================================================================
+    #                                                     Worker
+    # ==================================================================================================================
+
+    def run_worker(self):
+        """
+        Serve requests until the worker is asked to exit or has served max_requests requests. Never returns.
+        """
+        self.children = dict()
+        self.retiring = dict()
+        self.handled = 0
+        #Note: The hub of the master (its epoll instance) is shared by the forked workers, the listening socket
+        # unregistered by an exiting worker would be unregistered for all of them: each worker gets its own hub
+        hubs.use_hub()
+        self.server_greenlet = eventlet.getcurrent()
+
+        #Note: The master drives the shutdown, Ctrl-C on the terminal must not kill the workers abruptly
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, self.handle_worker_stop)
+        signal.signal(signal.SIGHUP, self.handle_worker_stop)
+
+        server_options = dict(self.server_options)
+        server_options['protocol'] = make_draining_protocol(self, server_options.get('protocol', wsgi.HttpProtocol))
+        status = 0
+        try:
+            if self.worker_init is not None:
+                self.worker_init()
+            wsgi.server(self.sock, self.counting_app, **server_options)
+        except Exception as e:
+            logger.error("===== PreforkServer : worker " + str(os.getpid()) + " failed " + str(e) + " =====")
+            status = 1
+        os._exit(status)
+
+    def counting_app(self, environ, start_response):
+        self.handled += 1
+        if self.handled == self.max_requests:
+            logger.info("===== PreforkServer : worker " + str(os.getpid()) + " recycled after " +
+                        str(self.handled) + " requests =====")
+            self.stop_serving()
+        return self.app(environ, start_response)
+
+    def handle_worker_stop(self, signum, frame):
+        self.stop_serving()
+
+    def stop_serving(self):
+        """
+        Stop accepting connections, the requests in progress are completed before the worker exits: the keep-alive
+        connections are closed after their current request
+        """
+        if self.draining is True:
+            return
+        self.draining = True
+        hubs.get_hub().schedule_call_global(0, self.server_greenlet.throw, SystemExit)
+
+
+def make_draining_protocol(worker, protocol):
+    """
+    HTTP protocol of the eventlet WSGI server closing the connection after each request once the worker drains,
+    whatever the keep-alive setting: an idle keep-alive client can not hold the worker
+    """
+
+    class DrainingProtocol(protocol):
+
+        def parse_request(self):
+            #Note: The server shuts the idle connections down when it stops, not the ones with a request in progress
+            if self.conn_state[2] == wsgi.STATE_IDLE:
+                self.conn_state[2] = wsgi.STATE_REQUEST
+            return protocol.parse_request(self)
+
+        def handle_one_request(self):
+            protocol.handle_one_request(self)
+            if worker.draining is True:
+                self.close_connection = 1
+            elif self.conn_state[2] == wsgi.STATE_REQUEST:
+                self.conn_state[2] = wsgi.STATE_IDLE
+
+    return DrainingProtocol
+
@@ -0,0 +1,79 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Bilel Msekni
+@contact: bilel.msekni@telecom-sudparis.eu
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import os
+import threading
+
+
+class ServiceContainer(object):
+    """
+    Keeps a single instance of each collaborator (adapters, junglers, managers, data bakers, suppliers and
+    post man) per worker process. Dispatchers are still created for each request but get these long-lived
+    collaborators from the container instead of building the whole object graph again.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._services = dict()
+        self._pid = os.getpid()
+
+    def get(self, cls):
+        """
+        Returns the instance of cls living in this worker, creates it on first use
+        Args:
+            @param cls: Class of the collaborator (its constructor must not take arguments)
+        """
+        #Note: A forked worker must not share the instances (and their connections) of its parent
+        if self._pid != os.getpid():
+            self.reset()
+
+        try:
+            return self._services[cls]
+        except KeyError:
+            #Note: The lock is reentrant since building a jungler asks the container for its data bakers
+            with self._lock:
+                if not self._services.has_key(cls):
+                    self._services[cls] = cls()
+                return self._services[cls]
+
+    def reset(self):
+        """
+        Forget all the instances (they will be created again on demand)
+        """
+        self._lock = threading.RLock()
+        self._services = dict()
+        self._pid = os.getpid()
+
+
+container = ServiceContainer()
+
+
+def get_service(cls):
+    """
+    Returns the instance of cls shared by all the requests served by this worker
+    Args:
+        @param cls: Class of the collaborator
+    """
+    return container.get(cls)
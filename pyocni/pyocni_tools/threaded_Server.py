@@ -0,0 +1,98 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import threading
+import SocketServer
+from wsgiref import simple_server
+import pyocni.pyocni_tools.config as config
+
+# getting the Logger
+logger = config.logger
+
+
+class ThreadedServer(object):
+    """
+    Threaded serving mode (OCNI_SERVER_MODE = threaded): the WSGI application is served by the standard library
+    server, each client connection in its own thread with blocking sockets (no eventlet hub). The connections are
+    closed after each request (HTTP/1.0).
+
+    At most max_connections connections are served at the same time, the next ones wait in the backlog.
+    """
+
+    def __init__(self, app, address, max_connections=1024, backlog=50, socket_timeout=None):
+        self.app = app
+        self.address = address
+        self.max_connections = max_connections
+        self.backlog = backlog
+        self.socket_timeout = socket_timeout
+        self.server = None
+
+    def run(self):
+        """
+        Serve requests until the process is interrupted
+        """
+        self.server = ThreadingWSGIServer(self.address, self.max_connections, self.backlog, self.socket_timeout)
+        self.server.set_app(self.app)
+        logger.info("===== ThreadedServer : serving on " + str(self.server.server_address) + " =====")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+        logger.info("===== ThreadedServer : exited =====")
+
+
+class ThreadingWSGIServer(SocketServer.ThreadingMixIn, simple_server.WSGIServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, max_connections, backlog, socket_timeout):
+        self.request_queue_size = backlog
+        self.socket_timeout = socket_timeout
+        self.slots = threading.BoundedSemaphore(max_connections)
+        simple_server.WSGIServer.__init__(self, address, RequestHandler)
+
+    def process_request(self, request, client_address):
+        #Note: The accepting thread waits for a free slot, the next connections stay in the backlog
+        self.slots.acquire()
+        try:
+            SocketServer.ThreadingMixIn.process_request(self, request, client_address)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            SocketServer.ThreadingMixIn.process_request_thread(self, request, client_address)
+        finally:
+            self.slots.release()
+
+
+class RequestHandler(simple_server.WSGIRequestHandler):
+    def setup(self):
+        self.timeout = self.server.socket_timeout
+        simple_server.WSGIRequestHandler.setup(self)
+
+    def log_message(self, format, *args):
+        logger.debug("===== ThreadedServer : " + self.address_string() + " " + (format % args) + " =====")
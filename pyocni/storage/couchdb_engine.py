@@ -0,0 +1,67 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+CouchDB storage engine (Storage_ENGINE = couchdb): the couchdbkit database shared by the process, reached through the
+pool of keep-alive connections of pyocni_tools.config.
+"""
+
+import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import StorageEngine
+
+# getting the Logger
+logger = config.logger
+
+
+class CouchDBEngine(StorageEngine):
+
+    shared = True
+
+    def get_database(self):
+        return config.get_PyOCNI_db()
+
+    def prepare_database(self):
+        return config.prepare_PyOCNI_db()
+
+    def install(self, warm_up=None):
+        return config.install_PyOCNI_db(warm_up)
+
+    def install_design_doc(self, doc):
+        return config.install_design_doc(config.prepare_PyOCNI_db(), doc)
+
+    def purge(self):
+        config.purge_PyOCNI_db()
+
+    def check(self):
+        return config.check_db()
+
+    def get_changes(self, since, feed='normal', timeout=None):
+        params = {'since': since, 'include_docs': 'true', 'filter': 'db_views/categories', 'feed': feed}
+        if timeout is not None:
+            params['timeout'] = timeout
+        if feed == 'longpoll':
+            database = config.get_PyOCNI_changes_db()
+        else:
+            database = config.prepare_PyOCNI_db()
+        return database.res.get('_changes', **params).json_body
+
+    def stats(self):
+        return {"engine": self.__class__.__name__, "pool": config.get_PyOCNI_db_pool_stats()}
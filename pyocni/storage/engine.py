@@ -0,0 +1,182 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Storage engines: the suppliers, the post man and the category registry get their database from the engine selected by
+Storage_ENGINE in couchdb_server.conf (couchdb, memory or sqlite). The database of an engine answers the couchdbkit
+Database calls they make (view, open_doc, save_doc, save_docs, delete_doc, delete_docs, info) and raises the
+couchdbkit exceptions (ResourceNotFound, ResourceConflict, BulkSaveError).
+"""
+
+import sys
+import time
+import threading
+from contextlib import contextmanager
+import pyocni.pyocni_tools.config as config
+from pyocni.pyocni_tools.service_Container import get_service
+import pyocni.storage.memory_views as memory_views
+
+# getting the Logger
+logger = config.logger
+
+#Note: Storage_ENGINE value -> module:class of the engine
+ENGINES = {'couchdb': 'pyocni.storage.couchdb_engine:CouchDBEngine',
+           'memory': 'pyocni.storage.memory_engine:MemoryEngine',
+           'sqlite': 'pyocni.storage.sqlite_engine:SQLiteEngine'}
+
+#Note: Time (s) between two looks at the sequence while a longpoll request on the changes waits
+CHANGES_POLL = 0.1
+
+
+class StorageEngine(object):
+    """
+    Base of the storage engines, one instance per process (see get_engine). An engine gives get_database(), which
+    opens its database once and returns it (None if an error has occurred); the methods below work on that database
+    (memory and SQLite engines) and are replaced by the CouchDB engine, whose database lives in the CouchDB server.
+    """
+
+    #Note: False when the data lives in the process, the pre-fork mode can not be used
+    shared = True
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.database = None
+        self.installed = False
+
+    def prepare_database(self):
+        """
+        Returns the database with the PyOCNI design document installed (None if an error has occurred)
+        """
+        database = self.get_database()
+        if database is not None and self.installed is False:
+            self.install(warm_up=False)
+        return database
+
+    def install(self, warm_up=None):
+        """
+        Install or upgrade the PyOCNI design document, optionally build the view indexes (server startup)
+        Args:
+            @param warm_up: query every view once (defaults to CouchDB_WARMUP_VIEWS)
+        """
+        if warm_up is None:
+            warm_up = str(config.DB_WARMUP_VIEWS) == '1'
+        database = self.get_database()
+        if database is None:
+            return None
+        self.install_design_doc(config.design_doc)
+        self.installed = True
+        if warm_up is True:
+            config.warm_up_views(database)
+        return database
+
+    def install_design_doc(self, doc):
+        """
+        Install a design document or upgrade it if its version changed
+        Args:
+            @param doc: design document
+        @return : True if the design document was saved
+        """
+        return config.install_design_doc(self.get_database(), doc)
+
+    def purge(self):
+        """
+        Delete all the documents
+        """
+        database = self.get_database()
+        if database is not None:
+            database.purge()
+        self.installed = False
+
+    def check(self):
+        """
+        Returns 1 if the database can be used, 0 otherwise
+        """
+        if self.get_database() is None:
+            return 0
+        return 1
+
+    def get_changes(self, since, feed='normal', timeout=None):
+        """
+        Returns the changes of the category documents made after a sequence: {"results": [...], "last_seq": n}
+        (the format of the CouchDB _changes feed, with the documents)
+        Args:
+            @param since: sequence of the last change already seen
+            @param feed: normal (return at once) or longpoll (wait for a change)
+            @param timeout: time (ms) a longpoll request waits for a change
+        """
+        database = self.get_database()
+        return poll_changes(lambda: database.get_changes(since, memory_views.categories_filter), feed, timeout)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context in which the writes are made as one. Only the engines with transactions (SQLite) undo them all if an
+        exception is raised: CouchDB makes them one after the other and the memory engine only keeps the writes of
+        the other threads out, the writes made before the exception are kept. Callers order their writes so that
+        the ones already made leave the documents consistent.
+        """
+        yield
+
+    def stats(self):
+        stats = {"engine": self.__class__.__name__}
+        if self.database is not None:
+            stats.update(self.database.stats())
+        return stats
+
+
+def poll_changes(read_changes, feed='normal', timeout=None):
+    """
+    Changes feed of the engines reading their own change log: a longpoll request reads it again every CHANGES_POLL
+    seconds until a change comes or the timeout expires
+    Args:
+        @param read_changes: function returning the changes ({"results": [...], "last_seq": n})
+        @param feed: normal or longpoll
+        @param timeout: time (ms) a longpoll request waits for a change
+    """
+    changes = read_changes()
+    if feed == 'longpoll':
+        deadline = time.time() + (timeout or 0) / 1000.0
+        while len(changes['results']) == 0 and time.time() < deadline:
+            time.sleep(CHANGES_POLL)
+            changes = read_changes()
+    return changes
+
+
+def load_engine_class(name):
+    """
+    Returns the class of a storage engine
+    Args:
+        @param name: Storage_ENGINE value
+    """
+    module_name, class_name = ENGINES[name].split(':', 1)
+    __import__(module_name)
+    return getattr(sys.modules[module_name], class_name)
+
+
+def get_engine():
+    """
+    Returns the storage engine of this process (the one of Storage_ENGINE, couchdb if it is unknown)
+    """
+    name = str(config.DB_ENGINE)
+    if ENGINES.has_key(name) is False:
+        logger.error("===== Get_engine : Unknown storage engine " + name + ", couchdb is used =====")
+        name = 'couchdb'
+    return get_service(load_engine_class(name))
@@ -0,0 +1,586 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Memory storage engine (Storage_ENGINE = memory): the documents live in the server process. Each view of the design
+documents is mirrored by a Python map function (see memory_views) and kept as a hash index on its keys plus a list
+sorted in the CouchDB collation order for the key ranges; the indexes are built on first use then updated at each
+write. Every write is appended to a journal (Storage_JOURNAL) read again at startup, so the documents survive a
+restart; the journal is compacted when it holds more than COMPACT_RATIO records per document.
+
+The data is not shared between processes: the pre-fork mode (OCNI_WORKERS > 0) can not be used with this engine.
+"""
+
+import os
+import uuid
+import bisect
+import cPickle
+import threading
+from contextlib import contextmanager
+from couchdbkit import ResourceNotFound, ResourceConflict, BulkSaveError
+import pyocni.pyocni_tools.config as config
+from pyocni.pyocni_tools.db_Calls import count_db_call
+import pyocni.storage.memory_views as memory_views
+from pyocni.storage.engine import StorageEngine
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+# getting the Logger
+logger = config.logger
+
+#Note: Value of a query parameter that was not given (None is a key)
+MISSING = object()
+
+#Note: The journal is rewritten when it holds more than COMPACT_RATIO records per document (and COMPACT_MIN records)
+COMPACT_RATIO = 4
+COMPACT_MIN = 10000
+
+#Note: Sorts after any document id in the change log
+MAX_ID = u"\uffff"
+
+IMMUTABLE_TYPES = (type(None), bool, int, long, float, str, unicode)
+
+
+def clone(value):
+    """
+    Copy of a JSON value: the stored documents are never handed out nor taken in without a copy
+    """
+    if type(value) in IMMUTABLE_TYPES:
+        return value
+    return cPickle.loads(cPickle.dumps(value, cPickle.HIGHEST_PROTOCOL))
+
+
+def make_rev(generation):
+    return str(generation) + "-" + uuid.uuid4().hex
+
+
+def rev_generation(rev):
+    if rev is None:
+        return 0
+    return int(str(rev).split('-', 1)[0])
+
+
+class MemoryViewResults(object):
+    """
+    Rows of a view query, answering as couchdbkit ViewResults
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def first(self):
+        if len(self.rows) == 0:
+            return None
+        return self.rows[0]
+
+    def count(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+
+class ViewIndex(object):
+    """
+    Rows of a view: (collation key, doc id, emit number, key, value) entries, sorted and hashed by key
+    """
+
+    def __init__(self, map_function, reduce_function=None):
+        self.map_function = map_function
+        self.reduce_function = reduce_function
+        self.by_doc = dict()
+        self.by_key = dict()
+        self.entries = list()
+        self.collates = list()
+
+    def update(self, doc_id, doc):
+        """
+        Replace the rows of a document (doc is None when it was deleted)
+        """
+        for entry in self.by_doc.pop(doc_id, ()):
+            index = bisect.bisect_left(self.entries, entry[:3])
+            del self.entries[index]
+            del self.collates[index]
+            bucket = self.by_key[entry[0]]
+            bucket.remove(entry)
+            if len(bucket) == 0:
+                del self.by_key[entry[0]]
+
+        if doc is None:
+            return
+        try:
+            rows = self.map_function(doc)
+        except Exception as e:
+            #Note: As CouchDB, a document the map function fails on gets no row
+            logger.warning("===== View_index : " + self.map_function.__name__ + " failed on " + doc_id + ", " +
+                           str(e) + " =====")
+            return
+
+        entries = list()
+        for number in range(len(rows)):
+            key, value = rows[number]
+            entry = (memory_views.collate(key), doc_id, number, key, value)
+            index = bisect.bisect_left(self.entries, entry[:3])
+            self.entries.insert(index, entry)
+            self.collates.insert(index, entry[0])
+            bisect.insort(self.by_key.setdefault(entry[0], list()), entry)
+            entries.append(entry)
+        if len(entries) > 0:
+            self.by_doc[doc_id] = entries
+
+    def query(self, key=MISSING, keys=None, startkey=MISSING, endkey=MISSING, inclusive_end=True):
+        """
+        Returns the entries of a key, of a list of keys or of a key range (all of them by default)
+        """
+        if keys is not None:
+            entries = list()
+            for item in keys:
+                entries.extend(self.by_key.get(memory_views.collate(item), ()))
+            return entries
+
+        if key is not MISSING:
+            return list(self.by_key.get(memory_views.collate(key), ()))
+
+        start = 0
+        end = len(self.entries)
+        if startkey is not MISSING:
+            start = bisect.bisect_left(self.collates, memory_views.collate(startkey))
+        if endkey is not MISSING:
+            if inclusive_end is True:
+                end = bisect.bisect_right(self.collates, memory_views.collate(endkey))
+            else:
+                end = bisect.bisect_left(self.collates, memory_views.collate(endkey))
+        return self.entries[start:end]
+
+
+class Journal(object):
+    """
+    Append-only file of the writes: one JSON record per line, {"seq", "id", "rev", "doc"} or {"seq", "id", "rev",
+    "deleted": true}
+    """
+
+    def __init__(self, path, sync=False):
+        self.path = path
+        self.sync = sync
+        self.file = None
+        self.records = 0
+
+    def read(self):
+        """
+        Returns the records of the journal (a last line cut by a crash is ignored)
+        """
+        records = list()
+        if os.path.exists(self.path) is False:
+            return records
+        journal_file = open(self.path, 'rb')
+        try:
+            for line in journal_file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning("===== Journal : " + self.path + " ends with an incomplete record =====")
+                    break
+        finally:
+            journal_file.close()
+        self.records = len(records)
+        return records
+
+    def append(self, records):
+        if self.file is None:
+            self.file = open(self.path, 'ab')
+        self.file.write("".join([json.dumps(record) + "\n" for record in records]))
+        self.file.flush()
+        if self.sync is True:
+            os.fsync(self.file.fileno())
+        self.records += len(records)
+
+    def rewrite(self, records):
+        """
+        Replace the journal by these records (written in another file first, then renamed)
+        """
+        self.close()
+        new_path = self.path + ".new"
+        new_file = open(new_path, 'wb')
+        try:
+            for record in records:
+                new_file.write(json.dumps(record) + "\n")
+            new_file.flush()
+            os.fsync(new_file.fileno())
+        finally:
+            new_file.close()
+        os.rename(new_path, self.path)
+        self.records = len(records)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class MemoryDatabase(object):
+    """
+    In-process database answering the couchdbkit Database calls made by PyOCNI
+    """
+
+    def __init__(self, name, journal=None):
+        self._lock = threading.RLock()
+        self.name = name
+        self.journal = journal
+        self.docs = dict()
+        self.designs = dict()
+        self.views = dict()
+        self.changes = dict()
+        self.change_log = list()
+        self.seq = 0
+        self.reads = 0
+        self.writes = 0
+        self.view_queries = 0
+
+    # ==================================================================================================================
+    #                                                     Journal
+    # ==================================================================================================================
+
+    def load(self):
+        """
+        Read the documents back from the journal
+        """
+        if self.journal is None:
+            return
+        with self._lock:
+            for record in self.journal.read():
+                self.apply(record)
+            logger.debug("===== Memory_database : " + str(len(self.docs)) + " documents read from " +
+                         self.journal.path + " =====")
+            if self.journal.records > max(COMPACT_MIN, COMPACT_RATIO * (len(self.docs) + len(self.designs))):
+                self.compact()
+
+    def apply(self, record):
+        doc_id = str(record['id'])
+        store = self.designs if doc_id.startswith("_design/") else self.docs
+        if record.get('deleted') is True:
+            store.pop(doc_id, None)
+        else:
+            store[doc_id] = record['doc']
+        self.log_change(doc_id, record['seq'], record['rev'], record.get('deleted') is True)
+        self.seq = max(self.seq, record['seq'])
+
+    def compact(self):
+        """
+        Rewrite the journal with one record per document
+        """
+        if self.journal is None:
+            return
+        with self._lock:
+            records = list()
+            for store in (self.designs, self.docs):
+                for doc_id in store.keys():
+                    records.append({'seq': self.changes[doc_id][0], 'id': doc_id, 'rev': store[doc_id]['_rev'],
+                                    'doc': store[doc_id]})
+            records.sort(key=lambda record: record['seq'])
+            self.journal.rewrite(records)
+        logger.info("===== Memory_database : journal compacted to " + str(len(records)) + " records =====")
+
+    # ==================================================================================================================
+    #                                                     Documents
+    # ==================================================================================================================
+
+    def info(self):
+        return {'db_name': self.name, 'doc_count': len(self.docs), 'update_seq': self.seq}
+
+    def open_doc(self, doc_id, **params):
+        count_db_call()
+        self.reads += 1
+        doc = self.docs.get(doc_id)
+        if doc is None:
+            doc = self.designs.get(doc_id)
+        if doc is None:
+            raise ResourceNotFound("missing")
+        return clone(doc)
+
+    def save_doc(self, doc, force_update=False, **params):
+        """
+        Save a document (doc gets its _id and _rev), raise ResourceConflict if its _rev is not the current one
+        unless force_update
+        """
+        count_db_call()
+        with self._lock:
+            result, record = self.put(doc, check=True)
+            if result.has_key('error') and force_update is True:
+                result, record = self.put(doc, check=False)
+            if result.has_key('error'):
+                raise ResourceConflict(result['reason'])
+            self.commit([record])
+        return {'ok': True, 'id': result['id'], 'rev': result['rev']}
+
+    def save_docs(self, docs, use_uuids=True, all_or_nothing=False, **params):
+        """
+        Save documents at once: without all_or_nothing a document whose _rev is not the current one is not saved and
+        BulkSaveError is raised once the others are (with all_or_nothing the documents are saved as they are)
+        """
+        count_db_call()
+        results = list()
+        records = list()
+        with self._lock:
+            for doc in docs:
+                result, record = self.put(doc, check=all_or_nothing is False)
+                results.append(result)
+                if record is not None:
+                    records.append(record)
+            self.commit(records)
+
+        errors = [result for result in results if result.has_key('error')]
+        if len(errors) > 0:
+            raise BulkSaveError(errors, results)
+        return results
+
+    def delete_doc(self, doc, **params):
+        """
+        Delete a document (its id or the document with its current _rev)
+        """
+        count_db_call()
+        with self._lock:
+            if isinstance(doc, basestring):
+                current = self.docs.get(doc) or self.designs.get(doc)
+                if current is None:
+                    raise ResourceNotFound("missing")
+                doc = {'_id': doc, '_rev': current['_rev']}
+            doc['_deleted'] = True
+            result, record = self.put(doc, check=True)
+            if result.has_key('error'):
+                if result['error'] == "not_found":
+                    raise ResourceNotFound(result['reason'])
+                raise ResourceConflict(result['reason'])
+            self.commit([record])
+        return {'ok': True, 'id': result['id'], 'rev': result['rev']}
+
+    def delete_docs(self, docs, all_or_nothing=False, **params):
+        for doc in docs:
+            doc['_deleted'] = True
+        return self.save_docs(docs, use_uuids=False, all_or_nothing=all_or_nothing)
+
+    def put(self, doc, check):
+        """
+        Write a document in memory and in the indexes (the journal is written by commit)
+        Returns the result ({'id', 'rev'} or {'id', 'error', 'reason'}) and the journal record (None on error)
+        """
+        if doc.get('_id') is None:
+            doc['_id'] = uuid.uuid4().hex
+        doc_id = doc['_id']
+        is_design = doc_id.startswith("_design/")
+        store = self.designs if is_design else self.docs
+        current = store.get(doc_id)
+        deleted = doc.get('_deleted') is True
+
+        if current is None and deleted is True:
+            return {'id': doc_id, 'error': "not_found", 'reason': "missing"}, None
+        if check is True:
+            current_rev = current['_rev'] if current is not None else None
+            if doc.get('_rev') != current_rev:
+                return {'id': doc_id, 'error': "conflict", 'reason': "Document update conflict."}, None
+
+        if current is not None:
+            generation = rev_generation(current['_rev'])
+        else:
+            generation = rev_generation(self.changes.get(doc_id, (0, None, True))[1])
+        rev = make_rev(generation + 1)
+        self.seq += 1
+        self.writes += 1
+
+        if deleted is True:
+            del store[doc_id]
+            stored = None
+            record = {'seq': self.seq, 'id': doc_id, 'rev': rev, 'deleted': True}
+        else:
+            stored = clone(doc)
+            stored['_rev'] = rev
+            store[doc_id] = stored
+            record = {'seq': self.seq, 'id': doc_id, 'rev': rev, 'doc': stored}
+        self.log_change(doc_id, self.seq, rev, deleted)
+
+        if is_design is True:
+            #Note: The views of a modified design document are built again on their next query
+            for name in [name for name in self.views.keys() if name[0] == doc_id]:
+                del self.views[name]
+        else:
+            for index in self.views.values():
+                index.update(doc_id, stored)
+
+        doc['_rev'] = rev
+        return {'id': doc_id, 'rev': rev}, record
+
+    def log_change(self, doc_id, seq, rev, deleted):
+        self.changes[doc_id] = (seq, rev, deleted)
+        self.change_log.append((seq, doc_id))
+        #Note: The log keeps the older changes of a document until it holds twice as many entries as documents
+        if len(self.change_log) > 2 * len(self.changes) + COMPACT_MIN:
+            self.change_log = sorted([(self.changes[item][0], item) for item in self.changes.keys()])
+
+    def commit(self, records):
+        if self.journal is not None and len(records) > 0:
+            self.journal.append(records)
+
+    # ==================================================================================================================
+    #                                                       Views
+    # ==================================================================================================================
+
+    def get_view_index(self, view_name):
+        """
+        Returns the index of a view (built from all the documents on first use)
+        Args:
+            @param view_name: /design/view
+        """
+        design_name, name = view_name.strip('/').split('/', 1)
+        design_id = "_design/" + design_name
+        index = self.views.get((design_id, name))
+        if index is not None:
+            return index
+
+        design_doc = self.designs.get(design_id)
+        if design_doc is None or design_doc['views'].has_key(name) is False:
+            raise ResourceNotFound("missing view " + view_name)
+        map_function = memory_views.get_map_function(design_doc, name)
+        if map_function is None:
+            raise ResourceNotFound("no Python mirror of the view " + view_name)
+
+        index = ViewIndex(map_function, design_doc['views'][name].get('reduce'))
+        for doc_id in self.docs.keys():
+            index.update(doc_id, self.docs[doc_id])
+        self.views[(design_id, name)] = index
+        return index
+
+    def view(self, view_name, key=MISSING, keys=None, startkey=MISSING, endkey=MISSING, skip=0, limit=None,
+             reduce=True, include_docs=False, inclusive_end=True, **params):
+        """
+        Query a view (the parameters of couchdbkit Database.view); the _count reduce is the only one supported
+        """
+        count_db_call()
+        self.view_queries += 1
+        with self._lock:
+            index = self.get_view_index(view_name)
+            entries = index.query(key, keys, startkey, endkey, inclusive_end)
+            if include_docs is True:
+                docs = [self.docs.get(entry[1]) for entry in entries]
+
+        if index.reduce_function is not None and reduce is not False:
+            if len(entries) == 0:
+                return MemoryViewResults([])
+            return MemoryViewResults([{'key': None, 'value': len(entries)}])
+
+        end = None if limit is None else skip + int(limit)
+        rows = list()
+        for i in range(len(entries))[skip:end]:
+            row = {'id': entries[i][1], 'key': clone(entries[i][3]), 'value': clone(entries[i][4])}
+            if include_docs is True:
+                row['doc'] = clone(docs[i])
+            rows.append(row)
+        return MemoryViewResults(rows)
+
+    # ==================================================================================================================
+    #                                                      Changes
+    # ==================================================================================================================
+
+    def get_changes(self, since, filter_function=None):
+        """
+        Returns the last change of each document changed after a sequence, in the format of the _changes feed
+        Args:
+            @param since: sequence of the last change already seen
+            @param filter_function: function selecting the documents (memory_views.categories_filter)
+        """
+        results = list()
+        with self._lock:
+            last_seq = self.seq
+            if since >= last_seq:
+                return {'results': results, 'last_seq': last_seq}
+            start = bisect.bisect_right(self.change_log, (since, MAX_ID))
+            for logged_seq, doc_id in self.change_log[start:]:
+                seq, rev, deleted = self.changes[doc_id]
+                #Note: Only the last change of a document is reported
+                if seq != logged_seq:
+                    continue
+                doc = {'_id': doc_id, '_rev': rev, '_deleted': True} if deleted else self.docs.get(doc_id)
+                if doc is None or (filter_function is not None and filter_function(doc) is False):
+                    continue
+                change = {'seq': seq, 'id': doc_id, 'changes': [{'rev': rev}], 'doc': clone(doc)}
+                if deleted is True:
+                    change['deleted'] = True
+                results.append(change)
+        return {'results': results, 'last_seq': last_seq}
+
+    def purge(self):
+        """
+        Delete all the documents, the design documents and the journal
+        """
+        with self._lock:
+            self.docs = dict()
+            self.designs = dict()
+            self.views = dict()
+            self.changes = dict()
+            self.change_log = list()
+            if self.journal is not None:
+                self.journal.rewrite([])
+
+    def stats(self):
+        return {"docs": len(self.docs),
+                "views": len(self.views),
+                "seq": self.seq,
+                "reads": self.reads,
+                "writes": self.writes,
+                "view_queries": self.view_queries,
+                "journal_records": self.journal.records if self.journal is not None else 0}
+
+
+class MemoryEngine(StorageEngine):
+
+    shared = False
+
+    def get_database(self):
+        with self._lock:
+            if self.database is None:
+                journal = None
+                if str(config.DB_JOURNAL) != '':
+                    journal = Journal(config.DB_JOURNAL, str(config.DB_JOURNAL_SYNC) == '1')
+                database = MemoryDatabase(config.PyOCNI_DB, journal)
+                try:
+                    database.load()
+                except Exception as e:
+                    logger.error("===== Memory_engine : the journal could not be read, " + str(e) + " =====")
+                    return None
+                self.database = database
+            return self.database
+
+    @contextmanager
+    def transaction(self):
+        #Note: The writes are isolated from those of the other threads, they are not undone on error (see
+        # StorageEngine.transaction)
+        with self.get_database()._lock:
+            yield
@@ -0,0 +1,284 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Python mirrors of the views of the PyOCNI design documents, used by the memory storage engine: a map function takes
+a document and returns the (key, value) rows the JavaScript map function of the view emits. The keys are ordered
+as CouchDB collates them (see collate).
+"""
+
+#Note: Documents seen by the entity views and by the category views
+ENTITY_TYPES = ("Resource", "Link")
+CATEGORY_TYPES = ("Kind", "Mixin", "Action")
+
+
+def collate(key):
+    """
+    Returns a sort key ordering the view keys as CouchDB does: null, false, true, numbers, strings, arrays then
+    objects (the strings are compared by code point instead of the ICU collation)
+    Args:
+        @param key: view key (JSON value)
+    """
+    if key is None:
+        return (0,)
+    if key is False:
+        return (1, 0)
+    if key is True:
+        return (1, 1)
+    if isinstance(key, (int, long, float)):
+        return (2, key)
+    if isinstance(key, str):
+        return (3, key.decode('utf-8'))
+    if isinstance(key, unicode):
+        return (3, key)
+    if isinstance(key, (list, tuple)):
+        return (4, tuple([collate(item) for item in key]))
+    return (5, tuple([(collate(name), collate(value)) for name, value in key.items()]))
+
+
+def is_entity(doc):
+    return doc.get('Type') in ENTITY_TYPES
+
+
+def is_category(doc):
+    return doc.get('Type') in CATEGORY_TYPES
+
+
+def get_description(doc):
+    return doc.get('OCCI_Description') or dict()
+
+
+def get_mixins(doc):
+    mixins = get_description(doc).get('mixins')
+    if type(mixins) is not list:
+        return []
+    return mixins
+
+
+# ======================================================================================================================
+#                                                 db_views
+# ======================================================================================================================
+
+def for_get_categories(doc):
+    if is_category(doc):
+        return [(doc['Type'], doc.get('OCCI_Description'))]
+    return []
+
+
+def for_update_categories(doc):
+    if is_category(doc):
+        return [(doc.get('OCCI_ID'), doc)]
+    return []
+
+
+def for_associate_mixin(doc):
+    if is_entity(doc):
+        return [([doc.get('OCCI_Location')], doc)]
+    return []
+
+
+def for_delete_categories(doc):
+    if is_category(doc):
+        return [(doc['_id'], [doc['_rev'], doc.get('OCCI_ID')])]
+    return []
+
+
+def for_register_categories(doc):
+    if is_category(doc):
+        return [(doc.get('OCCI_ID'), doc.get('OCCI_Location'))]
+    return []
+
+
+def for_register_entities(doc):
+    return [(doc.get('OCCI_ID'), doc.get('OCCI_Location'))]
+
+
+def for_check_locations(doc):
+    if doc.get('OCCI_Location') is not None:
+        return [(doc['OCCI_Location'], doc.get('Type'))]
+    return []
+
+
+def for_get_entities(doc):
+    if doc.get('Type') in ("Kind", "Mixin"):
+        return [(doc.get('OCCI_Location'), [doc.get('OCCI_ID'), doc['Type']])]
+    return []
+
+
+def entities_of_kind(doc):
+    if is_entity(doc):
+        return [(get_description(doc).get('kind'), [doc.get('OCCI_Location'), doc['Type']])]
+    return []
+
+
+def entities_of_mixin(doc):
+    if is_entity(doc):
+        return [(mixin, [doc.get('OCCI_Location'), doc['Type']]) for mixin in get_mixins(doc)]
+    return []
+
+
+def entities_of_kind_paged(doc):
+    if is_entity(doc):
+        return [([get_description(doc).get('kind'), doc['Type'], doc.get('OCCI_Location')], None)]
+    return []
+
+
+def entities_of_mixin_paged(doc):
+    if is_entity(doc):
+        return [([mixin, doc['Type'], doc.get('OCCI_Location')], None) for mixin in get_mixins(doc)]
+    return []
+
+
+def for_get_filtered(doc):
+    if is_entity(doc):
+        return [(doc.get('OCCI_Location'), [doc.get('OCCI_Description'), doc['Type']])]
+    return []
+
+
+def my_mixins(doc):
+    if doc.get('Type') == "Mixin":
+        return [(doc.get('OCCI_Location'), doc.get('OCCI_ID'))]
+    return []
+
+
+def my_resources(doc):
+    if is_entity(doc):
+        return [(doc.get('OCCI_Location'), [doc['Type'], doc.get('OCCI_Description')])]
+    return []
+
+
+def for_update_entities(doc):
+    if is_entity(doc):
+        return [(doc.get('OCCI_Location'), doc)]
+    return []
+
+
+def entities_of_mixin_v2(doc):
+    if is_entity(doc):
+        return [(mixin, doc) for mixin in get_mixins(doc)]
+    return []
+
+
+def for_trigger_action(doc):
+    if is_entity(doc):
+        return [(doc.get('OCCI_Location'), [get_description(doc).get('kind'), doc.get('OCCI_Description')])]
+    return []
+
+
+def actions_of_kind_mix(doc):
+    if doc.get('Type') in ("Kind", "Mixin"):
+        description = get_description(doc)
+        doc_id = description.get('scheme', "") + description.get('term', "")
+        return [([action, doc_id], doc.get('Provider')) for action in description.get('actions') or []]
+    return []
+
+
+def my_providers(doc):
+    if doc.get('Type') == "Kind":
+        return [(doc.get('OCCI_ID'), doc.get('Provider'))]
+    return []
+
+
+def get_default_attributes_from_kind(doc):
+    if doc.get('Type') == "Kind":
+        return [(doc.get('OCCI_Location'), get_description(doc).get('attributes'))]
+    return []
+
+
+def for_delete_entities(doc):
+    if is_entity(doc):
+        return [(doc.get('OCCI_Location'), [doc['_id'], doc['_rev']])]
+    return []
+
+
+def jobs_by_status(doc):
+    if doc.get('Type') == "Job":
+        return [([doc.get('Status'), doc.get('Created')], None)]
+    return []
+
+
+#Note: The views of the _design/db_views document (config.design_doc), by name
+DB_VIEWS = dict((function.__name__, function) for function in (
+    for_get_categories, for_update_categories, for_associate_mixin, for_delete_categories, for_register_categories,
+    for_register_entities, for_check_locations, for_get_entities, entities_of_kind, entities_of_mixin,
+    entities_of_kind_paged, entities_of_mixin_paged, for_get_filtered, my_mixins, my_resources, for_update_entities,
+    entities_of_mixin_v2, for_trigger_action, actions_of_kind_mix, my_providers, get_default_attributes_from_kind,
+    for_delete_entities, jobs_by_status))
+
+
+# ======================================================================================================================
+#                                             Attribute indexes
+# ======================================================================================================================
+
+def make_attribute_index_map(attribute_names, kind_id=None):
+    """
+    Mirror of config.make_attribute_index_view
+    Args:
+        @param attribute_names: names of the indexed attributes (occi.compute.state)
+        @param kind_id: OCCI ID of the kind whose entities are indexed (all the kinds and mixins if None)
+    """
+    paths = [(name, name.split('.')) for name in attribute_names]
+
+    def attribute_index(doc):
+        if is_entity(doc) is False:
+            return []
+        description = get_description(doc)
+        if kind_id is not None and description.get('kind') != kind_id:
+            return []
+        rows = list()
+        for name, parts in paths:
+            value = description.get('attributes')
+            for part in parts:
+                value = value.get(part) if type(value) is dict else None
+                if value is None:
+                    break
+            if value is None or type(value) in (dict, list):
+                continue
+            if kind_id is None:
+                for category in [description.get('kind')] + get_mixins(doc):
+                    rows.append(([category, name, value, doc['Type'], doc.get('OCCI_Location')], None))
+            else:
+                rows.append(([name, value, doc['Type'], doc.get('OCCI_Location')], None))
+        return rows
+
+    return attribute_index
+
+
+def get_map_function(design_doc, view_name):
+    """
+    Returns the map function mirroring a view of a design document (None if there is none)
+    Args:
+        @param design_doc: design document
+        @param view_name: name of the view
+    """
+    index = design_doc.get('attribute_indexes', {}).get(view_name)
+    if index is not None:
+        return make_attribute_index_map(index['attributes'], index.get('kind'))
+    if design_doc['_id'] == "_design/db_views":
+        return DB_VIEWS.get(view_name)
+    return None
+
+
+def categories_filter(doc):
+    """
+    Mirror of the db_views/categories filter of the _changes feed
+    """
+    return doc.get('_deleted') is True or is_category(doc)
@@ -0,0 +1,824 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+SQLite storage engine (Storage_ENGINE = sqlite): the documents are kept in the SQLite file Storage_SQLITE_FILE, which
+the worker processes share. The entities and the categories are rows of the documents table whose OCCI columns (Type,
+OCCI_ID, OCCI_Location, kind) are indexed, the mixins of the entities are rows of the memberships table and each
+document is kept as JSON, with an expression index on every attribute an attribute index view declares.
+
+The views of db_views are answered by indexed queries (see VIEW_PLANS) returning the rows the CouchDB view would
+return, in the same order; a view without a query plan is computed by its Python mirror (see memory_views). A
+multi-document save is one transaction.
+"""
+
+import re
+import uuid
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from couchdbkit import ResourceNotFound, ResourceConflict, BulkSaveError
+import pyocni.pyocni_tools.config as config
+from pyocni.pyocni_tools.db_Calls import count_db_call
+import pyocni.storage.memory_views as memory_views
+from pyocni.storage.engine import StorageEngine
+from pyocni.storage.memory_engine import MISSING, ViewIndex, MemoryViewResults, make_rev, rev_generation
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+# getting the Logger
+logger = config.logger
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS documents (id TEXT PRIMARY KEY, rev TEXT NOT NULL, type TEXT, occi_id TEXT, "
+    "occi_location TEXT, kind TEXT, body TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS documents_by_type ON documents (type, occi_location)",
+    "CREATE INDEX IF NOT EXISTS documents_by_occi_id ON documents (occi_id)",
+    "CREATE INDEX IF NOT EXISTS documents_by_location ON documents (occi_location)",
+    "CREATE INDEX IF NOT EXISTS documents_by_kind ON documents (kind, type, occi_location)",
+    "CREATE TABLE IF NOT EXISTS memberships (doc_id TEXT NOT NULL, position INTEGER NOT NULL, mixin TEXT, type TEXT, "
+    "occi_location TEXT, PRIMARY KEY (doc_id, position))",
+    "CREATE INDEX IF NOT EXISTS memberships_by_mixin ON memberships (mixin, type, occi_location)",
+    "CREATE TABLE IF NOT EXISTS design_docs (id TEXT PRIMARY KEY, rev TEXT NOT NULL, body TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS changes (id TEXT PRIMARY KEY, seq INTEGER NOT NULL, rev TEXT NOT NULL, "
+    "deleted INTEGER NOT NULL)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS changes_by_seq ON changes (seq)"]
+
+#Note: Prefix of the expression indexes on the attributes
+ATTRIBUTE_INDEX_PREFIX = "attribute_"
+
+#Note: Attribute names that can be written in a JSON path of an expression index
+ATTRIBUTE_NAME = re.compile(r"^[A-Za-z0-9_\-]+(\.[A-Za-z0-9_\-]+)*$")
+
+SCALAR_TYPES = (type(None), bool, int, long, float, str, unicode)
+
+#Note: Time (s) a write waits for the lock another process holds on the database file
+BUSY_TIMEOUT = 30
+
+
+# ======================================================================================================================
+#                                                 Query plans
+# ======================================================================================================================
+
+class Branch(object):
+    """
+    Rows of a view read by one SELECT: the documents (d) or the memberships joined to their documents (m, d) the
+    source clause selects, keyed by the columns
+    """
+
+    def __init__(self, source, columns, params=()):
+        self.source = source
+        self.columns = columns
+        self.params = list(params)
+
+
+class ViewPlan(object):
+    """
+    Indexed query answering a view
+    Args:
+        @param branches: SELECTs whose rows are the rows of the view (UNION ALL)
+        @param value: function (row, document) returning the value of a row (None for a null value)
+        @param needs_doc: the value function reads the JSON document
+        @param array: the key is the list of the columns (a single column key otherwise)
+    """
+
+    def __init__(self, branches, value=None, needs_doc=False, array=False):
+        self.branches = branches
+        self.value = value
+        self.needs_doc = needs_doc
+        self.array = array
+
+
+ENTITIES = "documents d WHERE d.type IN ('Resource', 'Link')"
+CATEGORIES = "documents d WHERE d.type IN ('Kind', 'Mixin', 'Action')"
+KINDS_AND_MIXINS = "documents d WHERE d.type IN ('Kind', 'Mixin')"
+KINDS = "documents d WHERE d.type = 'Kind'"
+MIXINS = "documents d WHERE d.type = 'Mixin'"
+JOBS = "documents d WHERE d.type = 'Job'"
+LOCATED = "documents d WHERE d.occi_location IS NOT NULL"
+ALL_DOCUMENTS = "documents d WHERE 1"
+MEMBERSHIPS = "memberships m JOIN documents d ON d.id = m.doc_id WHERE 1"
+
+
+def plan(source, columns, value=None, needs_doc=False, array=False):
+    return ViewPlan([Branch(source, columns)], value, needs_doc, array)
+
+
+def get_description(doc):
+    return doc.get('OCCI_Description') or dict()
+
+
+#Note: The query plan of each view of db_views (config.design_doc), the rows and values of memory_views
+VIEW_PLANS = {
+    'for_get_categories': plan(CATEGORIES, ['d.type'], lambda row, doc: doc.get('OCCI_Description'), True),
+    'for_update_categories': plan(CATEGORIES, ['d.occi_id'], lambda row, doc: doc, True),
+    'for_associate_mixin': plan(ENTITIES, ['d.occi_location'], lambda row, doc: doc, True, True),
+    'for_delete_categories': plan(CATEGORIES, ['d.id'], lambda row, doc: [row['rev'], row['occi_id']]),
+    'for_register_categories': plan(CATEGORIES, ['d.occi_id'], lambda row, doc: row['occi_location']),
+    'for_register_entities': plan(ALL_DOCUMENTS, ['d.occi_id'], lambda row, doc: row['occi_location']),
+    'for_check_locations': plan(LOCATED, ['d.occi_location'], lambda row, doc: row['type']),
+    'for_get_entities': plan(KINDS_AND_MIXINS, ['d.occi_location'], lambda row, doc: [row['occi_id'], row['type']]),
+    'entities_of_kind': plan(ENTITIES, ['d.kind'], lambda row, doc: [row['occi_location'], row['type']]),
+    'entities_of_mixin': plan(MEMBERSHIPS, ['m.mixin'], lambda row, doc: [row['occi_location'], row['type']]),
+    'entities_of_kind_paged': plan(ENTITIES, ['d.kind', 'd.type', 'd.occi_location'], array=True),
+    'entities_of_mixin_paged': plan(MEMBERSHIPS, ['m.mixin', 'm.type', 'm.occi_location'], array=True),
+    'for_get_filtered': plan(ENTITIES, ['d.occi_location'],
+        lambda row, doc: [doc.get('OCCI_Description'), row['type']], True),
+    'my_mixins': plan(MIXINS, ['d.occi_location'], lambda row, doc: row['occi_id']),
+    'my_resources': plan(ENTITIES, ['d.occi_location'],
+        lambda row, doc: [row['type'], doc.get('OCCI_Description')], True),
+    'for_update_entities': plan(ENTITIES, ['d.occi_location'], lambda row, doc: doc, True),
+    'entities_of_mixin_v2': plan(MEMBERSHIPS, ['m.mixin'], lambda row, doc: doc, True),
+    'for_trigger_action': plan(ENTITIES, ['d.occi_location'],
+        lambda row, doc: [get_description(doc).get('kind'), doc.get('OCCI_Description')], True),
+    'my_providers': plan(KINDS, ['d.occi_id'], lambda row, doc: doc.get('Provider'), True),
+    'get_default_attributes_from_kind': plan(KINDS, ['d.occi_location'],
+        lambda row, doc: get_description(doc).get('attributes'), True),
+    'for_delete_entities': plan(ENTITIES, ['d.occi_location'], lambda row, doc: [row['id'], row['rev']]),
+    'jobs_by_status': plan(JOBS, ["json_extract(d.body, '$.Status')", "json_extract(d.body, '$.Created')"],
+        array=True)}
+
+#Note: Documents read by the views computed by their Python mirror (all the documents if not listed)
+SCAN_SOURCES = {'actions_of_kind_mix': KINDS_AND_MIXINS}
+
+
+def attribute_path(name):
+    """
+    JSON path of an attribute in a document (None if the name can not be written in a path)
+    Args:
+        @param name: attribute name (occi.compute.state)
+    """
+    if ATTRIBUTE_NAME.match(name) is None:
+        return None
+    return "$.OCCI_Description.attributes" + "".join(['."' + part + '"' for part in name.split('.')])
+
+
+def attribute_expression(name, table="d."):
+    return "json_extract(" + table + "body, '" + attribute_path(name) + "')"
+
+
+def attribute_index_name(name):
+    return ATTRIBUTE_INDEX_PREFIX + hashlib.sha1(name).hexdigest()[:16]
+
+
+def make_attribute_index_plan(attribute_names, kind_id=None):
+    """
+    Query plan of an attribute index view (see memory_views.make_attribute_index_map): one SELECT per attribute on
+    the expression index of the attribute, plus one on the memberships for the mixins when all the categories are
+    indexed (None if an attribute can not be indexed)
+    """
+    branches = list()
+    for name in attribute_names:
+        if attribute_path(name) is None:
+            return None
+        value = attribute_expression(name)
+        #Note: As the map function, the null, object and array values are not indexed
+        condition = " AND json_type(d.body, '" + attribute_path(name) + "') NOT IN ('null', 'object', 'array')"
+        literal = "'" + name + "'"
+        if kind_id is None:
+            branches.append(Branch(ENTITIES + condition, ['d.kind', literal, value, 'd.type', 'd.occi_location']))
+            branches.append(Branch(MEMBERSHIPS + condition,
+                ['m.mixin', literal, value, 'm.type', 'm.occi_location']))
+        else:
+            branches.append(Branch(ENTITIES + condition + " AND d.kind = ?",
+                [literal, value, 'd.type', 'd.occi_location'], [kind_id]))
+    return ViewPlan(branches, array=True)
+
+
+def get_view_plan(design_doc, view_name):
+    """
+    Returns the query plan of a view of a design document (None if the view is computed by its Python mirror)
+    """
+    index = design_doc.get('attribute_indexes', {}).get(view_name)
+    if index is not None:
+        return make_attribute_index_plan(index['attributes'], index.get('kind'))
+    if design_doc['_id'] == "_design/db_views":
+        return VIEW_PLANS.get(view_name)
+    return None
+
+
+# ======================================================================================================================
+#                                                 Key conditions
+# ======================================================================================================================
+
+#Note: A condition is True, False or (SQL, parameters)
+
+def sql_and(*conditions):
+    parts = list()
+    params = list()
+    for condition in conditions:
+        if condition is False:
+            return False
+        if condition is not True:
+            parts.append(condition[0])
+            params.extend(condition[1])
+    if len(parts) == 0:
+        return True
+    return "(" + " AND ".join(parts) + ")", params
+
+
+def sql_or(*conditions):
+    parts = list()
+    params = list()
+    for condition in conditions:
+        if condition is True:
+            return True
+        if condition is not False:
+            parts.append(condition[0])
+            params.extend(condition[1])
+    if len(parts) == 0:
+        return False
+    return "(" + " OR ".join(parts) + ")", params
+
+
+def is_scalar(value):
+    return type(value) in SCALAR_TYPES
+
+
+def equal_condition(column, value):
+    if value is None:
+        return column + " IS NULL", []
+    if is_scalar(value) is False:
+        #Note: The columns hold scalars only
+        return False
+    return column + " = ?", [value]
+
+
+def bound_condition(columns, bound, lower, inclusive, null_below=True):
+    """
+    Condition on the columns of a key to be after (lower) or before a bound, in the CouchDB collation order: null,
+    numbers, strings then arrays and objects, a shorter array before a longer one it starts
+    Args:
+        @param columns: SQL expressions of the components of the key
+        @param bound: components of the bound
+        @param lower: the key must be after the bound (before it otherwise)
+        @param inclusive: the key may be equal to the bound
+        @param null_below: a null first component may be before the bound (False when the lower bound excludes it)
+    """
+
+    def compare(i):
+        if i == len(bound):
+            if i == len(columns):
+                return lower or inclusive
+            #Note: The key is longer than the bound, it comes after it
+            return lower
+        if i == len(columns):
+            return not lower
+
+        value = bound[i]
+        column = columns[i]
+        if is_scalar(value) is False:
+            #Note: An array or an object comes after any scalar
+            return not lower
+
+        rest = compare(i + 1)
+        if value is None:
+            if lower is True:
+                return sql_or((column + " IS NOT NULL", []), sql_and((column + " IS NULL", []), rest))
+            return sql_and((column + " IS NULL", []), rest)
+
+        strict = column + (" > ?" if lower is True else " < ?")
+        if rest is True:
+            condition = (column + (" >= ?" if lower is True else " <= ?"), [value])
+        elif rest is False:
+            condition = (strict, [value])
+        else:
+            condition = sql_or((strict, [value]), sql_and((column + " = ?", [value]), rest))
+        if lower is False and (i > 0 or null_below is True):
+            condition = sql_or((column + " IS NULL", []), condition)
+        return condition
+
+    return compare(0)
+
+
+def get_components(key, array):
+    """
+    Components of a key compared to the columns (None for a scalar compared to array keys: it comes before them)
+    """
+    if array is False:
+        return [key]
+    if isinstance(key, (list, tuple)):
+        return list(key)
+    return None
+
+
+def key_condition(columns, array, key):
+    components = get_components(key, array)
+    if components is None or len(components) != len(columns):
+        return False
+    return sql_and(*[equal_condition(columns[i], components[i]) for i in range(len(columns))])
+
+
+def range_condition(columns, array, startkey, endkey, inclusive_end):
+    """
+    Condition on the columns of a key to be in a range: the components the bounds share are compared for equality
+    so that the range is read on the index of the columns
+    """
+    start = get_components(startkey, array) if startkey is not MISSING else MISSING
+    end = get_components(endkey, array) if endkey is not MISSING else MISSING
+
+    equal = list()
+    i = 0
+    if start is not MISSING and end is not MISSING and start is not None and end is not None:
+        while i < min(len(start), len(end), len(columns)) and start[i] is not None and is_scalar(start[i]) and \
+                type(start[i]) is type(end[i]) and start[i] == end[i]:
+            equal.append(equal_condition(columns[i], start[i]))
+            i += 1
+
+    lower = True
+    if start is None:
+        lower = True
+    elif start is not MISSING:
+        lower = bound_condition(columns[i:], start[i:], True, True)
+
+    upper = True
+    if end is None:
+        upper = False
+    elif end is not MISSING:
+        null_below = start is MISSING or start is None or len(start) <= i or start[i] is None
+        upper = bound_condition(columns[i:], end[i:], False, inclusive_end, null_below)
+
+    return sql_and(*(equal + [lower, upper]))
+
+
+# ======================================================================================================================
+#                                                   Database
+# ======================================================================================================================
+
+class SQLiteDatabase(object):
+    """
+    SQLite database answering the couchdbkit Database calls made by PyOCNI, one connection per process
+    """
+
+    def __init__(self, name, path, sync=False):
+        self._lock = threading.RLock()
+        self.name = name
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.depth = 0
+        self.next_seq = None
+        self.designs = dict()
+        self.reads = 0
+        self.writes = 0
+        self.view_queries = 0
+        self.view_scans = 0
+
+        self.execute("PRAGMA journal_mode = WAL")
+        self.execute("PRAGMA synchronous = " + ("FULL" if sync is True else "NORMAL"))
+        with self.transaction():
+            for statement in SCHEMA:
+                self.execute(statement)
+
+    def execute(self, statement, params=()):
+        return self.connection.execute(statement, params)
+
+    def fetch(self, statement, params=()):
+        with self._lock:
+            return self.connection.execute(statement, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Writes made as one: a transaction, or a savepoint in a transaction already begun
+        """
+        with self._lock:
+            if self.depth == 0:
+                #Note: The write lock is taken at once, two processes can not both wait to get it
+                self.execute("BEGIN IMMEDIATE")
+            else:
+                self.execute("SAVEPOINT level_" + str(self.depth))
+            self.depth += 1
+            try:
+                yield
+            except:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.next_seq = None
+                    self.execute("ROLLBACK")
+                else:
+                    self.execute("ROLLBACK TO level_" + str(self.depth))
+                    self.execute("RELEASE level_" + str(self.depth))
+                raise
+            self.depth -= 1
+            if self.depth == 0:
+                self.next_seq = None
+                self.execute("COMMIT")
+            else:
+                self.execute("RELEASE level_" + str(self.depth))
+
+    # ==================================================================================================================
+    #                                                     Documents
+    # ==================================================================================================================
+
+    def info(self):
+        doc_count = self.fetch("SELECT COUNT(*) FROM documents")[0][0]
+        return {'db_name': self.name, 'doc_count': doc_count, 'update_seq': self.get_seq()}
+
+    def get_seq(self):
+        return self.fetch("SELECT COALESCE(MAX(seq), 0) FROM changes")[0][0]
+
+    def open_doc(self, doc_id, **params):
+        count_db_call()
+        self.reads += 1
+        rows = self.fetch("SELECT body FROM documents WHERE id = ?", [doc_id])
+        if len(rows) == 0:
+            rows = self.fetch("SELECT body FROM design_docs WHERE id = ?", [doc_id])
+        if len(rows) == 0:
+            raise ResourceNotFound("missing")
+        return json.loads(rows[0][0])
+
+    def save_doc(self, doc, force_update=False, **params):
+        """
+        Save a document (doc gets its _id and _rev), raise ResourceConflict if its _rev is not the current one
+        unless force_update
+        """
+        count_db_call()
+        with self.transaction():
+            result = self.put(doc, check=True)
+            if result.has_key('error') and force_update is True:
+                result = self.put(doc, check=False)
+        if result.has_key('error'):
+            raise ResourceConflict(result['reason'])
+        return {'ok': True, 'id': result['id'], 'rev': result['rev']}
+
+    def save_docs(self, docs, use_uuids=True, all_or_nothing=False, **params):
+        """
+        Save documents in one transaction: without all_or_nothing a document whose _rev is not the current one is not
+        saved and BulkSaveError is raised once the others are (with all_or_nothing the documents are saved as they
+        are)
+        """
+        count_db_call()
+        results = list()
+        with self.transaction():
+            for doc in docs:
+                results.append(self.put(doc, check=all_or_nothing is False))
+
+        errors = [result for result in results if result.has_key('error')]
+        if len(errors) > 0:
+            raise BulkSaveError(errors, results)
+        return results
+
+    def delete_doc(self, doc, **params):
+        """
+        Delete a document (its id or the document with its current _rev)
+        """
+        count_db_call()
+        with self.transaction():
+            if isinstance(doc, basestring):
+                rows = self.execute("SELECT rev, deleted FROM changes WHERE id = ?", [doc]).fetchall()
+                if len(rows) == 0 or rows[0]['deleted'] == 1:
+                    raise ResourceNotFound("missing")
+                doc = {'_id': doc, '_rev': rows[0]['rev']}
+            doc['_deleted'] = True
+            result = self.put(doc, check=True)
+        if result.has_key('error'):
+            if result['error'] == "not_found":
+                raise ResourceNotFound(result['reason'])
+            raise ResourceConflict(result['reason'])
+        return {'ok': True, 'id': result['id'], 'rev': result['rev']}
+
+    def delete_docs(self, docs, all_or_nothing=False, **params):
+        for doc in docs:
+            doc['_deleted'] = True
+        return self.save_docs(docs, use_uuids=False, all_or_nothing=all_or_nothing)
+
+    def put(self, doc, check):
+        """
+        Write a document in its tables (within a transaction)
+        Returns the result ({'id', 'rev'} or {'id', 'error', 'reason'})
+        """
+        if doc.get('_id') is None:
+            doc['_id'] = uuid.uuid4().hex
+        doc_id = doc['_id']
+        deleted = doc.get('_deleted') is True
+
+        rows = self.execute("SELECT rev, deleted FROM changes WHERE id = ?", [doc_id]).fetchall()
+        last_rev = rows[0]['rev'] if len(rows) > 0 else None
+        current_rev = last_rev if len(rows) > 0 and rows[0]['deleted'] == 0 else None
+
+        if current_rev is None and deleted is True:
+            return {'id': doc_id, 'error': "not_found", 'reason': "missing"}
+        if check is True and doc.get('_rev') != current_rev:
+            return {'id': doc_id, 'error': "conflict", 'reason': "Document update conflict."}
+
+        rev = make_rev(rev_generation(last_rev) + 1)
+        if self.next_seq is None:
+            self.next_seq = self.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0] + 1
+        seq = self.next_seq
+        self.next_seq += 1
+        self.writes += 1
+
+        if doc_id.startswith("_design/"):
+            self.put_design_doc(doc_id, rev, None if deleted else doc)
+        else:
+            self.put_entity_doc(doc_id, rev, None if deleted else doc)
+        self.execute("INSERT OR REPLACE INTO changes (id, seq, rev, deleted) VALUES (?, ?, ?, ?)",
+            [doc_id, seq, rev, 1 if deleted else 0])
+
+        doc['_rev'] = rev
+        return {'id': doc_id, 'rev': rev}
+
+    def put_entity_doc(self, doc_id, rev, doc):
+        self.execute("DELETE FROM memberships WHERE doc_id = ?", [doc_id])
+        if doc is None:
+            self.execute("DELETE FROM documents WHERE id = ?", [doc_id])
+            return
+
+        stored = dict(doc)
+        stored['_rev'] = rev
+        kind = None
+        if memory_views.is_entity(doc):
+            kind = scalar(get_description(doc).get('kind'))
+        self.execute("INSERT OR REPLACE INTO documents (id, rev, type, occi_id, occi_location, kind, body) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?)", [doc_id, rev, scalar(doc.get('Type')), scalar(doc.get('OCCI_ID')),
+                                                      scalar(doc.get('OCCI_Location')), kind, json.dumps(stored)])
+        if memory_views.is_entity(doc):
+            mixins = memory_views.get_mixins(doc)
+            self.connection.executemany("INSERT INTO memberships (doc_id, position, mixin, type, occi_location) "
+                                        "VALUES (?, ?, ?, ?, ?)", [(doc_id, i, scalar(mixins[i]), doc['Type'],
+                                        scalar(doc.get('OCCI_Location'))) for i in range(len(mixins))])
+
+    def put_design_doc(self, doc_id, rev, doc):
+        self.designs.pop(doc_id, None)
+        if doc is None:
+            self.execute("DELETE FROM design_docs WHERE id = ?", [doc_id])
+            return
+
+        stored = dict(doc)
+        stored['_rev'] = rev
+        self.execute("INSERT OR REPLACE INTO design_docs (id, rev, body) VALUES (?, ?, ?)",
+            [doc_id, rev, json.dumps(stored)])
+        #Note: The attributes of the attribute index views get their expression index
+        for index in doc.get('attribute_indexes', {}).values():
+            for name in index['attributes']:
+                if attribute_path(name) is not None:
+                    self.execute("CREATE INDEX IF NOT EXISTS " + attribute_index_name(name) + " ON documents (kind, " +
+                                 attribute_expression(name, "") + ", type, occi_location)")
+
+    # ==================================================================================================================
+    #                                                       Views
+    # ==================================================================================================================
+
+    def get_design_doc(self, design_id):
+        """
+        Returns a design document, kept in memory until its revision changes (None if there is none)
+        """
+        rows = self.fetch("SELECT rev FROM design_docs WHERE id = ?", [design_id])
+        if len(rows) == 0:
+            return None
+        design_doc = self.designs.get(design_id)
+        if design_doc is None or design_doc['_rev'] != rows[0][0]:
+            design_doc = self.open_doc(design_id)
+            self.designs[design_id] = design_doc
+        return design_doc
+
+    def view(self, view_name, key=MISSING, keys=None, startkey=MISSING, endkey=MISSING, skip=0, limit=None,
+             reduce=True, include_docs=False, inclusive_end=True, **params):
+        """
+        Query a view (the parameters of couchdbkit Database.view); the _count reduce is the only one supported
+        """
+        count_db_call()
+        self.view_queries += 1
+        design_name, name = view_name.strip('/').split('/', 1)
+        design_doc = self.get_design_doc("_design/" + design_name)
+        if design_doc is None or design_doc['views'].has_key(name) is False:
+            raise ResourceNotFound("missing view " + view_name)
+        reduced = design_doc['views'][name].get('reduce') is not None and reduce is not False
+
+        view_plan = get_view_plan(design_doc, name)
+        if view_plan is None:
+            return self.scan_view(design_doc, name, key, keys, startkey, endkey, skip, limit, reduced, include_docs,
+                inclusive_end)
+
+        if keys is not None:
+            rows = list()
+            for item in keys:
+                rows.extend(self.query(view_plan, [key_condition(branch.columns, view_plan.array, item)
+                                                   for branch in view_plan.branches], include_docs))
+            if reduced is True:
+                return make_count(len(rows))
+            end = None if limit is None else skip + int(limit)
+            return MemoryViewResults(rows[skip:end])
+
+        conditions = list()
+        for branch in view_plan.branches:
+            if key is not MISSING:
+                conditions.append(key_condition(branch.columns, view_plan.array, key))
+            else:
+                conditions.append(range_condition(branch.columns, view_plan.array, startkey, endkey, inclusive_end))
+
+        if reduced is True:
+            return make_count(self.count(view_plan, conditions))
+        return MemoryViewResults(self.query(view_plan, conditions, include_docs, skip, limit))
+
+    def make_select(self, view_plan, conditions, fields):
+        """
+        Returns the SELECT of the rows of the view meeting the conditions (one per branch) and its parameters
+        (None if no row can)
+        """
+        selects = list()
+        params = list()
+        for branch, condition in zip(view_plan.branches, conditions):
+            if condition is False:
+                continue
+            columns = ", ".join([branch.columns[i] + " AS k" + str(i) for i in range(len(branch.columns))])
+            select = "SELECT " + fields + ", " + columns + " FROM " + branch.source
+            params.extend(branch.params)
+            if condition is not True:
+                select += " AND " + condition[0]
+                params.extend(condition[1])
+            selects.append(select)
+        if len(selects) == 0:
+            return None, None
+        return " UNION ALL ".join(selects), params
+
+    def query(self, view_plan, conditions, include_docs, skip=0, limit=None):
+        fields = "d.id AS id, d.rev AS rev, d.type AS type, d.occi_id AS occi_id, d.occi_location AS occi_location"
+        if view_plan.needs_doc is True or include_docs is True:
+            fields += ", d.body AS body"
+        select, params = self.make_select(view_plan, conditions, fields)
+        if select is None:
+            return []
+
+        nb_columns = len(view_plan.branches[0].columns)
+        order = ", ".join(["k" + str(i) for i in range(nb_columns)])
+        statement = select + " ORDER BY " + order + ", id LIMIT ? OFFSET ?"
+        params = params + [-1 if limit is None else int(limit), skip]
+
+        rows = list()
+        for row in self.fetch(statement, params):
+            doc = None
+            if view_plan.needs_doc is True or include_docs is True:
+                doc = json.loads(row['body'])
+            if view_plan.array is True:
+                key = [row['k' + str(i)] for i in range(nb_columns)]
+            else:
+                key = row['k0']
+            value = None
+            if view_plan.value is not None:
+                value = view_plan.value(row, doc)
+            result = {'id': row['id'], 'key': key, 'value': value}
+            if include_docs is True:
+                result['doc'] = doc
+            rows.append(result)
+        return rows
+
+    def count(self, view_plan, conditions):
+        select, params = self.make_select(view_plan, conditions, "d.id AS id")
+        if select is None:
+            return 0
+        return self.fetch("SELECT COUNT(*) FROM (" + select + ")", params)[0][0]
+
+    def scan_view(self, design_doc, name, key, keys, startkey, endkey, skip, limit, reduced, include_docs,
+                  inclusive_end):
+        """
+        Compute a view without query plan by its Python mirror over the documents
+        """
+        self.view_scans += 1
+        map_function = memory_views.get_map_function(design_doc, name)
+        if map_function is None:
+            raise ResourceNotFound("no Python mirror of the view " + design_doc['_id'] + "/" + name)
+
+        index = ViewIndex(map_function)
+        docs = dict()
+        source = SCAN_SOURCES.get(name, ALL_DOCUMENTS)
+        for row in self.fetch("SELECT d.id, d.body FROM " + source):
+            docs[row[0]] = json.loads(row[1])
+            index.update(row[0], docs[row[0]])
+        entries = index.query(key, keys, startkey, endkey, inclusive_end)
+
+        if reduced is True:
+            return make_count(len(entries))
+        end = None if limit is None else skip + int(limit)
+        rows = list()
+        for entry in entries[skip:end]:
+            row = {'id': entry[1], 'key': entry[3], 'value': entry[4]}
+            if include_docs is True:
+                row['doc'] = docs[entry[1]]
+            rows.append(row)
+        return MemoryViewResults(rows)
+
+    # ==================================================================================================================
+    #                                                      Changes
+    # ==================================================================================================================
+
+    def get_changes(self, since, filter_function=None):
+        """
+        Returns the last change of each document changed after a sequence, in the format of the _changes feed
+        Args:
+            @param since: sequence of the last change already seen
+            @param filter_function: function selecting the documents (memory_views.categories_filter)
+        """
+        results = list()
+        last_seq = since
+        for row in self.fetch("SELECT c.id, c.seq, c.rev, c.deleted, d.body FROM changes c "
+                              "LEFT JOIN documents d ON d.id = c.id WHERE c.seq > ? ORDER BY c.seq", [since]):
+            last_seq = row['seq']
+            if row['deleted'] == 1:
+                doc = {'_id': row['id'], '_rev': row['rev'], '_deleted': True}
+            elif row['body'] is not None:
+                doc = json.loads(row['body'])
+            else:
+                #Note: A design document
+                continue
+            if filter_function is not None and filter_function(doc) is False:
+                continue
+            change = {'seq': row['seq'], 'id': row['id'], 'changes': [{'rev': row['rev']}], 'doc': doc}
+            if row['deleted'] == 1:
+                change['deleted'] = True
+            results.append(change)
+        return {'results': results, 'last_seq': last_seq}
+
+    def purge(self):
+        """
+        Delete all the documents, the design documents and the expression indexes on the attributes
+        """
+        with self.transaction():
+            for table in ("documents", "memberships", "design_docs", "changes"):
+                self.execute("DELETE FROM " + table)
+            for row in self.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE ?",
+                                    [ATTRIBUTE_INDEX_PREFIX + "%"]).fetchall():
+                self.execute("DROP INDEX " + row[0])
+        self.designs = dict()
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def stats(self):
+        return {"docs": self.info()['doc_count'],
+                "reads": self.reads,
+                "writes": self.writes,
+                "view_queries": self.view_queries,
+                "view_scans": self.view_scans}
+
+
+def scalar(value):
+    """
+    Value of an indexed column: the non scalar values are not indexed
+    """
+    if is_scalar(value):
+        return value
+    return None
+
+
+def make_count(count):
+    if count == 0:
+        return MemoryViewResults([])
+    return MemoryViewResults([{'key': None, 'value': count}])
+
+
+class SQLiteEngine(StorageEngine):
+
+    shared = True
+
+    def get_database(self):
+        with self._lock:
+            if self.database is None:
+                try:
+                    self.database = SQLiteDatabase(config.PyOCNI_DB, config.DB_SQLITE_FILE,
+                        str(config.DB_JOURNAL_SYNC) == '1')
+                except Exception as e:
+                    logger.error("===== SQLite_engine : " + config.DB_SQLITE_FILE + " could not be opened, " +
+                                 str(e) + " =====")
+                    return None
+            return self.database
+
+    def check(self):
+        database = self.get_database()
+        if database is None:
+            return 0
+        try:
+            #Note: The expression indexes and the jobs_by_status plan need the JSON functions of SQLite
+            database.fetch("SELECT json_extract('{}', '$.Status')")
+        except sqlite3.Error as e:
+            logger.error("===== SQLite_engine : SQLite " + sqlite3.sqlite_version + " has no JSON functions, " +
+                         str(e) + " =====")
+            return 0
+        return 1
+
+    def transaction(self):
+        return self.get_database().transaction()
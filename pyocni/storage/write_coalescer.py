@@ -0,0 +1,350 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+
+Write coalescer (CouchDB_WRITE_BATCH_WINDOW > 0): the single-document writes of the requests handled at the same time
+are saved together in one _bulk_docs request. A write waits at most CouchDB_WRITE_BATCH_WINDOW ms for the others
+(less when CouchDB_WRITE_BATCH_SIZE writes are waiting) and its caller gets its own result, as from save_doc. Until
+it is saved, the document is read from the overlay by the other requests (see get_pending_rows).
+
+The requests are green threads of the eventlet server: the writers wait on eventlet events.
+"""
+
+import uuid
+import threading
+import eventlet
+from eventlet import event
+from collections import OrderedDict
+from couchdbkit import ResourceNotFound, ResourceConflict, BulkSaveError
+import pyocni.pyocni_tools.config as config
+import pyocni.storage.memory_views as memory_views
+from pyocni.storage.engine import get_engine
+from pyocni.storage.memory_engine import MemoryViewResults, clone
+from pyocni.pyocni_tools.db_Calls import count_db_call
+
+# getting the Logger
+logger = config.logger
+
+#Note: Number of times a forced update whose revision is outdated is tried again with the current one
+FORCE_RETRIES = 3
+
+#Note: Number of placeholder revisions remembered once their write is saved
+MAX_TOKENS = 10000
+
+#Note: Prefix of the placeholder revision of the documents read from the overlay
+TOKEN_PREFIX = "pending-"
+
+
+class PendingWrite(object):
+    """
+    A single-document write waiting for its batch
+    """
+
+    def __init__(self, doc, force_update):
+        if doc.get('_id') is None:
+            doc['_id'] = uuid.uuid4().hex
+        self.doc = doc
+        self.doc_id = doc['_id']
+        self.location = doc.get('OCCI_Location')
+        self.deleted = doc.get('_deleted') is True
+        self.force_update = force_update
+        self.base_rev = doc.get('_rev')
+        #Note: Write whose new revision this one is based on (its document was read from the overlay)
+        self.after = None
+        self.base = None
+        self.token = None
+        self.result = None
+        self.error = None
+        self.done = event.Event()
+
+    def get_new_rev(self):
+        """
+        Revision the document has once this write is done
+        """
+        if self.result is not None:
+            return self.result['rev']
+        return self.base_rev
+
+
+class WriteCoalescer(object):
+    """
+    Merges the single-document writes of concurrent requests into _bulk_docs batches (one coalescer per process)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queue = list()
+        #Note: Number of waiting writes of each (document, revision they are based on)
+        self.bases = dict()
+        self.overlay = dict()
+        self.tokens = OrderedDict()
+        self.serial = 0
+        self.leading = False
+        self.full = None
+        self.writes = 0
+        self.batches = 0
+        self.retries = 0
+        self.conflicts = 0
+        self.overlay_hits = 0
+
+    # ==================================================================================================================
+    #                                                     Writers
+    # ==================================================================================================================
+
+    def save(self, doc, force_update=False):
+        """
+        Save a document in the next batch (doc gets its _rev), raise ResourceConflict if its _rev is not the current
+        one unless force_update
+        """
+        return self.submit(PendingWrite(doc, force_update))
+
+    def delete(self, doc):
+        """
+        Delete a document (with its current _rev) in the next batch
+        """
+        tombstone = {'_id': doc['_id'], '_deleted': True}
+        if doc.has_key('_rev'):
+            tombstone['_rev'] = doc['_rev']
+        write = PendingWrite(tombstone, False)
+        write.location = doc.get('OCCI_Location')
+        return self.submit(write)
+
+    def submit(self, write):
+        with self._lock:
+            self.resolve_token(write)
+            if write.force_update is False and self.is_outdated(write):
+                self.conflicts += 1
+                raise ResourceConflict("Document update conflict.")
+            self.queue.append(write)
+            write.base = (write.doc_id, write.base_rev)
+            self.bases[write.base] = self.bases.get(write.base, 0) + 1
+            self.writes += 1
+            #Note: The _bulk_docs request of the batch is made by the leader, the write is counted for its request
+            count_db_call()
+            if write.location is not None:
+                self.overlay[write.location] = write
+            if self.full is not None and len(self.queue) >= int(config.DB_WRITE_BATCH_SIZE):
+                self.full.send()
+                self.full = None
+            leader = self.leading is False
+            self.leading = True
+
+        if leader is True:
+            eventlet.spawn_n(self.lead)
+
+        write.done.wait()
+        if write.error is not None:
+            raise write.error
+        return write.result
+
+    def resolve_token(self, write):
+        """
+        A document read from the overlay holds the placeholder revision of the write it was read from: it gets the
+        revision that write saves
+        """
+        token_write = self.tokens.get(write.base_rev)
+        if token_write is None:
+            return
+        if token_write.done.ready() and token_write.error is None:
+            write.doc['_rev'] = write.base_rev = token_write.get_new_rev()
+        else:
+            write.after = token_write
+
+    def is_outdated(self, write):
+        """
+        A write based on the same revision as a waiting write of the document conflicts once that one is saved, as
+        a write made from a write that failed
+        """
+        if write.after is not None and write.after.error is not None:
+            return True
+        return self.bases.has_key((write.doc_id, write.base_rev))
+
+    # ==================================================================================================================
+    #                                                     Batches
+    # ==================================================================================================================
+
+    def lead(self):
+        """
+        Save the waiting writes a batch at a time, until none is left
+        """
+        window = int(config.DB_WRITE_BATCH_WINDOW) / 1000.0
+        size = int(config.DB_WRITE_BATCH_SIZE)
+        while True:
+            with self._lock:
+                if len(self.queue) == 0:
+                    self.leading = False
+                    return
+                full = None
+                if len(self.queue) < size:
+                    full = self.full = event.Event()
+
+            if full is not None:
+                with eventlet.Timeout(window, False):
+                    full.wait()
+
+            with self._lock:
+                self.full = None
+                batch, orphans = self.take_batch(size)
+            for write in orphans:
+                self.conflicts += 1
+                self.finish(write, error=ResourceConflict("Document update conflict."))
+            self.flush(batch)
+
+    def take_batch(self, size):
+        """
+        Returns the next batch (at most one write per document, a write based on another one after it) and the writes
+        based on a write that failed
+        """
+        batch = list()
+        orphans = list()
+        doc_ids = set()
+        waiting = list()
+        for write in self.queue:
+            if write.after is not None and write.after.error is not None and write.force_update is False:
+                orphans.append(write)
+            elif len(batch) < size and write.doc_id not in doc_ids and (write.after is None or
+                                                                        write.after.done.ready()):
+                if write.after is not None:
+                    write.doc['_rev'] = write.base_rev = write.after.get_new_rev()
+                    write.after = None
+                batch.append(write)
+                doc_ids.add(write.doc_id)
+            else:
+                waiting.append(write)
+        self.queue = waiting
+        for write in batch + orphans:
+            if self.bases[write.base] == 1:
+                del self.bases[write.base]
+            else:
+                self.bases[write.base] -= 1
+        return batch, orphans
+
+    def flush(self, batch):
+        """
+        Save a batch in one _bulk_docs request; a forced update whose revision is outdated is tried again with the
+        current one
+        """
+        self.batches += 1
+        attempts = 0
+        while len(batch) > 0:
+            database = get_engine().get_database()
+            try:
+                results = database.save_docs([write.doc for write in batch], use_uuids=True)
+            except BulkSaveError as e:
+                results = e.results
+            except Exception as e:
+                logger.error("===== Write_coalescer : " + str(len(batch)) + " documents not saved, " + str(e) +
+                             " =====")
+                for write in batch:
+                    self.finish(write, error=e)
+                return
+
+            retry = list()
+            for write, result in zip(batch, results):
+                if result.has_key('error') is False:
+                    write.doc['_rev'] = result['rev']
+                    self.finish(write, result={'ok': True, 'id': result['id'], 'rev': result['rev']})
+
+                elif result['error'] == "conflict" and write.force_update is True and attempts < FORCE_RETRIES:
+                    try:
+                        write.doc['_rev'] = database.open_doc(write.doc_id)['_rev']
+                    except ResourceNotFound:
+                        write.doc.pop('_rev', None)
+                    self.retries += 1
+                    retry.append(write)
+
+                else:
+                    self.conflicts += 1
+                    self.finish(write, error=make_error(result))
+            batch = retry
+            attempts += 1
+
+    def finish(self, write, result=None, error=None):
+        write.result = result
+        write.error = error
+        with self._lock:
+            if self.overlay.get(write.location) is write:
+                del self.overlay[write.location]
+        write.done.send()
+
+    # ==================================================================================================================
+    #                                                      Overlay
+    # ==================================================================================================================
+
+    def get_pending_rows(self, view_name, location):
+        """
+        Returns the rows a view keyed by OCCI_Location gives for the waiting version of an entity (None if there is
+        no waiting write on this location, the database is then up to date)
+        Args:
+            @param view_name: name of the view in the PyOCNI design document (its Python mirror makes the rows)
+            @param location: OCCI_Location of the entity
+        """
+        if len(self.overlay) == 0:
+            return None
+        with self._lock:
+            write = self.overlay.get(location)
+            if write is None:
+                return None
+            self.overlay_hits += 1
+            if write.deleted is True:
+                return MemoryViewResults([])
+            doc = clone(write.doc)
+            doc['_rev'] = self.get_token(write)
+
+        rows = [{'id': write.doc_id, 'key': key, 'value': value}
+                for key, value in memory_views.DB_VIEWS[view_name](doc)]
+        return MemoryViewResults(rows)
+
+    def get_token(self, write):
+        """
+        Placeholder revision of a waiting write: a write of the document read from the overlay is based on it
+        """
+        if write.token is None:
+            self.serial += 1
+            write.token = TOKEN_PREFIX + str(self.serial)
+            self.tokens[write.token] = write
+            while len(self.tokens) > MAX_TOKENS:
+                self.tokens.popitem(last=False)
+        return write.token
+
+    def stats(self):
+        return {"queued": len(self.queue),
+                "overlay": len(self.overlay),
+                "writes": self.writes,
+                "batches": self.batches,
+                "retries": self.retries,
+                "conflicts": self.conflicts,
+                "overlay_hits": self.overlay_hits}
+
+
+def make_error(result):
+    """
+    Exception raised by save_doc for the result of a document in a _bulk_docs answer
+    """
+    if result['error'] == "conflict":
+        return ResourceConflict(result.get('reason'))
+    if result['error'] == "not_found":
+        return ResourceNotFound(result.get('reason'))
+    return Exception(result['error'] + ": " + str(result.get('reason')))
+
+
+def is_enabled():
+    return int(config.DB_WRITE_BATCH_WINDOW) > 0
@@ -0,0 +1,272 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import time
+import threading
+import eventlet
+import pyocni.pyocni_tools.config as config
+import pyocni.pyocni_tools.green_IO as green_IO
+from pyocni.storage.engine import get_engine
+
+# getting the Logger
+logger = config.logger
+
+CATEGORY_TYPES = ("Kind", "Mixin", "Action")
+
+#Note: Time (ms) a long poll request on the _changes feed waits for a change before being sent again
+CHANGES_TIMEOUT = 60000
+
+#Note: Time (s) to wait before following the _changes feed again after an error
+RETRY_DELAY = 5
+
+
+class CategoryRegistry(object):
+    """
+    Process-local copy of the category documents (Kinds, Mixins and Actions). It is loaded on first use and kept
+    coherent through the changes feed of the storage engine (the CouchDB _changes feed). Categories are looked up by
+    OCCI_ID or by OCCI_Location in O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self.last_seq = 0
+        self.by_doc_id = dict()
+        self.by_occi_id = dict()
+        self.by_location = dict()
+        self.kind_ids = frozenset()
+        self._all_categories = None
+        self.listeners = list()
+        self.following = False
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.changes = 0
+
+    # ==================================================================================================================
+    #                                                 Loading and changes
+    # ==================================================================================================================
+
+    def load(self):
+        """
+        Load all the category documents then follow the changes made since then
+        """
+        database = get_engine().prepare_database()
+        if database is None:
+            return False
+        try:
+            #Note: The sequence is read first, changes made during the loading are applied again by the feed
+            seq = database.info()['update_seq']
+            docs = [row['value'] for row in database.view('/db_views/for_update_categories')]
+        except Exception as e:
+            logger.error("===== Category_registry load : " + str(e) + " =====")
+            return False
+
+        with self._lock:
+            self.by_doc_id = dict((doc['_id'], doc) for doc in docs)
+            self.reindex()
+            self.last_seq = seq
+            self.loaded = True
+            self.reloads += 1
+
+        logger.debug("===== Category_registry : " + str(len(docs)) + " categories loaded =====")
+        self.notify(None)
+        self.follow()
+        return True
+
+    def catch_up(self):
+        """
+        Apply the changes not yet received from the feed (called after this process writes categories)
+        """
+        if self.loaded is False:
+            return self.ensure_loaded()
+        try:
+            changes = self.get_changes(feed='normal')
+        except Exception as e:
+            logger.error("===== Category_registry catch_up : " + str(e) + " =====")
+            return False
+        self.apply_changes(changes)
+        return True
+
+    def get_changes(self, feed, timeout=None):
+        return get_engine().get_changes(self.last_seq, feed, timeout)
+
+    def apply_changes(self, changes):
+        """
+        Apply a batch of changes received from the _changes feed
+        Args:
+            @param changes: _changes response (results and last_seq)
+        """
+        changed = list()
+        with self._lock:
+            for change in changes['results']:
+                rev = change['changes'][0]['rev']
+                current = self.by_doc_id.get(change['id'])
+                #Note: The feed and catch_up may deliver the same change twice, never go back to an older revision
+                if current is not None and rev_generation(current['_rev']) > rev_generation(rev):
+                    continue
+                if change.get('deleted') is True:
+                    if current is not None:
+                        del self.by_doc_id[change['id']]
+                        changed.append(current['OCCI_ID'])
+                elif change.get('doc') is not None and change['doc'].get('Type') in CATEGORY_TYPES:
+                    self.by_doc_id[change['id']] = change['doc']
+                    changed.append(change['doc']['OCCI_ID'])
+            if len(changed) > 0:
+                self.reindex()
+                self.changes += len(changed)
+            self.last_seq = changes['last_seq']
+
+        if len(changed) > 0:
+            logger.debug("===== Category_registry : " + str(changed) + " changed =====")
+            self.notify(changed)
+
+    def follow(self):
+        """
+        Start following the _changes feed (once per process)
+        """
+        with self._lock:
+            if self.following is True:
+                return
+            self.following = True
+
+        if green_IO.is_patched():
+            eventlet.spawn_n(self.follow_changes)
+        else:
+            follower = threading.Thread(target=self.follow_changes, name="CategoryRegistry")
+            follower.daemon = True
+            follower.start()
+
+    def follow_changes(self):
+        while True:
+            try:
+                self.apply_changes(self.get_changes(feed='longpoll', timeout=CHANGES_TIMEOUT))
+            except Exception as e:
+                logger.error("===== Category_registry follow_changes : " + str(e) + " =====")
+                time.sleep(RETRY_DELAY)
+
+    def reindex(self):
+        #Note: The indexes are swapped at once, lookups are done without taking the lock
+        by_occi_id = dict()
+        by_location = dict()
+        for doc in self.by_doc_id.values():
+            by_occi_id[doc['OCCI_ID']] = doc
+            if doc.get('OCCI_Location') is not None:
+                by_location[doc['OCCI_Location']] = doc
+        self.by_occi_id = by_occi_id
+        self.by_location = by_location
+        self.kind_ids = frozenset([occi_id for occi_id in by_occi_id if by_occi_id[occi_id]['Type'] == "Kind"])
+        self._all_categories = None
+
+    def add_listener(self, listener):
+        """
+        Register a function called with the OCCI_IDs of the changed categories (None when everything was reloaded)
+        """
+        self.listeners.append(listener)
+
+    def notify(self, changed):
+        for listener in self.listeners:
+            try:
+                listener(changed)
+            except Exception as e:
+                logger.error("===== Category_registry notify : " + str(e) + " =====")
+
+    # ==================================================================================================================
+    #                                                     Lookups
+    # ==================================================================================================================
+
+    def ensure_loaded(self):
+        """
+        Load the categories if they are not in memory yet (the loads are counted in reloads)
+        """
+        if self.loaded is True:
+            return True
+        return self.load()
+
+    def counted(self, doc):
+        #Note: A lookup finding its category is a hit, one finding none (unknown OCCI_ID or location) a miss
+        if doc is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return doc
+
+    def get_all_categories(self):
+        """
+        Returns all the categories descriptions: {'kinds': [...], 'mixins': [...], 'actions': [...]}
+        """
+        if self.ensure_loaded() is False:
+            return None
+        with self._lock:
+            if self._all_categories is None:
+                result = {'kinds': list(), 'mixins': list(), 'actions': list()}
+                #Note: Same order as the for_get_categories view (Type then document id)
+                for doc_id in sorted(self.by_doc_id.keys()):
+                    doc = self.by_doc_id[doc_id]
+                    result[doc['Type'].lower() + 's'].append(doc['OCCI_Description'])
+                self._all_categories = result
+            all_categories = self._all_categories
+        self.hits += 1
+        return {'kinds': list(all_categories['kinds']), 'mixins': list(all_categories['mixins']),
+                'actions': list(all_categories['actions'])}
+
+    def get_by_occi_id(self, occi_id):
+        """
+        Returns the category document having this OCCI_ID (None if there is none). Call ensure_loaded() first.
+        """
+        return self.counted(self.by_occi_id.get(occi_id))
+
+    def get_by_location(self, occi_location):
+        """
+        Returns the kind or mixin document having this OCCI_Location (None if there is none). Call ensure_loaded() first.
+        """
+        return self.counted(self.by_location.get(occi_location))
+
+    def get_kind_ids(self):
+        """
+        Returns the set of the kind OCCI_IDs. Call ensure_loaded() first.
+        """
+        self.hits += 1
+        return self.kind_ids
+
+    def get_provider(self, kind_id):
+        """
+        Returns the provider of a kind (None if the kind does not exist). Call ensure_loaded() first.
+        """
+        doc = self.by_occi_id.get(kind_id)
+        if doc is None or doc['Type'] != "Kind":
+            return self.counted(None)
+        return self.counted(doc)['Provider']
+
+    def stats(self):
+        return {"loaded": self.loaded,
+                "categories": len(self.by_doc_id),
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "changes": self.changes,
+                "last_seq": self.last_seq}
+
+
+def rev_generation(rev):
+    return int(rev.split('-')[0])
@@ -24,16 +24,26 @@ Created on Oct 03, 2012
 """
 
 import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
 # getting the Logger
 logger = config.logger
 
-class CategorySupplier():
+class CategorySupplier(object):
     """
     Consults the database to get the data asked for by the dataBakers
     """
 
     def __init__(self):
-        self.database = config.prepare_PyOCNI_db()
+        self._database = None
+
+    @property
+    def database(self):
+        """
+        Database connection, kept for the life of the worker (retried on the next call if it failed)
+        """
+        if self._database is None:
+            self._database = get_engine().prepare_database()
+        return self._database
 
     def get_all_categories(self):
         try:
@@ -0,0 +1,146 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+import hashlib
+from couchdbkit import ResourceConflict
+import pyocni.pyocni_tools.config as config
+from pyocni.suppliers.categoryRegistry import CategoryRegistry
+from pyocni.storage.engine import get_engine
+from pyocni.pyocni_tools.service_Container import get_service
+
+# getting the Logger
+logger = config.logger
+
+DESIGN_NAME = "kind_indexes"
+
+
+class KindIndexes(object):
+    """
+    Attribute indexes declared by the kinds: an attribute of a kind description having "indexed": true
+        "attributes": {"occi": {"compute": {"state": {"type": "string", "indexed": true}}}}
+    gets a view of the _design/kind_indexes document keyed by [attribute name, value, Type, OCCI_Location],
+    filled with the entities of this kind only.
+    """
+
+    def __init__(self):
+        self.registry = get_service(CategoryRegistry)
+
+    def make_design_doc(self, kind_docs):
+        """
+        Makes the _design/kind_indexes document from the kind documents
+        Args:
+            @param kind_docs: kind documents
+        """
+        views = dict()
+        attribute_indexes = dict()
+        for doc in kind_docs:
+            names = get_indexed_attributes(doc['OCCI_Description'])
+            if len(names) > 0:
+                views[make_view_name(doc['OCCI_ID'])] = config.make_attribute_index_view(names, doc['OCCI_ID'])
+                attribute_indexes[make_view_name(doc['OCCI_ID'])] = {'attributes': names, 'kind': doc['OCCI_ID']}
+
+        design_doc = {"_id": "_design/" + DESIGN_NAME, "language": "javascript", "views": views,
+                      "attribute_indexes": attribute_indexes}
+        design_doc['version'] = config.make_design_doc_version(design_doc)
+        return design_doc
+
+    def sync(self, kind_docs=None):
+        """
+        Install the views of the indexed attributes of the kinds, if they changed
+        Args:
+            @param kind_docs: kind documents (those of the category registry if None)
+        @return : True if the design document was saved
+        """
+        try:
+            if kind_docs is None:
+                if self.registry.ensure_loaded() is False:
+                    return False
+                kind_docs = [self.registry.get_by_occi_id(occi_id) for occi_id in self.registry.get_kind_ids()]
+            return get_engine().install_design_doc(self.make_design_doc(kind_docs))
+        except ResourceConflict:
+            #Note: Another worker installed it at the same time
+            logger.debug("===== Kind_indexes sync : " + DESIGN_NAME + " saved by another process =====")
+            return False
+        except Exception as e:
+            logger.error("===== Kind_indexes sync : " + str(e) + " =====")
+            return False
+
+    def install(self):
+        """
+        Install the views from the kind documents read in the database (server startup)
+        """
+        try:
+            database = get_engine().prepare_database()
+            kind_docs = [row['value'] for row in database.view('/db_views/for_update_categories')
+                         if row['value']['Type'] == "Kind"]
+        except Exception as e:
+            logger.error("===== Kind_indexes install : " + str(e) + " =====")
+            return False
+        return self.sync(kind_docs)
+
+    def get_index_view(self, kind_id, attribute_name):
+        """
+        Returns the name (design/view) of the view indexing this attribute of the kind (None if it is not indexed)
+        Args:
+            @param kind_id: OCCI ID of the kind
+            @param attribute_name: attribute name (occi.compute.state)
+        """
+        if self.registry.ensure_loaded() is False:
+            return None
+        doc = self.registry.get_by_occi_id(kind_id)
+        if doc is None or doc['Type'] != "Kind":
+            return None
+        if attribute_name in get_indexed_attributes(doc['OCCI_Description']):
+            return DESIGN_NAME + "/" + make_view_name(kind_id)
+        return None
+
+
+def get_indexed_attributes(kind_description):
+    """
+    Returns the names of the attributes declared with "indexed": true in a kind description
+    Args:
+        @param kind_description: OCCI kind description
+    """
+    names = list()
+    attributes = kind_description.get('attributes')
+    if type(attributes) is dict:
+        find_indexed_attributes(attributes, (), names)
+    return sorted(names)
+
+
+def find_indexed_attributes(attributes, path, names):
+    for key in attributes.keys():
+        if type(attributes[key]) is dict:
+            if attributes[key].get('indexed') is True:
+                names.append(".".join(path + (key,)))
+            else:
+                find_indexed_attributes(attributes[key], path + (key,), names)
+
+
+def make_view_name(kind_id):
+    """
+    View name of a kind: its term and a hash of its OCCI ID (the scheme may hold any character)
+    """
+    term = kind_id.split('#')[-1]
+    term = "".join([c for c in term if c.isalnum() or c == '_'])
+    return term + "_" + hashlib.sha1(kind_id.encode('utf-8')).hexdigest()[:12]
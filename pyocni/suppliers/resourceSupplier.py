@@ -26,22 +26,143 @@ Created on Oct 03, 2012
 @version: 0.3
 @license: LGPL - Lesser General Public License
 """
+from couchdbkit import ResourceNotFound
 import pyocni.pyocni_tools.config as config
+from pyocni.storage.engine import get_engine
+from pyocni.storage.write_coalescer import WriteCoalescer
+from pyocni.suppliers.viewRows import ViewRows
+from pyocni.pyocni_tools.service_Container import get_service
 # getting the Logger
 logger = config.logger
 
-class ResourceSupplier():
+#Note: Collates after any character a location may contain, closes the key range of a path
+PATH_RANGE_END = u"\ufff0"
+
+class ResourceSupplier(object):
     """
     Consults the database to get the data asked for by the dataBakers
     """
     def __init__(self):
+        self._database = None
+        self.coalescer = get_service(WriteCoalescer)
+
+    @property
+    def database(self):
+        """
+        Database connection, kept for the life of the worker (retried on the next call if it failed)
+        """
+        if self._database is None:
+            self._database = get_engine().prepare_database()
+        return self._database
+
+    def view_location(self, view_name, location):
+        """
+        Lookup of an entity on a view keyed by OCCI_Location: an entity whose write is waiting in the write coalescer
+        is read from there. The rows are read here, in one view request (ViewRows)
+        """
+        pending = self.coalescer.get_pending_rows(view_name, location)
+        if pending is not None:
+            return ViewRows(pending)
+        return ViewRows(self.database.view('/db_views/' + view_name, key=location))
+
+    def get_rows_by_keys(self, view_name, keys, **params):
+        """
+        Multi-key lookup on a view: the keys are sent in POST requests of at most CouchDB_KEYS_CHUNK_SIZE keys
+        Args:
+            @param view_name: name of the view in the PyOCNI design document
+            @param keys: keys to look for
+            @param params: other parameters of the view (reduce=False for the views with a reduce function)
+        Returns the rows of all the chunks (None if an error has occurred)
+        """
+        rows = list()
+        chunk_size = int(config.DB_KEYS_CHUNK_SIZE)
+        try:
+            for start in range(0, len(keys), chunk_size):
+                query = self.database.view('/db_views/' + view_name, keys=keys[start:start + chunk_size], **params)
+                rows.extend(query.all())
+        except Exception as e:
+            logger.error("===== Get_rows_by_keys (" + view_name + ") : " + str(e) + " ===== ")
+            return None
+
+        return rows
+
+    def iter_rows_in_range(self, view_name, startkey, endkey, after=None, page_size=None, include_docs=False):
+        """
+        Range lookup on a view read CouchDB_PAGE_SIZE rows at a time, so that only one page is held in memory.
+        The first page is read before returning: an error at this point is reported as for any other query,
+        an error on a later page is logged and raised by the iterator, the rows already read are not a whole range.
+        Args:
+            @param view_name: name of the view in the PyOCNI design document (or design/view)
+            @param startkey: first key of the range
+            @param endkey: last key of the range
+            @param after: key already read (a cursor) at the beginning of the range, its row is not returned
+            @param page_size: number of rows read at once, when fewer than CouchDB_PAGE_SIZE rows are needed
+            @param include_docs: read the documents with the rows (row['doc'])
+        Returns an iterator on the rows (None if an error has occurred)
+        """
+        if page_size is None or page_size > int(config.DB_PAGE_SIZE):
+            page_size = int(config.DB_PAGE_SIZE)
+        try:
+            if after is None:
+                page = self.database.view(view_path(view_name), startkey=startkey, endkey=endkey,
+                    limit=page_size, reduce=False, include_docs=include_docs).all()
+            else:
+                #Note: The row of the cursor may have been deleted, the range is read from it as for the next pages
+                page = drop_key(self.database.view(view_path(view_name), startkey=startkey, endkey=endkey,
+                    limit=page_size + 1, reduce=False, include_docs=include_docs).all(), after)
+        except Exception as e:
+            logger.error("===== Iter_rows_in_range (" + view_name + ") : " + str(e) + " ===== ")
+            return None
+
+        return self.iter_pages(view_name, page, endkey, page_size, include_docs)
+
+    def iter_pages(self, view_name, page, endkey, page_size, include_docs):
+
+        while True:
+            for row in page:
+                yield row
+            if len(page) < page_size:
+                return
+            #Note: Keys are unique in the paged views, the next page is read from the last key read (one row more,
+            # for that key) instead of skipping one row: the next row is not lost if that one was deleted meanwhile
+            last_key = page[-1]['key']
+            try:
+                page = self.database.view(view_path(view_name), startkey=last_key, endkey=endkey,
+                    limit=page_size + 1, reduce=False, include_docs=include_docs).all()
+            except Exception as e:
+                logger.error("===== Iter_pages (" + view_name + ") : " + str(e) + " ===== ")
+                raise
+            page = drop_key(page, last_key)
+
+    def count_rows_in_range(self, view_name, startkey, endkey):
+        """
+        Number of rows in a key range, computed by the _count reduce of the view
+        Returns the number of rows (None if an error has occurred)
+        """
+        try:
+            rows = self.database.view(view_path(view_name), startkey=startkey, endkey=endkey,
+                reduce=True).all()
+        except Exception as e:
+            logger.error("===== Count_rows_in_range (" + view_name + ") : " + str(e) + " ===== ")
+            return None
+
+        if len(rows) == 0:
+            return 0
+        return rows[0]['value']
+
 
-        self.database = config.prepare_PyOCNI_db()
+    def get_for_associate_mixin_by_keys(self, locations):
+
+        return self.get_rows_by_keys('for_associate_mixin', [[item] for item in locations])
+
+    def get_for_trigger_action_by_keys(self, entities):
+
+        return self.get_rows_by_keys('for_trigger_action', entities)
 
     def get_my_resources(self,path_url):
 
         try:
-            query = self.database.view('/db_views/my_resources',key=path_url)
+            query = self.view_location('my_resources', path_url)
         except Exception as e:
             logger.error("===== Get_resources : " + e.message + " ===== ")
             return None
@@ -51,28 +172,21 @@ class ResourceSupplier():
     def get_for_update_entities(self,path_url):
 
         try:
-            query = self.database.view('/db_views/for_update_entities',key=path_url)
+            query = self.view_location('for_update_entities', path_url)
         except Exception as e:
             logger.error("===== Get_old_occi_resource_description : " + e.message + " ===== ")
             return None
 
         return query
 
-    def get_for_register_entities(self):
+    def get_existing_locations(self, locations):
 
-
-        try:
-            query = self.database.view('/db_views/for_register_entities')
-        except Exception as e:
-            logger.error("===== Get_for_register_entities : " + e.message + " ===== ")
-            return None
-
-        return query
+        return self.get_rows_by_keys('for_check_locations', locations, reduce=False)
 
     def get_for_trigger_action(self, path_url):
 
         try:
-            query = self.database.view('/db_views/for_trigger_action', key=path_url)
+            query = self.view_location('for_trigger_action', path_url)
         except Exception as e:
             logger.error("===== Get_for_trigger_action : " + e.message + " ===== ")
             return None
@@ -90,18 +204,6 @@ class ResourceSupplier():
 
         return query
 
-    def get_my_mixins(self,url_path):
-
-        try:
-            query = self.database.view('/db_views/my_mixins',key = url_path)
-
-        except Exception as e:
-
-            logger.error("===== Get_my_mixins : " + e.message + " ===== ")
-            return None
-
-        return query
-
     def get_for_associate_mixin(self, item):
 
         try:
@@ -112,17 +214,6 @@ class ResourceSupplier():
 
         return query
 
-    def get_for_get_entities(self, req_path):
-
-
-        try:
-            query = self.database.view('/db_views/for_get_entities',key=req_path)
-        except Exception as e:
-            logger.error("===== Get_for_get_entities : " + e.message + " ===== ")
-            return None
-
-        return query
-
     def get_entities_of_kind(self, cat_id):
 
         try:
@@ -146,62 +237,82 @@ class ResourceSupplier():
 
         return query
 
-    def get_my_occi_locations(self):
 
-        try:
-            query = self.database.view('/db_views/my_occi_locations')
+    def get_delete_on_path(self, req_path):
 
+        try:
+            query = self.database.view('/db_views/for_delete_entities', **path_range(req_path))
         except Exception as e:
-
-            logger.error("===== Get_my_occi_locations : " + e.message + " ===== ")
+            logger.error("===== Get_delete_on_Path: " + e.message + " ===== ")
             return None
-
         return query
 
-    def get_for_get_filtered(self, entity):
-
+    def get_job(self, job_id):
+        """
+        Returns the job document (0 if there is no such job, None if an error has occurred)
+        """
         try:
-            query = self.database.view('/db_views/for_get_filtered',key=entity)
+            doc = self.database.open_doc(job_id)
+        except ResourceNotFound:
+            return 0
         except Exception as e:
-
-            logger.error("===== Get_for_get_filtered : " + e.message + " ===== ")
+            logger.error("===== Get_job : " + str(e) + " ===== ")
             return None
 
-        return query
-
-    def get_default_attributes_from_kind(self, req_path):
+        if doc.get('Type') != "Job":
+            return 0
+        return doc
 
+    def get_jobs_of_status(self, status):
+        """
+        Returns the job documents having this status, oldest first (None if an error has occurred)
+        """
         try:
-            query = self.database.view('/db_views/get_default_attributes_from_kind',key=req_path)
+            query = self.database.view('/db_views/jobs_by_status', startkey=[status], endkey=[status, {}],
+                include_docs=True)
+            return [row['doc'] for row in query]
         except Exception as e:
-
-            logger.error("===== Get_for_get_filtered : " + e.message + " ===== ")
+            logger.error("===== Get_jobs_of_status : " + str(e) + " ===== ")
             return None
 
-        return query
-
-    def get_providers(self, kind_id):
 
-        try:
-            query = self.database.view('/db_views/my_providers',key=kind_id)
-        except Exception as e:
+def drop_key(rows, key):
+    """
+    Rows of a page read from a key already read: its row is dropped if it is still there
+    """
+    if len(rows) > 0 and rows[0]['key'] == key:
+        return rows[1:]
+    return rows
 
-            logger.error("===== Get_for_get_providers: " + e.message + " ===== ")
-            return None
-
-        return query
 
+def view_path(view_name):
+    """
+    Path of a view: a name of the PyOCNI design document (db_views) or design/view for another design document
+    """
+    if view_name.find('/') is -1:
+        return '/db_views/' + view_name
+    return '/' + view_name
 
-    def get_delete_on_path(self):
 
+def path_range(req_path):
+    """
+    Key range of the locations under a path in a view keyed by OCCI_Location
+    Args:
+        @param req_path: path (the trailing slash is added if missing so that /comp does not match /compute/...)
+    """
+    if req_path.endswith("/") is False:
+        req_path += "/"
+    return {'startkey': req_path, 'endkey': req_path + PATH_RANGE_END}
 
 
-        try:
-            query = self.database.view('/db_views/for_delete_entities')
-        except Exception as e:
-            logger.error("===== Get_delete_on_Path: " + e.message + " ===== ")
-            return None
-        return query
+def category_range(cat_id, entity_type):
+    """
+    Key range of the entities of a kind or a mixin in a view keyed by [cat_id, Type, OCCI_Location]
+    Args:
+        @param cat_id: OCCI ID of the kind or mixin
+        @param entity_type: Resource or Link
+    """
+    return {'startkey': [cat_id, entity_type], 'endkey': [cat_id, entity_type, PATH_RANGE_END]}
 
 
 #def recursive_for_attribute(attributes):
@@ -0,0 +1,78 @@
+#  Copyright 2010-2012 Institut Mines-Telecom
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+Created on Oct 17, 2026
+
+@author: Houssem Medhioub
+@contact: houssem.medhioub@it-sudparis.eu
+@organization: Institut Mines-Telecom - Telecom SudParis
+@license: Apache License, Version 2.0
+"""
+
+
+class ViewRow(object):
+    """
+    A row of a view, read as the row dict of couchdbkit (row['value'], row.get('id'))
+    """
+
+    __slots__ = ('id', 'key', 'value')
+
+    def __init__(self, id, key, value):
+        self.id = id
+        self.key = key
+        self.value = value
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except (AttributeError, TypeError):
+            raise KeyError(name)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def has_key(self, name):
+        return name in self.__slots__ and getattr(self, name) is not None
+
+
+class ViewRows(object):
+    """
+    Rows of a view query, fetched once when it is made: count(), first() and the iterations read the same rows
+    """
+
+    __slots__ = ('rows',)
+
+    def __init__(self, query):
+        self.rows = [ViewRow(row.get('id'), row.get('key'), row.get('value')) for row in query]
+
+    def all(self):
+        return self.rows
+
+    def first(self):
+        if len(self.rows) == 0:
+            return None
+        return self.rows[0]
+
+    def count(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]